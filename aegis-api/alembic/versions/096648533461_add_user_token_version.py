@@ -0,0 +1,29 @@
+"""Add user token version
+
+Revision ID: 096648533461
+Revises: 152bacac2426
+Create Date: 2026-10-18 09:12:40.115302
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '096648533461'
+down_revision: Union[str, None] = '152bacac2426'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        'users',
+        sa.Column('token_version', sa.Integer(), server_default='0', nullable=False)
+    )
+
+
+def downgrade() -> None:
+    op.drop_column('users', 'token_version')
@@ -0,0 +1,44 @@
+"""Add keyset pagination indexes
+
+Revision ID: 5d2f8a61c0b3
+Revises: 096648533461
+Create Date: 2026-10-18 14:05:21.638410
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5d2f8a61c0b3'
+down_revision: Union[str, None] = '096648533461'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLES = ['users', 'inspections', 'incidents', 'permits']
+
+
+def upgrade() -> None:
+    # CONCURRENTLY cannot run inside a transaction; it keeps live tables writable
+    with op.get_context().autocommit_block():
+        for table in TABLES:
+            op.create_index(
+                f'ix_{table}_created_at_id',
+                table,
+                ['created_at', 'id'],
+                postgresql_concurrently=True,
+                if_not_exists=True
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for table in TABLES:
+            op.drop_index(
+                f'ix_{table}_created_at_id',
+                table_name=table,
+                postgresql_concurrently=True,
+                if_exists=True
+            )
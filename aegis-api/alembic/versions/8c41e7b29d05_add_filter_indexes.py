@@ -0,0 +1,57 @@
+"""Add filter indexes
+
+Revision ID: 8c41e7b29d05
+Revises: 5d2f8a61c0b3
+Create Date: 2026-10-18 15:32:47.201984
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8c41e7b29d05'
+down_revision: Union[str, None] = '5d2f8a61c0b3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# One index per repository WHERE ... ORDER BY created_at DESC, id DESC shape;
+# the same indexes serve the matching count_by_* queries
+INDEXES = [
+    ('ix_inspections_user_id_created_at_id', 'inspections', ['user_id', 'created_at', 'id']),
+    ('ix_inspections_status_created_at_id', 'inspections', ['status', 'created_at', 'id']),
+    ('ix_inspections_category_created_at_id', 'inspections', ['category', 'created_at', 'id']),
+    ('ix_incidents_user_id_created_at_id', 'incidents', ['user_id', 'created_at', 'id']),
+    ('ix_incidents_category_created_at_id', 'incidents', ['category', 'created_at', 'id']),
+    ('ix_incidents_investigation_status_created_at_id', 'incidents', ['investigation_status', 'created_at', 'id']),
+    ('ix_permits_user_id_created_at_id', 'permits', ['user_id', 'created_at', 'id']),
+    ('ix_permits_permit_type_created_at_id', 'permits', ['permit_type', 'created_at', 'id']),
+    ('ix_permits_approval_status_created_at_id', 'permits', ['approval_status', 'created_at', 'id']),
+    ('ix_users_role', 'users', ['role']),
+]
+
+
+def upgrade() -> None:
+    # CONCURRENTLY cannot run inside a transaction; it keeps live tables writable
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(
+                name,
+                table,
+                columns,
+                postgresql_concurrently=True,
+                if_not_exists=True
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, columns in reversed(INDEXES):
+            op.drop_index(
+                name,
+                table_name=table,
+                postgresql_concurrently=True,
+                if_exists=True
+            )
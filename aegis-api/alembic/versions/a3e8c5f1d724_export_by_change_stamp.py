@@ -0,0 +1,94 @@
+"""Stamp users and index change stamps for incremental exports
+
+Revision ID: a3e8c5f1d724
+Revises: f9d3b6e2a815
+Create Date: 2026-10-19 00:18:36.552190
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a3e8c5f1d724'
+down_revision: Union[str, None] = 'f9d3b6e2a815'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Equivalent to app.models.sync_change, frozen at this revision
+EXPORTED_TABLES = ['users', 'inspections', 'incidents', 'permits']
+
+BACKFILL_BATCH_SIZE = 10000
+
+# Stamps existing users one committed id range at a time, as in c9d3f7a2e6b1;
+# the sync_stamp trigger fills in the stamp, and users written since it was
+# created already carry one and are skipped
+BACKFILL_USERS_SQL = f"""
+DO $$
+DECLARE
+    lo bigint;
+    hi bigint;
+BEGIN
+    SELECT min(id), max(id) INTO lo, hi FROM users;
+    WHILE lo <= hi LOOP
+        UPDATE users SET change_seq = NULL
+        WHERE id >= lo AND id < lo + {BACKFILL_BATCH_SIZE} AND change_seq IS NULL;
+        COMMIT;
+        lo := lo + {BACKFILL_BATCH_SIZE};
+    END LOOP;
+END
+$$
+"""
+
+
+def upgrade() -> None:
+    # The synced tables already carry stamps; users gets them without tombstones
+    op.add_column('users', sa.Column('change_xid', sa.BigInteger(), nullable=True))
+    op.add_column('users', sa.Column('change_seq', sa.BigInteger(), nullable=True))
+    op.execute(
+        "CREATE TRIGGER users_sync_stamp BEFORE INSERT OR UPDATE ON users "
+        "FOR EACH ROW EXECUTE FUNCTION sync_stamp_change()"
+    )
+
+    # Exports now select by change stamp instead of coalesce(updated_at, created_at);
+    # CONCURRENTLY cannot run inside a transaction, it keeps live tables writable;
+    # the batched backfill runs there too so no single transaction locks all users
+    with op.get_context().autocommit_block():
+        op.execute(BACKFILL_USERS_SQL)
+        for table in EXPORTED_TABLES:
+            op.create_index(
+                f'ix_{table}_change_xid_change_seq',
+                table,
+                ['change_xid', 'change_seq'],
+                postgresql_concurrently=True,
+                if_not_exists=True
+            )
+            op.drop_index(
+                f'ix_{table}_changed_at',
+                table_name=table,
+                postgresql_concurrently=True,
+                if_exists=True
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for table in EXPORTED_TABLES:
+            op.create_index(
+                f'ix_{table}_changed_at',
+                table,
+                [sa.text('coalesce(updated_at, created_at)')],
+                postgresql_concurrently=True,
+                if_not_exists=True
+            )
+            op.drop_index(
+                f'ix_{table}_change_xid_change_seq',
+                table_name=table,
+                postgresql_concurrently=True,
+                if_exists=True
+            )
+    op.execute("DROP TRIGGER IF EXISTS users_sync_stamp ON users")
+    op.drop_column('users', 'change_seq')
+    op.drop_column('users', 'change_xid')
@@ -0,0 +1,55 @@
+"""Add trigram indexes for user and location search
+
+Revision ID: a7d1e5c93f48
+Revises: e3a9c4f1b276
+Create Date: 2026-10-18 17:32:41.208114
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a7d1e5c93f48'
+down_revision: Union[str, None] = 'e3a9c4f1b276'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (table, column) pairs matched with ILIKE '%...%' or the pg_trgm % operator
+TRIGRAM_COLUMNS = [
+    ('users', 'full_name'),
+    ('users', 'email'),
+    ('users', 'username'),
+    ('incidents', 'location'),
+    ('inspections', 'location'),
+    ('permits', 'location'),
+]
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+
+    with op.get_context().autocommit_block():
+        for table, column in TRIGRAM_COLUMNS:
+            op.create_index(
+                f'ix_{table}_{column}_trgm',
+                table,
+                [column],
+                postgresql_using='gin',
+                postgresql_ops={column: 'gin_trgm_ops'},
+                postgresql_concurrently=True,
+                if_not_exists=True
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for table, column in TRIGRAM_COLUMNS:
+            op.drop_index(
+                f'ix_{table}_{column}_trgm',
+                table_name=table,
+                postgresql_concurrently=True,
+                if_exists=True
+            )
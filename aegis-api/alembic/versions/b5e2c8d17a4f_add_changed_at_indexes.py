@@ -0,0 +1,44 @@
+"""Add changed_at indexes for incremental exports
+
+Revision ID: b5e2c8d17a4f
+Revises: f4b8d2a6e913
+Create Date: 2026-10-18 19:12:37.581902
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b5e2c8d17a4f'
+down_revision: Union[str, None] = 'f4b8d2a6e913'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Tables exported to Parquet, filtered by coalesce(updated_at, created_at) > watermark
+EXPORTED_TABLES = ['users', 'inspections', 'incidents', 'permits']
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        for table in EXPORTED_TABLES:
+            op.create_index(
+                f'ix_{table}_changed_at',
+                table,
+                [sa.text('coalesce(updated_at, created_at)')],
+                postgresql_concurrently=True,
+                if_not_exists=True
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for table in EXPORTED_TABLES:
+            op.drop_index(
+                f'ix_{table}_changed_at',
+                table_name=table,
+                postgresql_concurrently=True,
+                if_exists=True
+            )
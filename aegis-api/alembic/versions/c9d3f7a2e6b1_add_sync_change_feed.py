@@ -0,0 +1,138 @@
+"""Add change stamps and tombstones for delta sync
+
+Revision ID: c9d3f7a2e6b1
+Revises: b5e2c8d17a4f
+Create Date: 2026-10-18 19:48:05.317426
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c9d3f7a2e6b1'
+down_revision: Union[str, None] = 'b5e2c8d17a4f'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Equivalent to app.models.sync_change, frozen at this revision
+SYNCED_TABLES = ['inspections', 'incidents', 'permits']
+
+STAMP_FUNCTION_SQL = """
+CREATE OR REPLACE FUNCTION sync_stamp_change() RETURNS trigger AS $$
+BEGIN
+    NEW.change_xid := pg_current_xact_id()::text::bigint;
+    NEW.change_seq := nextval('sync_change_seq');
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql
+"""
+
+TOMBSTONE_FUNCTION_SQL = """
+CREATE OR REPLACE FUNCTION sync_record_tombstone() RETURNS trigger AS $$
+BEGIN
+    INSERT INTO sync_tombstones (change_seq, change_xid, entity, entity_id, user_id)
+    VALUES (nextval('sync_change_seq'), pg_current_xact_id()::text::bigint, TG_TABLE_NAME, OLD.id, OLD.user_id);
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql
+"""
+
+BACKFILL_BATCH_SIZE = 10000
+
+# Stamps existing rows one committed id range at a time, so no batch holds
+# row locks for long. Setting change_seq leaves the stamping to the trigger,
+# which gives each row its batch's xid and a fresh sequence value; rows
+# written since the trigger was created already carry a stamp and are skipped.
+BACKFILL_SQL = """
+DO $$
+DECLARE
+    lo bigint;
+    hi bigint;
+BEGIN
+    SELECT min(id), max(id) INTO lo, hi FROM {table};
+    WHILE lo <= hi LOOP
+        UPDATE {table} SET change_seq = NULL
+        WHERE id >= lo AND id < lo + {batch_size} AND change_seq IS NULL;
+        COMMIT;
+        lo := lo + {batch_size};
+    END LOOP;
+END
+$$
+"""
+
+
+def upgrade() -> None:
+    op.execute("CREATE SEQUENCE IF NOT EXISTS sync_change_seq")
+    op.create_table(
+        'sync_tombstones',
+        sa.Column('change_seq', sa.BigInteger(), autoincrement=False, nullable=False),
+        sa.Column('change_xid', sa.BigInteger(), nullable=False),
+        sa.Column('entity', sa.String(length=50), nullable=False),
+        sa.Column('entity_id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('deleted_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.PrimaryKeyConstraint('change_seq')
+    )
+    op.execute(STAMP_FUNCTION_SQL)
+    op.execute(TOMBSTONE_FUNCTION_SQL)
+
+    for table in SYNCED_TABLES:
+        op.add_column(table, sa.Column('change_xid', sa.BigInteger(), nullable=True))
+        op.add_column(table, sa.Column('change_seq', sa.BigInteger(), nullable=True))
+        op.execute(
+            f"CREATE TRIGGER {table}_sync_stamp BEFORE INSERT OR UPDATE ON {table} "
+            f"FOR EACH ROW EXECUTE FUNCTION sync_stamp_change()"
+        )
+        op.execute(
+            f"CREATE TRIGGER {table}_sync_tombstone AFTER DELETE ON {table} "
+            f"FOR EACH ROW EXECUTE FUNCTION sync_record_tombstone()"
+        )
+
+    # Backfill and index outside the transaction; CONCURRENTLY cannot run
+    # inside one, and both keep live tables writable
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_sync_tombstones_user_id_change_xid_change_seq',
+            'sync_tombstones',
+            ['user_id', 'change_xid', 'change_seq'],
+            postgresql_concurrently=True,
+            if_not_exists=True
+        )
+        for table in SYNCED_TABLES:
+            op.execute(BACKFILL_SQL.format(table=table, batch_size=BACKFILL_BATCH_SIZE))
+            op.create_index(
+                f'ix_{table}_user_id_change_xid_change_seq',
+                table,
+                ['user_id', 'change_xid', 'change_seq'],
+                postgresql_concurrently=True,
+                if_not_exists=True
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for table in SYNCED_TABLES:
+            op.drop_index(
+                f'ix_{table}_user_id_change_xid_change_seq',
+                table_name=table,
+                postgresql_concurrently=True,
+                if_exists=True
+            )
+        op.drop_index(
+            'ix_sync_tombstones_user_id_change_xid_change_seq',
+            table_name='sync_tombstones',
+            postgresql_concurrently=True,
+            if_exists=True
+        )
+    for table in SYNCED_TABLES:
+        op.execute(f"DROP TRIGGER IF EXISTS {table}_sync_tombstone ON {table}")
+        op.execute(f"DROP TRIGGER IF EXISTS {table}_sync_stamp ON {table}")
+        op.drop_column(table, 'change_seq')
+        op.drop_column(table, 'change_xid')
+    op.execute("DROP FUNCTION IF EXISTS sync_record_tombstone()")
+    op.execute("DROP FUNCTION IF EXISTS sync_stamp_change()")
+    op.drop_table('sync_tombstones')
+    op.execute("DROP SEQUENCE IF EXISTS sync_change_seq")
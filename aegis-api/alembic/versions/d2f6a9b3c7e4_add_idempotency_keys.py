@@ -0,0 +1,36 @@
+"""Add idempotency keys table
+
+Revision ID: d2f6a9b3c7e4
+Revises: c9d3f7a2e6b1
+Create Date: 2026-10-18 21:12:40.582913
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd2f6a9b3c7e4'
+down_revision: Union[str, None] = 'c9d3f7a2e6b1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'idempotency_keys',
+        sa.Column('key', sa.LargeBinary(length=16), nullable=False),
+        sa.Column('fingerprint', sa.LargeBinary(length=16), nullable=False),
+        sa.Column('status_code', sa.SmallInteger(), nullable=True),
+        sa.Column('body', sa.LargeBinary(), nullable=True),
+        sa.Column('expires_at', sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint('key')
+    )
+    op.create_index(op.f('ix_idempotency_keys_expires_at'), 'idempotency_keys', ['expires_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_idempotency_keys_expires_at'), table_name='idempotency_keys')
+    op.drop_table('idempotency_keys')
@@ -0,0 +1,69 @@
+"""Add full-text search vectors
+
+Revision ID: e3a9c4f1b276
+Revises: 8c41e7b29d05
+Create Date: 2026-10-18 16:48:09.517263
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e3a9c4f1b276'
+down_revision: Union[str, None] = '8c41e7b29d05'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Equivalent to app.models.search_index, frozen at this revision
+SEARCH_VECTORS = {
+    'incidents': (
+        "setweight(to_tsvector('simple', coalesce(title, '')), 'A') || "
+        "setweight(to_tsvector('simple', coalesce(description, '') || ' ' || location || ' ' || category), 'B')"
+    ),
+    'inspections': (
+        "setweight(to_tsvector('simple', coalesce(location, '')), 'A') || "
+        "setweight(to_tsvector('simple', category || ' ' || coalesce(description, '')), 'B')"
+    ),
+    'permits': (
+        "setweight(to_tsvector('simple', coalesce(location, permit_type)), 'A') || "
+        "setweight(to_tsvector('simple', permit_type || ' ' || coalesce(description, '')), 'B')"
+    ),
+}
+
+
+def upgrade() -> None:
+    # Generated columns are recomputed by PostgreSQL on every INSERT/UPDATE.
+    # Adding one rewrites the table, so run this in a maintenance window.
+    for table, expression in SEARCH_VECTORS.items():
+        op.execute(
+            f"ALTER TABLE {table} ADD COLUMN search_vector tsvector "
+            f"GENERATED ALWAYS AS ({expression}) STORED"
+        )
+
+    with op.get_context().autocommit_block():
+        for table in SEARCH_VECTORS:
+            op.create_index(
+                f'ix_{table}_search_vector',
+                table,
+                ['search_vector'],
+                postgresql_using='gin',
+                postgresql_concurrently=True,
+                if_not_exists=True
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for table in SEARCH_VECTORS:
+            op.drop_index(
+                f'ix_{table}_search_vector',
+                table_name=table,
+                postgresql_concurrently=True,
+                if_exists=True
+            )
+
+    for table in SEARCH_VECTORS:
+        op.drop_column(table, 'search_vector')
@@ -0,0 +1,48 @@
+"""Add range filter indexes
+
+Revision ID: e7c1a4d8b2f5
+Revises: d2f6a9b3c7e4
+Create Date: 2026-10-18 23:05:12.418673
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e7c1a4d8b2f5'
+down_revision: Union[str, None] = 'd2f6a9b3c7e4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# The occurred and start date range filters, which otherwise scan the table
+INDEXES = [
+    ('ix_incidents_incident_datetime', 'incidents', ['incident_datetime']),
+    ('ix_permits_start_date', 'permits', ['start_date']),
+]
+
+
+def upgrade() -> None:
+    # CONCURRENTLY cannot run inside a transaction; it keeps live tables writable
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(
+                name,
+                table,
+                columns,
+                postgresql_concurrently=True,
+                if_not_exists=True
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, columns in reversed(INDEXES):
+            op.drop_index(
+                name,
+                table_name=table,
+                postgresql_concurrently=True,
+                if_exists=True
+            )
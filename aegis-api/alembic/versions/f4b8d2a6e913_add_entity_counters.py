@@ -0,0 +1,93 @@
+"""Add trigger-maintained entity counters
+
+Revision ID: f4b8d2a6e913
+Revises: a7d1e5c93f48
+Create Date: 2026-10-18 18:05:12.640387
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f4b8d2a6e913'
+down_revision: Union[str, None] = 'a7d1e5c93f48'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Equivalent to app.models.entity_counter, frozen at this revision
+COUNTED_DIMENSIONS = {
+    'users': ('role',),
+    'inspections': ('status', 'category'),
+    'incidents': ('category', 'investigation_status'),
+    'permits': ('permit_type', 'approval_status'),
+}
+
+COUNTER_FUNCTION_SQL = """
+CREATE OR REPLACE FUNCTION entity_counters_apply() RETURNS trigger AS $$
+DECLARE
+    dimension_name text;
+    old_row jsonb := CASE WHEN TG_OP <> 'INSERT' THEN to_jsonb(OLD) END;
+    new_row jsonb := CASE WHEN TG_OP <> 'DELETE' THEN to_jsonb(NEW) END;
+BEGIN
+    FOREACH dimension_name IN ARRAY TG_ARGV || ARRAY['total'] LOOP
+        CONTINUE WHEN TG_OP = 'UPDATE'
+            AND old_row ->> dimension_name IS NOT DISTINCT FROM new_row ->> dimension_name;
+        IF old_row IS NOT NULL THEN
+            UPDATE entity_counters SET count = count - 1
+            WHERE entity = TG_TABLE_NAME
+              AND dimension = dimension_name
+              AND value = coalesce(old_row ->> dimension_name, '');
+        END IF;
+        IF new_row IS NOT NULL THEN
+            INSERT INTO entity_counters (entity, dimension, value, count)
+            VALUES (TG_TABLE_NAME, dimension_name, coalesce(new_row ->> dimension_name, ''), 1)
+            ON CONFLICT (entity, dimension, value)
+            DO UPDATE SET count = entity_counters.count + 1;
+        END IF;
+    END LOOP;
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql
+"""
+
+
+def upgrade() -> None:
+    op.create_table(
+        'entity_counters',
+        sa.Column('entity', sa.String(length=50), nullable=False),
+        sa.Column('dimension', sa.String(length=50), nullable=False),
+        sa.Column('value', sa.String(length=100), nullable=False),
+        sa.Column('count', sa.BigInteger(), nullable=False),
+        sa.PrimaryKeyConstraint('entity', 'dimension', 'value')
+    )
+    op.execute(COUNTER_FUNCTION_SQL)
+
+    # Creating a trigger blocks writes to its table until this transaction
+    # commits, so the backfill below cannot miss or double-count a row
+    for table, dimensions in COUNTED_DIMENSIONS.items():
+        arguments = ", ".join(f"'{dimension}'" for dimension in dimensions)
+        op.execute(
+            f"CREATE TRIGGER {table}_entity_counters "
+            f"AFTER INSERT OR DELETE OR UPDATE OF {', '.join(dimensions)} ON {table} "
+            f"FOR EACH ROW EXECUTE FUNCTION entity_counters_apply({arguments})"
+        )
+        op.execute(
+            f"INSERT INTO entity_counters (entity, dimension, value, count) "
+            f"SELECT '{table}', 'total', '', count(*) FROM {table}"
+        )
+        for dimension in dimensions:
+            op.execute(
+                f"INSERT INTO entity_counters (entity, dimension, value, count) "
+                f"SELECT '{table}', '{dimension}', {dimension}, count(*) FROM {table} "
+                f"GROUP BY {dimension}"
+            )
+
+
+def downgrade() -> None:
+    for table in COUNTED_DIMENSIONS:
+        op.execute(f"DROP TRIGGER IF EXISTS {table}_entity_counters ON {table}")
+    op.execute("DROP FUNCTION IF EXISTS entity_counters_apply()")
+    op.drop_table('entity_counters')
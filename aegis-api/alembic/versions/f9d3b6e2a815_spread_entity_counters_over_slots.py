@@ -0,0 +1,139 @@
+"""Spread entity counters over slot rows
+
+Revision ID: f9d3b6e2a815
+Revises: e7c1a4d8b2f5
+Create Date: 2026-10-18 23:41:27.903514
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f9d3b6e2a815'
+down_revision: Union[str, None] = 'e7c1a4d8b2f5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Equivalent to app.models.entity_counter, frozen at this revision
+COUNTED_DIMENSIONS = {
+    'users': ('role',),
+    'inspections': ('status', 'category'),
+    'incidents': ('category', 'investigation_status'),
+    'permits': ('permit_type', 'approval_status'),
+}
+COUNTER_SLOTS = 16
+
+# Each row change lands in slot id % COUNTER_SLOTS
+COUNTER_FUNCTION_SQL = f"""
+CREATE OR REPLACE FUNCTION entity_counters_apply() RETURNS trigger AS $$
+DECLARE
+    dimension_name text;
+    old_row jsonb := CASE WHEN TG_OP <> 'INSERT' THEN to_jsonb(OLD) END;
+    new_row jsonb := CASE WHEN TG_OP <> 'DELETE' THEN to_jsonb(NEW) END;
+    row_slot smallint := (coalesce(new_row, old_row) ->> 'id')::bigint % {COUNTER_SLOTS};
+BEGIN
+    FOREACH dimension_name IN ARRAY TG_ARGV || ARRAY['total'] LOOP
+        CONTINUE WHEN TG_OP = 'UPDATE'
+            AND old_row ->> dimension_name IS NOT DISTINCT FROM new_row ->> dimension_name;
+        IF old_row IS NOT NULL THEN
+            UPDATE entity_counters SET count = count - 1
+            WHERE entity = TG_TABLE_NAME
+              AND dimension = dimension_name
+              AND value = coalesce(old_row ->> dimension_name, '')
+              AND slot = row_slot;
+        END IF;
+        IF new_row IS NOT NULL THEN
+            INSERT INTO entity_counters (entity, dimension, value, slot, count)
+            VALUES (TG_TABLE_NAME, dimension_name, coalesce(new_row ->> dimension_name, ''), row_slot, 1)
+            ON CONFLICT (entity, dimension, value, slot)
+            DO UPDATE SET count = entity_counters.count + 1;
+        END IF;
+    END LOOP;
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql
+"""
+
+# The function as of f4b8d2a6e913, one row per count
+PREVIOUS_COUNTER_FUNCTION_SQL = """
+CREATE OR REPLACE FUNCTION entity_counters_apply() RETURNS trigger AS $$
+DECLARE
+    dimension_name text;
+    old_row jsonb := CASE WHEN TG_OP <> 'INSERT' THEN to_jsonb(OLD) END;
+    new_row jsonb := CASE WHEN TG_OP <> 'DELETE' THEN to_jsonb(NEW) END;
+BEGIN
+    FOREACH dimension_name IN ARRAY TG_ARGV || ARRAY['total'] LOOP
+        CONTINUE WHEN TG_OP = 'UPDATE'
+            AND old_row ->> dimension_name IS NOT DISTINCT FROM new_row ->> dimension_name;
+        IF old_row IS NOT NULL THEN
+            UPDATE entity_counters SET count = count - 1
+            WHERE entity = TG_TABLE_NAME
+              AND dimension = dimension_name
+              AND value = coalesce(old_row ->> dimension_name, '');
+        END IF;
+        IF new_row IS NOT NULL THEN
+            INSERT INTO entity_counters (entity, dimension, value, count)
+            VALUES (TG_TABLE_NAME, dimension_name, coalesce(new_row ->> dimension_name, ''), 1)
+            ON CONFLICT (entity, dimension, value)
+            DO UPDATE SET count = entity_counters.count + 1;
+        END IF;
+    END LOOP;
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql
+"""
+
+
+def _lock_counted_tables() -> None:
+    # Writes wait until this transaction commits, so the recount below
+    # cannot miss or double-count a row
+    for table in COUNTED_DIMENSIONS:
+        op.execute(f"LOCK TABLE {table} IN SHARE MODE")
+    op.execute("DELETE FROM entity_counters")
+
+
+def upgrade() -> None:
+    _lock_counted_tables()
+    op.add_column(
+        'entity_counters',
+        sa.Column('slot', sa.SmallInteger(), server_default='0', nullable=False)
+    )
+    op.drop_constraint('entity_counters_pkey', 'entity_counters', type_='primary')
+    op.create_primary_key('entity_counters_pkey', 'entity_counters', ['entity', 'dimension', 'value', 'slot'])
+    op.execute(COUNTER_FUNCTION_SQL)
+
+    slot = f"id % {COUNTER_SLOTS}"
+    for table, dimensions in COUNTED_DIMENSIONS.items():
+        op.execute(
+            f"INSERT INTO entity_counters (entity, dimension, value, slot, count) "
+            f"SELECT '{table}', 'total', '', {slot}, count(*) FROM {table} GROUP BY {slot}"
+        )
+        for dimension in dimensions:
+            op.execute(
+                f"INSERT INTO entity_counters (entity, dimension, value, slot, count) "
+                f"SELECT '{table}', '{dimension}', {dimension}, {slot}, count(*) FROM {table} "
+                f"GROUP BY {dimension}, {slot}"
+            )
+
+
+def downgrade() -> None:
+    _lock_counted_tables()
+    op.drop_constraint('entity_counters_pkey', 'entity_counters', type_='primary')
+    op.drop_column('entity_counters', 'slot')
+    op.create_primary_key('entity_counters_pkey', 'entity_counters', ['entity', 'dimension', 'value'])
+    op.execute(PREVIOUS_COUNTER_FUNCTION_SQL)
+
+    for table, dimensions in COUNTED_DIMENSIONS.items():
+        op.execute(
+            f"INSERT INTO entity_counters (entity, dimension, value, count) "
+            f"SELECT '{table}', 'total', '', count(*) FROM {table}"
+        )
+        for dimension in dimensions:
+            op.execute(
+                f"INSERT INTO entity_counters (entity, dimension, value, count) "
+                f"SELECT '{table}', '{dimension}', {dimension}, count(*) FROM {table} "
+                f"GROUP BY {dimension}"
+            )
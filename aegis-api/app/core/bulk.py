@@ -0,0 +1,91 @@
+from typing import Any, Callable, Iterable, List, NamedTuple, Optional, Sequence, Set, Tuple, Type
+
+from fastapi import HTTPException
+from fastapi.encoders import jsonable_encoder
+from pydantic import BaseModel, ValidationError
+
+
+class BulkResult(NamedTuple):
+    # (position in the request, created record), in request order
+    created: List[Tuple[int, Any]]
+    # (position in the request, error detail) of items that were not created
+    errors: List[Tuple[int, Any]]
+
+
+class TransitionResult(NamedTuple):
+    # Records the transition changed, in request order
+    updated: List[Any]
+    # (id, status code, detail) of ids that were left unchanged
+    errors: List[Tuple[int, int, str]]
+
+
+def prepare_rows(
+    items: Sequence[Any],
+    schema: Type[BaseModel],
+    build: Callable[[Any], dict]
+) -> Tuple[List[int], List[dict], List[Tuple[int, Any]]]:
+    """
+    Validate each item against schema and build its insert row.
+
+    build turns a validated item into a row and may reject it with an
+    HTTPException. Returns the positions and rows of accepted items and the
+    errors of the rest, with the same detail a single create would return.
+    """
+    indexes, rows, errors = [], [], []
+    for index, item in enumerate(items):
+        try:
+            rows.append(build(schema.model_validate(item)))
+        except ValidationError as exc:
+            errors.append((index, jsonable_encoder(exc.errors())))
+            continue
+        except HTTPException as exc:
+            errors.append((index, exc.detail))
+            continue
+        indexes.append(index)
+    return indexes, rows, errors
+
+
+def bulk_fields(result: BulkResult) -> dict:
+    """Build the fields of a bulk create response."""
+    return {
+        "created": [{"index": index, "item": item} for index, item in result.created],
+        "errors": [{"index": index, "detail": detail} for index, detail in result.errors],
+    }
+
+
+def transition_result(
+    ids: Sequence[int],
+    updated: Iterable[Any],
+    not_found: str,
+    existing_ids: Optional[Callable[[List[int]], Set[int]]] = None,
+    conflict: Optional[str] = None
+) -> TransitionResult:
+    """
+    Report the outcome of a bulk UPDATE for every requested id.
+    
+    Ids the UPDATE did not return get 404 with not_found when they are
+    missing. For a conditional UPDATE, pass existing_ids and conflict: the
+    skipped ids are looked up (only when there are any), and those that exist
+    were not in a state that allows the transition and get 400 with conflict,
+    as the single-record endpoints answer. An unconditional UPDATE only skips
+    missing ids, so it needs no lookup.
+    """
+    by_id = {record.id: record for record in updated}
+    ids = list(dict.fromkeys(ids))
+    missed = [id for id in ids if id not in by_id]
+    found = existing_ids(missed) if missed and existing_ids else set()
+    return TransitionResult(
+        [by_id[id] for id in ids if id in by_id],
+        [(id, 400, conflict) if id in found else (id, 404, not_found) for id in missed]
+    )
+
+
+def transition_fields(result: TransitionResult) -> dict:
+    """Build the fields of a bulk transition response."""
+    return {
+        "updated": result.updated,
+        "errors": [
+            {"id": id, "status_code": status_code, "detail": detail}
+            for id, status_code, detail in result.errors
+        ],
+    }
@@ -0,0 +1,193 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Iterable, NamedTuple, Optional
+
+from app.core.config import settings
+
+
+class TTLCache:
+    """Thread-safe in-process cache with per-entry TTL and LRU eviction."""
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._data: "OrderedDict[Hashable, tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Get a value, or None if it is missing or expired."""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires_at, value = entry
+            if expires_at <= now:
+                del self._data[key]
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        """Store a value, evicting the least recently used entry when full."""
+        if self.maxsize <= 0:
+            return
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def add(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> Optional[Any]:
+        """Store a value unless a live entry exists; return that entry's value instead."""
+        if self.maxsize <= 0:
+            return None
+        now = time.monotonic()
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None and entry[0] > now:
+                self._data.move_to_end(key)
+                return entry[1]
+            self._data[key] = (now + (self.ttl if ttl is None else ttl), value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+        return None
+
+    def invalidate(self, key: Hashable) -> None:
+        """Remove a single entry."""
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> dict:
+        """Get hit/miss counters and current size."""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+            }
+
+
+class TokenVersion(NamedTuple):
+    version: int
+    is_active: bool
+
+
+class TokenVersionTable:
+    """In-memory copy of every user's token version, refreshed in bulk."""
+
+    def __init__(self, refresh_seconds: float):
+        self.refresh_seconds = refresh_seconds
+        self._versions: dict[int, TokenVersion] = {}
+        # Ids looked up but not found, until the next reload
+        self._missing: set[int] = set()
+        self._loaded_at: Optional[float] = None
+        self._lock = threading.Lock()
+        self._reload_lock = threading.Lock()
+
+    def is_stale(self) -> bool:
+        """Check whether the table should be reloaded."""
+        return (
+            self._loaded_at is None
+            or time.monotonic() - self._loaded_at >= self.refresh_seconds
+        )
+
+    def refresh(self, fetch: Callable[[], Iterable[tuple[int, int, bool]]]) -> None:
+        """
+        Reload the table from fetch() when stale, one thread at a time.
+
+        Other threads keep using the current table while a reload runs; they
+        only wait for it when nothing has been loaded yet.
+        """
+        if not self.is_stale():
+            return
+        if not self._reload_lock.acquire(blocking=self._loaded_at is None):
+            return
+        try:
+            if self.is_stale():
+                self.load(fetch())
+        finally:
+            self._reload_lock.release()
+
+    def load(self, rows: Iterable[tuple[int, int, bool]]) -> None:
+        """Replace the table with (user_id, token_version, is_active) rows."""
+        versions = {
+            user_id: TokenVersion(version, bool(is_active))
+            for user_id, version, is_active in rows
+        }
+        with self._lock:
+            self._versions = versions
+            self._missing = set()
+            self._loaded_at = time.monotonic()
+
+    def get(self, user_id: int) -> Optional[TokenVersion]:
+        """Get the current token version for a user."""
+        return self._versions.get(user_id)
+
+    def is_missing(self, user_id: int) -> bool:
+        """Check whether the user is known not to exist."""
+        return user_id in self._missing
+
+    def set(self, user_id: int, version: int, is_active: bool) -> None:
+        """Apply a local change without waiting for the next reload."""
+        with self._lock:
+            self._versions[user_id] = TokenVersion(version, bool(is_active))
+            self._missing.discard(user_id)
+
+    def discard(self, user_id: int) -> None:
+        """Forget a deleted (or unknown) user until the next reload."""
+        with self._lock:
+            self._versions.pop(user_id, None)
+            self._missing.add(user_id)
+
+
+# Authenticated users keyed by token subject (user id as string)
+principal_cache = TTLCache(
+    maxsize=settings.PRINCIPAL_CACHE_MAX_SIZE,
+    ttl=settings.PRINCIPAL_CACHE_TTL_SECONDS,
+)
+
+# Verified JWT payloads keyed by token digest, expiring at the token's exp
+token_cache = TTLCache(
+    maxsize=settings.TOKEN_CACHE_MAX_SIZE,
+    ttl=settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60,
+)
+
+# Token versions used by stateless authorization
+token_versions = TokenVersionTable(
+    refresh_seconds=settings.TOKEN_VERSION_REFRESH_SECONDS,
+)
+
+# Dashboard statistics keyed by date range
+stats_cache = TTLCache(
+    maxsize=settings.STATS_CACHE_MAX_SIZE,
+    ttl=settings.STATS_CACHE_TTL_SECONDS,
+)
+
+# Callers that wrote recently and must keep reading from the primary
+recent_writers = TTLCache(
+    maxsize=100000,
+    ttl=settings.READ_YOUR_WRITES_SECONDS,
+)
+
+
+def invalidate_principal(user_id: int) -> None:
+    """Drop a cached principal after the user row changes."""
+    principal_cache.invalidate(str(user_id))
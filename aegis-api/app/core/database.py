@@ -1,8 +1,15 @@
+import inspect
+
+from fastapi import Request
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, Session
-from typing import Generator
+from typing import Any, AsyncGenerator, Callable, Generator, Optional
 
+from app.core.cache import recent_writers
 from app.core.config import settings
 
 engine = create_engine(
@@ -12,15 +19,140 @@ engine = create_engine(
     max_overflow=20
 )
 
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=engine)
 
 Base = declarative_base()
 
+# Optional read replica for GET requests
+read_engine = None
+ReadSessionLocal = None
+
+if settings.READ_DATABASE_URL:
+    read_engine = create_engine(
+        settings.READ_DATABASE_URL,
+        pool_pre_ping=True,
+        pool_size=10,
+        max_overflow=20
+    )
+    ReadSessionLocal = sessionmaker(
+        autocommit=False, autoflush=False, expire_on_commit=False, bind=read_engine
+    )
+
+ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+}
+
+READ_METHODS = {"GET", "HEAD", "OPTIONS"}
+
+
+def to_async_url(database_url: str) -> str:
+    """Swap a database URL's driver for its async counterpart."""
+    url = make_url(database_url)
+    drivername = ASYNC_DRIVERS.get(url.get_backend_name(), url.drivername)
+    return url.set(drivername=drivername).render_as_string(hide_password=False)
+
+
+def get_async_database_url() -> str:
+    """Get the async database URL, deriving it from DATABASE_URL if unset."""
+    if settings.ASYNC_DATABASE_URL:
+        return settings.ASYNC_DATABASE_URL
+    return to_async_url(settings.DATABASE_URL)
+
+
+def _create_async_engine(database_url: str):
+    url = make_url(database_url)
+    # SQLite's async dialect uses a NullPool that takes no sizing options
+    pool_options = {} if url.get_backend_name() == "sqlite" else {
+        "pool_size": 10,
+        "max_overflow": 20
+    }
+    return create_async_engine(url, pool_pre_ping=True, **pool_options)
+
+
+# The async engines are only built when enabled, so asyncpg stays optional
+async_engine = None
+AsyncSessionLocal = None
+async_read_engine = None
+AsyncReadSessionLocal = None
+
+if settings.DATABASE_ASYNC:
+    async_engine = _create_async_engine(get_async_database_url())
+    AsyncSessionLocal = async_sessionmaker(
+        async_engine,
+        autoflush=False,
+        expire_on_commit=False
+    )
+    if settings.READ_DATABASE_URL:
+        async_read_engine = _create_async_engine(to_async_url(settings.READ_DATABASE_URL))
+        AsyncReadSessionLocal = async_sessionmaker(
+            async_read_engine,
+            autoflush=False,
+            expire_on_commit=False
+        )
 
-def get_db() -> Generator[Session, None, None]:
-    """Dependency to get database session."""
-    db = SessionLocal()
+
+def _token_subject(request: Request) -> Optional[str]:
+    """Get the bearer token's subject, if any, without failing the request."""
+    from app.core.security import decode_token
+
+    scheme, _, token = request.headers.get("authorization", "").partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return None
+    payload = decode_token(token)
+    return payload.get("sub") if payload else None
+
+
+def _use_replica(request: Request, subject: Optional[str]) -> bool:
+    """Route reads to the replica unless the caller wrote very recently."""
+    if request.method not in READ_METHODS:
+        if subject is not None:
+            recent_writers.set(subject, True)
+        return False
+    return subject is None or recent_writers.get(subject) is None
+
+
+def get_db(request: Request) -> Generator[Session, None, None]:
+    """
+    Dependency to get database session.
+
+    GET requests use the read replica when READ_DATABASE_URL is set, except for
+    callers that wrote within the last READ_YOUR_WRITES_SECONDS.
+    """
+    subject = _token_subject(request) if ReadSessionLocal is not None else None
+    if ReadSessionLocal is not None and _use_replica(request, subject):
+        db = ReadSessionLocal()
+    else:
+        db = SessionLocal()
+    # Committed by UnitOfWorkRoute once the handler succeeds
+    request.state.db = db
     try:
         yield db
     finally:
         db.close()
+        if subject is not None and request.method not in READ_METHODS:
+            # Restart the read-your-writes window once the write is done
+            recent_writers.set(subject, True)
+
+
+async def get_async_db(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    """Dependency to get async database session, routed like get_db."""
+    subject = _token_subject(request) if AsyncReadSessionLocal is not None else None
+    if AsyncReadSessionLocal is not None and _use_replica(request, subject):
+        session_factory = AsyncReadSessionLocal
+    else:
+        session_factory = AsyncSessionLocal
+    async with session_factory() as db:
+        yield db
+
+
+async def run_db(method: Callable[..., Any], *args: Any) -> Any:
+    """
+    Call a service method on either stack from an async route.
+
+    Methods of Async* services are awaited; those of the sync services run in
+    the threadpool, so shared route code never blocks the event loop.
+    """
+    if inspect.iscoroutinefunction(method):
+        return await method(*args)
+    return await run_in_threadpool(method, *args)
@@ -0,0 +1,162 @@
+"""
+Group commit: many small inserts written as one batch and one commit.
+
+Callers hand their row to a GroupCommitWriter and await it. A background thread
+takes rows off a bounded queue and writes them together once
+GROUP_COMMIT_MAX_ROWS are waiting or GROUP_COMMIT_MAX_DELAY_MS after the
+first one arrived, so a burst costs one INSERT and one commit (one WAL
+flush) per batch instead of per row. Each caller gets its own record back
+once the batch has committed. Callers wait on the event loop rather than in a
+threadpool thread, so a full batch is not limited by the threadpool's size.
+
+When the queue is full, new rows are refused with 503 rather than queued
+without bound. When a batch fails, the writer is stopped, or a row waits too
+long, the row is handed back unwritten and the caller writes it
+synchronously as usual.
+"""
+import asyncio
+import logging
+import queue
+import threading
+import time
+from concurrent import futures
+from typing import Any, Callable, List, Optional
+
+from fastapi import HTTPException, status
+
+logger = logging.getLogger(__name__)
+
+# How long a caller waits for its batch before writing the row itself
+WAIT_TIMEOUT_SECONDS = 5
+
+_STOP = object()
+
+
+class GroupCommitFailed(Exception):
+    """The batch holding a row was not written."""
+
+
+class GroupCommitWriter:
+    """Background thread that writes queued rows in batches, one commit per batch."""
+
+    def __init__(
+        self,
+        write_batch: Callable[[List[dict]], List[Any]],
+        max_rows: int,
+        max_delay_ms: int,
+        max_pending: int
+    ):
+        self.write_batch = write_batch
+        self.max_rows = max(max_rows, 1)
+        self.max_delay = max_delay_ms / 1000
+        self.batches = 0
+        self.rows = 0
+        self.fallbacks = 0
+        self._queue: "queue.Queue" = queue.Queue(maxsize=max(max_pending, 1))
+        self._thread: Optional[threading.Thread] = None
+        self._stopped = False
+        self._lock = threading.Lock()
+
+    async def write(self, row: dict) -> Optional[Any]:
+        """
+        Queue a row and wait until its batch is committed.
+
+        Returns the created record, or None when the row was not written
+        (writer stopped, batch failed or too slow) and the caller should write
+        it itself. Raises 503 when too many rows are already waiting.
+        """
+        if not self._start():
+            return None
+        future: futures.Future = futures.Future()
+        try:
+            self._queue.put_nowait((row, future))
+        except queue.Full:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Too many submissions are waiting to be saved, please retry",
+                headers={"Retry-After": "1"}
+            )
+        waiter = asyncio.wrap_future(future)
+        try:
+            # Shielded, so a timeout does not cancel a row the writer has taken
+            return await asyncio.wait_for(asyncio.shield(waiter), WAIT_TIMEOUT_SECONDS)
+        except asyncio.TimeoutError:
+            # Only safe to write it ourselves if the writer has not taken it yet
+            if not future.cancel():
+                try:
+                    return await waiter
+                except GroupCommitFailed:
+                    pass
+        except GroupCommitFailed:
+            pass
+        with self._lock:
+            self.fallbacks += 1
+        return None
+
+    def stop(self) -> None:
+        """Write every queued row, then stop the thread; later rows are written by their callers."""
+        with self._lock:
+            self._stopped = True
+            thread = self._thread
+        if thread is not None:
+            self._queue.put(_STOP)
+            thread.join()
+
+    def stats(self) -> dict:
+        """Get batch/row counters and the current queue length."""
+        return {
+            "pending": self._queue.qsize(),
+            "batches": self.batches,
+            "rows": self.rows,
+            "fallbacks": self.fallbacks,
+        }
+
+    def _start(self) -> bool:
+        """Start the writer thread on first use; False once stopped."""
+        if self._thread is not None and not self._stopped:
+            return True
+        with self._lock:
+            if self._stopped:
+                return False
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="group-commit", daemon=True)
+                self._thread.start()
+        return True
+
+    def _run(self) -> None:
+        stopping = False
+        while not stopping:
+            item = self._queue.get()
+            if item is _STOP:
+                break
+            batch = [item]
+            deadline = time.monotonic() + self.max_delay
+            while len(batch) < self.max_rows:
+                try:
+                    item = self._queue.get(timeout=max(deadline - time.monotonic(), 0))
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+            self._flush(batch)
+        # Rows queued after stop() are left to their callers' timeouts
+
+    def _flush(self, batch: list) -> None:
+        """Write one batch and resolve its callers' futures."""
+        # Skip rows whose caller gave up waiting
+        live = [(row, future) for row, future in batch if future.set_running_or_notify_cancel()]
+        if not live:
+            return
+        try:
+            records = self.write_batch([row for row, _ in live])
+        except Exception:
+            logger.warning("Group commit of %d row(s) failed; writing them one by one", len(live), exc_info=True)
+            for _, future in live:
+                future.set_exception(GroupCommitFailed())
+            return
+        self.batches += 1
+        self.rows += len(live)
+        for (_, future), record in zip(live, records):
+            future.set_result(record)
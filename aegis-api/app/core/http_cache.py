@@ -0,0 +1,83 @@
+import hashlib
+from datetime import datetime
+from typing import Any
+
+from fastapi import Request, Response, status
+
+from app.core.config import settings
+from app.core.pagination import Page
+
+# Clients may keep a copy but must revalidate it; shared caches must not store it
+REVALIDATE = "private, no-cache"
+
+
+def record_version(record) -> datetime:
+    """Get when a record (or a version row with its timestamps) last changed."""
+    return record.updated_at or record.created_at
+
+
+def weak_etag(*parts: Any) -> str:
+    """Build a weak ETag from a digest of parts."""
+    digest = hashlib.blake2b(repr(parts).encode(), digest_size=12).hexdigest()
+    return f'W/"{digest}"'
+
+
+def entity_etag(record) -> str:
+    """Weak ETag for one record, from its id and last modification."""
+    return weak_etag(record.id, record_version(record).timestamp())
+
+
+def page_etag(request: Request, page: Page) -> str:
+    """
+    Weak ETag for a list page.
+    
+    Covers the query string, the total and each item's id and version, so it
+    changes exactly when the response body would.
+    """
+    return weak_etag(
+        request.url.query,
+        page.total,
+        page.estimated,
+        [(item.id, record_version(item).timestamp()) for item in page.items]
+    )
+
+
+def revalidating(request: Request) -> bool:
+    """Check whether the client sent a validator worth checking first."""
+    return "if-none-match" in request.headers
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """Compare etag with If-None-Match using the weak comparison."""
+    header = request.headers.get("if-none-match", "")
+    if header.strip() == "*":
+        return True
+    candidates = {tag.strip().removeprefix("W/") for tag in header.split(",")}
+    return etag.removeprefix("W/") in candidates
+
+
+def cache_control(final: bool = False) -> str:
+    """
+    Cache-Control for a record.
+    
+    Settled records (closed incidents, processed permits) may be reused for
+    FINAL_RECORD_MAX_AGE_SECONDS, then revalidated with their ETag like any
+    other record, so a later change is seen within that window.
+    """
+    if final:
+        return f"private, max-age={settings.FINAL_RECORD_MAX_AGE_SECONDS}, must-revalidate"
+    return REVALIDATE
+
+
+def set_cache_headers(response: Response, etag: str, policy: str = REVALIDATE) -> None:
+    """Attach validators to a 200 response."""
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = policy
+
+
+def not_modified(etag: str, policy: str = REVALIDATE) -> Response:
+    """Build a bodyless 304 response repeating the validators."""
+    return Response(
+        status_code=status.HTTP_304_NOT_MODIFIED,
+        headers={"ETag": etag, "Cache-Control": policy}
+    )
@@ -0,0 +1,226 @@
+"""
+Idempotency-Key support for create endpoints.
+
+A client that retries a create sends the same ``Idempotency-Key`` header.
+The first request claims the key and its response is stored; a repeat with
+the same body gets the stored response back (``Idempotent-Replayed: true``)
+without running the handler. A repeat while the first is still running
+gets 409, and reusing a key with a different body gets 422. Only 2xx
+responses are stored; when a request fails its claim is dropped so the
+client can retry with the same key. The claim is refreshed while its request
+runs, so it only lapses once the process handling it has gone.
+"""
+import asyncio
+import hashlib
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Optional
+
+from fastapi import Depends, Header, HTTPException, Request, Response, status
+from fastapi.concurrency import run_in_threadpool
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.core.security import get_current_user
+from app.core.unit_of_work import UnitOfWorkRoute
+from app.models.user import User
+from app.repositories.idempotency_repository import IdempotencyRepository, StoredResponse
+
+# How long a claim blocks repeats when its request never finishes (e.g. the worker died)
+CLAIM_TTL_SECONDS = 60
+# How often a running request extends its claim, well within CLAIM_TTL_SECONDS
+CLAIM_REFRESH_SECONDS = 20
+
+REPLAYED_HEADER = "Idempotent-Replayed"
+
+logger = logging.getLogger(__name__)
+
+
+class MemoryIdempotencyStore:
+    """Keys kept in this process only, evicting the least recently used when full."""
+    
+    def __init__(self, maxsize: int, ttl: float):
+        self.ttl = ttl
+        self._cache = TTLCache(maxsize=maxsize, ttl=ttl)
+    
+    def claim(self, key: bytes, fingerprint: bytes) -> Optional[StoredResponse]:
+        """Claim a key, or get what is stored for it."""
+        return self._cache.add(key, StoredResponse(fingerprint, None, None), ttl=CLAIM_TTL_SECONDS)
+    
+    def complete(self, key: bytes, fingerprint: bytes, status_code: int, body: bytes) -> None:
+        """Store the response of a claimed key."""
+        self._cache.set(key, StoredResponse(fingerprint, status_code, body))
+    
+    def refresh(self, key: bytes, fingerprint: bytes) -> None:
+        """Extend the claim of a request that is still running."""
+        claim = StoredResponse(fingerprint, None, None)
+        if self._cache.get(key) == claim:
+            self._cache.set(key, claim, ttl=CLAIM_TTL_SECONDS)
+    
+    def release(self, key: bytes, fingerprint: bytes) -> None:
+        """Drop a claim whose request failed."""
+        self._cache.invalidate(key)
+
+
+class DatabaseIdempotencyStore:
+    """Keys in the idempotency_keys table, shared by every worker process."""
+    
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+    
+    def claim(self, key: bytes, fingerprint: bytes) -> Optional[StoredResponse]:
+        """Claim a key, or get what is stored for it."""
+        now = datetime.now(timezone.utc)
+        # Its own short transaction, so concurrent repeats see the claim at once
+        with SessionLocal() as db:
+            stored = IdempotencyRepository(db).claim(
+                key, fingerprint, now, now + timedelta(seconds=CLAIM_TTL_SECONDS)
+            )
+            db.commit()
+        return stored
+    
+    def complete(self, key: bytes, fingerprint: bytes, status_code: int, body: bytes) -> None:
+        """Store the response of a claimed key."""
+        expires_at = datetime.now(timezone.utc) + timedelta(seconds=self.ttl)
+        with SessionLocal() as db:
+            IdempotencyRepository(db).complete(key, fingerprint, status_code, body, expires_at)
+            db.commit()
+    
+    def refresh(self, key: bytes, fingerprint: bytes) -> None:
+        """Extend the claim of a request that is still running."""
+        expires_at = datetime.now(timezone.utc) + timedelta(seconds=CLAIM_TTL_SECONDS)
+        with SessionLocal() as db:
+            IdempotencyRepository(db).refresh(key, fingerprint, expires_at)
+            db.commit()
+    
+    def release(self, key: bytes, fingerprint: bytes) -> None:
+        """Drop a claim whose request failed."""
+        with SessionLocal() as db:
+            IdempotencyRepository(db).release(key, fingerprint)
+            db.commit()
+
+
+def _build_store():
+    if settings.IDEMPOTENCY_STORE == "database":
+        return DatabaseIdempotencyStore(ttl=settings.IDEMPOTENCY_TTL_SECONDS)
+    return MemoryIdempotencyStore(
+        maxsize=settings.IDEMPOTENCY_CACHE_MAX_SIZE,
+        ttl=settings.IDEMPOTENCY_TTL_SECONDS,
+    )
+
+
+idempotency_store = _build_store()
+
+
+class IdempotentReplay(Exception):
+    """Raised by the idempotency_key dependency to answer with a stored response."""
+    
+    def __init__(self, stored: StoredResponse):
+        self.response = Response(
+            content=stored.body,
+            status_code=stored.status_code,
+            media_type="application/json",
+            headers={REPLAYED_HEADER: "true"}
+        )
+
+
+async def idempotency_key(
+    request: Request,
+    key: Optional[str] = Header(None, alias="Idempotency-Key", min_length=1, max_length=255),
+    current_user: User = Depends(get_current_user)
+) -> None:
+    """
+    Dependency for create routes that honours the Idempotency-Key header.
+    
+    Keys are scoped to the caller and the path. The route must use
+    IdempotentRoute, which stores the response once it is committed.
+    """
+    if key is None:
+        return
+    store_key = hashlib.blake2b(
+        f"{current_user.id}\0{request.url.path}\0{key}".encode(), digest_size=16
+    ).digest()
+    fingerprint = hashlib.blake2b(await request.body(), digest_size=16).digest()
+    stored = await run_in_threadpool(idempotency_store.claim, store_key, fingerprint)
+    if stored is None:
+        request.state.idempotency = (store_key, fingerprint)
+        return
+    if stored.fingerprint != fingerprint:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="Idempotency-Key was already used with a different request"
+        )
+    if stored.status_code is None:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="A request with this Idempotency-Key is still being processed",
+            headers={"Retry-After": "1"}
+        )
+    raise IdempotentReplay(stored)
+
+
+class IdempotentRoute(UnitOfWorkRoute):
+    """
+    Unit-of-work route that finishes Idempotency-Key claims.
+    
+    Answers replays with the stored response, keeps the claim alive while the
+    handler runs, stores 2xx responses after the unit of work has committed,
+    and drops the claim of any request that fails.
+    """
+    
+    def get_route_handler(self) -> Callable:
+        handler = super().get_route_handler()
+        
+        async def route_handler(request: Request) -> Response:
+            try:
+                response = await _handle_claimed(handler, request)
+            except IdempotentReplay as replay:
+                return replay.response
+            except Exception:
+                await _release(request)
+                raise
+            if response.status_code < 300:
+                await _complete(request, response)
+            else:
+                await _release(request)
+            return response
+        
+        return route_handler
+
+
+async def _handle_claimed(handler: Callable, request: Request) -> Response:
+    """Run handler, refreshing the request's claim until it returns."""
+    if "idempotency-key" not in request.headers:
+        return await handler(request)
+    refresher = asyncio.create_task(_refresh_claim(request))
+    try:
+        return await handler(request)
+    finally:
+        # Waits for a refresh already running, so it cannot outlive the claim
+        refresher.cancel()
+        await asyncio.gather(refresher, return_exceptions=True)
+
+
+async def _refresh_claim(request: Request) -> None:
+    while True:
+        await asyncio.sleep(CLAIM_REFRESH_SECONDS)
+        claim = getattr(request.state, "idempotency", None)
+        if claim is None:
+            continue
+        try:
+            await run_in_threadpool(idempotency_store.refresh, *claim)
+        except Exception:
+            logger.warning("Could not refresh an Idempotency-Key claim", exc_info=True)
+
+
+async def _complete(request: Request, response: Response) -> None:
+    claim = getattr(request.state, "idempotency", None)
+    if claim is not None:
+        await run_in_threadpool(idempotency_store.complete, *claim, response.status_code, bytes(response.body))
+
+
+async def _release(request: Request) -> None:
+    claim = getattr(request.state, "idempotency", None)
+    if claim is not None:
+        await run_in_threadpool(idempotency_store.release, *claim)
@@ -0,0 +1,169 @@
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Any, List, NamedTuple, Optional, Sequence, Tuple
+
+from fastapi import HTTPException, status
+from sqlalchemy import DateTime, String, func, literal, select, tuple_
+from sqlalchemy.types import TypeDecorator
+
+# Position of the last row on a page: (created_at, id)
+Cursor = Tuple[datetime, int]
+
+
+class CursorTimestamp(TypeDecorator):
+    """
+    A cursor's created_at, bound in the format the column is stored in.
+
+    SQLite stores server-default timestamps as CURRENT_TIMESTAMP text
+    ("YYYY-MM-DD HH:MM:SS") and compares them as text, so the bound value
+    must be text in that same format; other dialects compare real timestamps.
+    """
+    impl = DateTime(timezone=True)
+    cache_ok = True
+
+    def load_dialect_impl(self, dialect):
+        if dialect.name == "sqlite":
+            return dialect.type_descriptor(String())
+        return dialect.type_descriptor(DateTime(timezone=True))
+
+    def process_bind_param(self, value, dialect):
+        if value is not None and dialect.name == "sqlite":
+            # Fractional seconds only when present, as SQLite writes them
+            return value.replace(tzinfo=None).isoformat(" ")
+        return value
+
+
+class Page(NamedTuple):
+    items: List[Any]
+    total: int
+    # True when total is the query planner's estimate
+    estimated: bool = False
+
+
+def encode_cursor(created_at: datetime, id: int) -> str:
+    """Encode a row position as an opaque, URL-safe cursor."""
+    raw = json.dumps([created_at.isoformat(), id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: Optional[str]) -> Optional[Cursor]:
+    """Decode a cursor produced by encode_cursor."""
+    if not cursor:
+        return None
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, id = json.loads(base64.urlsafe_b64decode(padded))
+        return datetime.fromisoformat(created_at), int(id)
+    except (binascii.Error, TypeError, ValueError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+
+
+def encode_watermark(stamp: Tuple[int, int]) -> str:
+    """Encode the last (change_xid, change_seq) seen as an opaque, URL-safe watermark."""
+    raw = json.dumps(list(stamp), separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_watermark(watermark: str) -> Tuple[int, int]:
+    """Decode a watermark produced by encode_watermark."""
+    try:
+        padded = watermark + "=" * (-len(watermark) % 4)
+        change_xid, change_seq = json.loads(base64.urlsafe_b64decode(padded))
+        return int(change_xid), int(change_seq)
+    except (binascii.Error, TypeError, ValueError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid watermark"
+        )
+
+
+def next_cursor(items: Sequence, limit: int) -> Optional[str]:
+    """Get the cursor for the page after items, or None on the last page."""
+    if len(items) < limit or not items:
+        return None
+    last = items[-1]
+    return encode_cursor(last.created_at, last.id)
+
+
+def newest_first(query, model, skip: int = 0, limit: int = 100, cursor: Optional[Cursor] = None):
+    """
+    Order a Query or select() newest first and apply one page.
+
+    With a cursor the page starts right after that row, which the
+    (created_at, id) index serves without reading skipped rows; otherwise
+    falls back to OFFSET skip.
+    """
+    query = query.order_by(model.created_at.desc(), model.id.desc())
+    if cursor is not None:
+        created_at, id = cursor
+        query = query.where(
+            tuple_(model.created_at, model.id) < tuple_(literal(created_at, CursorTimestamp()), id)
+        )
+    else:
+        query = query.offset(skip)
+    return query.limit(limit)
+
+
+def count_statement(model, criteria: Sequence):
+    """SELECT count(*) of the rows matching criteria."""
+    return select(func.count()).select_from(model).where(*criteria)
+
+
+def page_statement(
+    model,
+    criteria: Sequence,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[Cursor] = None,
+    with_total: bool = True,
+    columns: Optional[Sequence] = None
+):
+    """
+    Select one newest-first page of rows matching criteria.
+
+    With with_total, every row also carries the filtered total as an
+    uncorrelated scalar subquery, so page and count share one round trip.
+    With columns, only those columns are selected instead of the entity.
+    """
+    stmt = select(*columns) if columns else select(model)
+    if with_total:
+        total = count_statement(model, criteria).correlate(None).scalar_subquery()
+        stmt = stmt.add_columns(total)
+    return newest_first(stmt.where(*criteria), model, skip, limit, cursor)
+
+
+def explain_statement(model, criteria: Sequence, dialect) -> Tuple[str, Any]:
+    """
+    EXPLAIN the filtered select to read the planner's row estimate.
+
+    Returns the driver-level SQL and its parameters for exec_driver_sql. The
+    statement is compiled for dialect as is, so operators and patterns
+    containing % are escaped exactly once for the driver's paramstyle.
+    """
+    compiled = select(model).where(*criteria).compile(dialect=dialect)
+    params = compiled.construct_params()
+    if compiled.positional:
+        params = tuple(params[name] for name in compiled.positiontup)
+    return f"EXPLAIN (FORMAT JSON) {compiled}", params
+
+
+def plan_rows(plan: Any) -> int:
+    """Get the estimated row count from EXPLAIN (FORMAT JSON) output."""
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+def page_fields(page: Page, limit: int) -> dict:
+    """Build the common fields of a list response."""
+    return {
+        "total": page.total,
+        "total_estimated": page.estimated,
+        "items": page.items,
+        "next_cursor": next_cursor(page.items, limit),
+    }
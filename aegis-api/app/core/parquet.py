@@ -0,0 +1,54 @@
+from datetime import datetime
+from typing import Iterable, Sequence
+
+# pyarrow is only needed for Parquet exports, so it stays optional
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
+
+
+def pyarrow_available() -> bool:
+    """Check whether Parquet exports can run."""
+    return pyarrow is not None
+
+
+def _arrow_type(column):
+    python_type = column.type.python_type
+    if python_type is bool:
+        return pyarrow.bool_()
+    if python_type is int:
+        return pyarrow.int64()
+    if python_type is datetime:
+        if column.type.timezone:
+            return pyarrow.timestamp("us", tz="UTC")
+        return pyarrow.timestamp("us")
+    return pyarrow.string()
+
+
+def arrow_schema(columns: Sequence):
+    """Build the Arrow schema of rows of the given table columns."""
+    return pyarrow.schema(
+        [pyarrow.field(column.name, _arrow_type(column), nullable=column.nullable) for column in columns]
+    )
+
+
+def write_parquet(path: str, columns: Sequence, batches: Iterable[Sequence]) -> int:
+    """
+    Write batches of rows of columns to a Parquet file, one row group per batch.
+
+    Only one batch is held in memory at a time. Returns the number of rows
+    written; with none, the file still holds the schema.
+    """
+    schema = arrow_schema(columns)
+    rows_written = 0
+    with pyarrow.parquet.ParquetWriter(path, schema, compression="zstd") as writer:
+        for rows in batches:
+            arrays = [
+                pyarrow.array([row[index] for row in rows], type=field.type)
+                for index, field in enumerate(schema)
+            ]
+            writer.write_batch(pyarrow.RecordBatch.from_arrays(arrays, schema=schema))
+            rows_written += len(rows)
+    return rows_written
@@ -1,13 +1,23 @@
+import asyncio
+import hashlib
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
 from datetime import datetime, timedelta
 from typing import Optional, Union
 from jose import jwt, JWTError
 from passlib.context import CryptContext
 from fastapi import Depends, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
+from app.core.cache import principal_cache, token_cache, token_versions
 from app.core.config import settings
-from app.core.database import get_db
+from app.core.database import SessionLocal, get_async_db, get_db
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 security = HTTPBearer()
@@ -23,6 +33,58 @@ def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
 
+# Dedicated pool for bcrypt so login bursts don't starve the request threadpool
+_password_pool: Optional[ProcessPoolExecutor] = None
+_password_jobs_pending = 0
+
+
+def _get_password_pool() -> ProcessPoolExecutor:
+    global _password_pool
+    if _password_pool is None:
+        _password_pool = ProcessPoolExecutor(
+            max_workers=settings.PASSWORD_HASH_WORKERS,
+            mp_context=multiprocessing.get_context("spawn")
+        )
+    return _password_pool
+
+
+async def _run_password_job(func, *args):
+    """Run a hashing function in the password pool, rejecting when the queue is full."""
+    global _password_jobs_pending
+    if _password_jobs_pending >= settings.PASSWORD_HASH_MAX_PENDING:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Authentication service is busy, please retry",
+            headers={"Retry-After": "1"}
+        )
+    _password_jobs_pending += 1
+    try:
+        if settings.PASSWORD_HASH_WORKERS <= 0:
+            return await run_in_threadpool(func, *args)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_get_password_pool(), func, *args)
+    finally:
+        _password_jobs_pending -= 1
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """Verify password against hash in the password pool."""
+    return await _run_password_job(verify_password, plain_password, hashed_password)
+
+
+async def get_password_hash_async(password: str) -> str:
+    """Hash password in the password pool."""
+    return await _run_password_job(get_password_hash, password)
+
+
+def shutdown_password_pool() -> None:
+    """Stop the password pool worker processes."""
+    global _password_pool
+    if _password_pool is not None:
+        _password_pool.shutdown(cancel_futures=True)
+        _password_pool = None
+
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """Create JWT access token."""
     to_encode = data.copy()
@@ -48,55 +110,213 @@ def create_refresh_token(data: dict, expires_delta: Optional[timedelta] = None)
 
 
 def decode_token(token: str) -> Optional[dict]:
-    """Decode JWT token."""
+    """Decode JWT token, reusing verified payloads until they expire."""
+    # Key by digest so raw tokens are never kept in memory
+    key = hashlib.sha256(token.encode()).digest()
+    payload = token_cache.get(key)
+    if payload is not None:
+        return dict(payload)
+    
     try:
         payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
-        return payload
     except JWTError:
         return None
+    
+    exp = payload.get("exp")
+    if isinstance(exp, (int, float)):
+        ttl = exp - time.time()
+        if ttl > 0:
+            token_cache.set(key, dict(payload), ttl=ttl)
+    return payload
+
+
+@dataclass(frozen=True)
+class UserPrincipal:
+    """Immutable snapshot of a user row, safe to share between requests."""
+    id: int
+    role: str
+    is_active: bool
+    token_version: int
+
+
+@dataclass(frozen=True)
+class TokenPrincipal:
+    """Authenticated caller built from signed token claims only."""
+    id: int
+    role: str
+    is_active: bool = True
+
+
+def _credentials_exception() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Could not validate credentials",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+
+
+def _inactive_exception() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_403_FORBIDDEN,
+        detail="User account is inactive"
+    )
+
+
+def _access_payload(credentials: HTTPAuthorizationCredentials) -> dict:
+    """Decode an access token that names its user, or raise 401."""
+    payload = decode_token(credentials.credentials)
+    if payload is None or payload.get("type") != "access" or payload.get("sub") is None:
+        raise _credentials_exception()
+    return payload
+
+
+def _principal_query(user_id: str):
+    from app.models.user import User
+    
+    return select(User.id, User.role, User.is_active, User.token_version).where(User.id == int(user_id))
+
+
+def _cache_principal(user_id: str, row) -> Optional[UserPrincipal]:
+    if row is None:
+        return None
+    user = UserPrincipal(**row._mapping)
+    principal_cache.set(user_id, user)
+    return user
+
+
+def _check_principal(payload: dict, user: Optional[UserPrincipal]) -> UserPrincipal:
+    if user is None or payload.get("ver", 0) != user.token_version:
+        raise _credentials_exception()
+    if not user.is_active:
+        raise _inactive_exception()
+    return user
 
 
 def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
     db: Session = Depends(get_db)
 ):
-    """Dependency to get current user from token."""
-    from app.models.user import User
+    """
+    Dependency to get current user from token.
     
-    token = credentials.credentials
-    credentials_exception = HTTPException(
-        status_code=status.HTTP_401_UNAUTHORIZED,
-        detail="Could not validate credentials",
-        headers={"WWW-Authenticate": "Bearer"},
-    )
+    Returns a UserPrincipal; handlers that need the full row load it
+    through their own session.
+    """
+    payload = _access_payload(credentials)
+    user_id = payload["sub"]
+    user = principal_cache.get(user_id)
+    if user is None:
+        user = _cache_principal(user_id, db.execute(_principal_query(user_id)).first())
+    return _check_principal(payload, user)
+
+
+async def get_current_user_async(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Like get_current_user, for async routes: the lookup goes through AsyncSession."""
+    payload = _access_payload(credentials)
+    user_id = payload["sub"]
+    user = principal_cache.get(user_id)
+    if user is None:
+        user = _cache_principal(user_id, (await db.execute(_principal_query(user_id))).first())
+    return _check_principal(payload, user)
+
+
+def _load_token_versions():
+    from app.models.user import User
     
-    payload = decode_token(token)
-    if payload is None:
-        raise credentials_exception
+    with SessionLocal() as db:
+        return db.query(User.id, User.token_version, User.is_active).all()
+
+
+def _get_token_version(user_id: int):
+    """
+    Get a user's token version, reloading the table in bulk when stale.
     
-    if payload.get("type") != "access":
-        raise credentials_exception
+    Always reads the primary: a lagging replica could still hold a revoked
+    version.
+    """
+    from app.models.user import User
     
-    user_id: str = payload.get("sub")
-    if user_id is None:
-        raise credentials_exception
+    token_versions.refresh(_load_token_versions)
     
-    user = db.query(User).filter(User.id == int(user_id)).first()
-    if user is None:
-        raise credentials_exception
+    current = token_versions.get(user_id)
+    if current is None and not token_versions.is_missing(user_id):
+        # Users created since the last reload
+        with SessionLocal() as db:
+            row = db.query(User.token_version, User.is_active).filter(User.id == user_id).first()
+        if row is None:
+            token_versions.discard(user_id)
+        else:
+            token_versions.set(user_id, row.token_version, row.is_active)
+            current = token_versions.get(user_id)
+    return current
+
+
+def _token_version_loaded(user_id: int) -> bool:
+    """Check whether _get_token_version can answer without touching the database."""
+    return not token_versions.is_stale() and (
+        token_versions.get(user_id) is not None or token_versions.is_missing(user_id)
+    )
+
+
+def _stateless_principal(payload: dict, current) -> TokenPrincipal:
+    if payload.get("role") is None:
+        raise _credentials_exception()
+    if current is None or payload.get("ver", 0) != current.version:
+        raise _credentials_exception()
+    if not current.is_active:
+        raise _inactive_exception()
+    return TokenPrincipal(id=int(payload["sub"]), role=payload["role"])
+
+
+def get_current_principal(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: Session = Depends(get_db)
+):
+    """
+    Dependency to get the caller for read-only routes.
     
-    if not user.is_active:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="User account is inactive"
-        )
+    With STATELESS_AUTH enabled, trusts the token's role claim and only checks
+    its version against the in-memory token version table, returning a
+    TokenPrincipal. Otherwise behaves like get_current_user.
+    """
+    if not settings.STATELESS_AUTH:
+        return get_current_user(credentials, db)
+    payload = _access_payload(credentials)
+    return _stateless_principal(payload, _get_token_version(int(payload["sub"])))
+
+
+async def get_current_principal_async(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Like get_current_principal, for async routes.
     
-    return user
+    The token version table is only reloaded in the threadpool when it is
+    stale or misses the user; otherwise nothing leaves the event loop.
+    """
+    if not settings.STATELESS_AUTH:
+        return await get_current_user_async(credentials, db)
+    payload = _access_payload(credentials)
+    user_id = int(payload["sub"])
+    if _token_version_loaded(user_id):
+        current = token_versions.get(user_id)
+    else:
+        current = await run_in_threadpool(_get_token_version, user_id)
+    return _stateless_principal(payload, current)
 
 
-def require_roles(allowed_roles: list):
-    """Decorator to restrict access based on role."""
-    def role_checker(current_user = Depends(get_current_user)):
+def require_roles(allowed_roles: list, current=get_current_user):
+    """
+    Decorator to restrict access based on role.
+    
+    current is the dependency that authenticates the caller, e.g.
+    get_current_principal or get_current_user_async.
+    """
+    def role_checker(current_user = Depends(current)):
         if current_user.role not in allowed_roles:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
@@ -106,6 +326,11 @@ def require_roles(allowed_roles: list):
     return role_checker
 
 
+def require_principal_roles(allowed_roles: list):
+    """Like require_roles, but for read-only routes using get_current_principal."""
+    return require_roles(allowed_roles, get_current_principal)
+
+
 # Role constants
 ROLE_USER = "user"
 ROLE_SUPERVISOR = "supervisor"
@@ -0,0 +1,63 @@
+from typing import Callable
+
+from fastapi import Request, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.routing import APIRoute
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.database import READ_METHODS
+
+
+class UnitOfWorkRoute(APIRoute):
+    """
+    Route that commits the request's database session exactly once.
+    
+    With UNIT_OF_WORK enabled, repositories only flush. The session is
+    committed after the handler returns a successful response and rolled back
+    when it raises or returns an error, before the response is sent.
+    """
+    
+    def get_route_handler(self) -> Callable:
+        handler = super().get_route_handler()
+        
+        async def route_handler(request: Request) -> Response:
+            try:
+                response = await handler(request)
+            except Exception:
+                await _finish(request, commit=False)
+                raise
+            await _finish(request, commit=response.status_code < 400)
+            return response
+        
+        return route_handler
+
+
+async def _finish(request: Request, commit: bool) -> None:
+    db = getattr(request.state, "db", None)
+    if db is None or not settings.UNIT_OF_WORK:
+        return
+    if commit and request.method not in READ_METHODS:
+        await run_in_threadpool(db.commit)
+    else:
+        await run_in_threadpool(db.rollback)
+
+
+def on_commit(db: Session, callback: Callable[[], None]) -> None:
+    """Run a callback once the session's changes are committed; dropped on rollback."""
+    if settings.UNIT_OF_WORK:
+        db.info.setdefault("on_commit", []).append(callback)
+    else:
+        callback()
+
+
+@event.listens_for(Session, "after_commit")
+def _run_on_commit(session: Session) -> None:
+    for callback in session.info.pop("on_commit", []):
+        callback()
+
+
+@event.listens_for(Session, "after_rollback")
+def _drop_on_commit(session: Session) -> None:
+    session.info.pop("on_commit", None)
@@ -0,0 +1,33 @@
+"""
+Delete expired rows from idempotency_keys.
+
+Expired keys are already ignored and reclaimed on reuse; this keeps the
+table small. Only needed with IDEMPOTENCY_STORE=database. Run it
+periodically, e.g. hourly from cron:
+
+    python -m app.jobs.purge_idempotency_keys
+"""
+import logging
+from datetime import datetime, timezone
+
+from app.core.database import SessionLocal
+from app.repositories.idempotency_repository import IdempotencyRepository
+
+logger = logging.getLogger(__name__)
+
+
+def purge_idempotency_keys() -> int:
+    """Delete every expired key in one transaction."""
+    with SessionLocal() as db:
+        purged = IdempotencyRepository(db).purge_expired(datetime.now(timezone.utc))
+        db.commit()
+    return purged
+
+
+def main() -> None:
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    logger.info("%d expired idempotency key(s) deleted", purge_idempotency_keys())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+"""
+Recount entity_counters from the source tables.
+
+The triggers keep the counters exact; this catches drift from anything
+that bypassed them (manual fixes, restores). Run it periodically, e.g.
+nightly from cron:
+
+    python -m app.jobs.reconcile_counters
+"""
+import logging
+from typing import Dict
+
+from app.core.database import SessionLocal, engine
+from app.models.entity_counter import COUNTED_DIMENSIONS
+from app.repositories.counter_repository import CounterRepository
+
+logger = logging.getLogger(__name__)
+
+
+def reconcile_counters() -> Dict[str, int]:
+    """Recount every counted table, one short transaction per table."""
+    drifted = {}
+    with SessionLocal() as db:
+        counter_repo = CounterRepository(db)
+        for entity in COUNTED_DIMENSIONS:
+            drifted[entity] = counter_repo.reconcile(entity)
+            db.commit()
+    return drifted
+
+
+def main() -> None:
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    if engine.dialect.name != "postgresql":
+        logger.info("entity_counters are only maintained on PostgreSQL; nothing to do")
+        return
+    for entity, drifted in reconcile_counters().items():
+        logger.info("%s: %d counter slot(s) corrected", entity, drifted)
+
+
+if __name__ == "__main__":
+    main()
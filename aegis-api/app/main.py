@@ -1,8 +1,21 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
+from app.core.cache import principal_cache, stats_cache, token_cache
 from app.core.config import settings
-from app.routers import auth_router, user_router, inspection_router, incident_router, permit_router
+from app.core.security import shutdown_password_pool
+from app.routers import (
+    auth_router,
+    user_router,
+    inspection_router,
+    incident_router,
+    permit_router,
+    search_router,
+    stats_router,
+    export_router,
+    sync_router,
+)
+from app.services.inspection_service import inspection_writer
 
 # Create FastAPI application
 app = FastAPI(
@@ -17,6 +30,10 @@ app = FastAPI(
     * **Inspections** - Safety inspection reports
     * **Incidents** - Incident reporting and investigation tracking
     * **Permits (PTW)** - Permit to Work management with approval workflow
+    * **Search** - Ranked full-text search across incidents, inspections and permits
+    * **Statistics** - Dashboard counts by status, category and month
+    * **Exports** - Parquet table exports for analytics (admin)
+    * **Sync** - Changes since a watermark for offline clients
     
     ### Roles
     
@@ -42,14 +59,31 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "ETag", "X-Export-Rows", "X-Export-Watermark", "Idempotent-Replayed"],
 )
 
+# Async read routes take precedence over their sync counterparts when enabled
+if settings.DATABASE_ASYNC:
+    for module in (user_router, inspection_router, incident_router, permit_router):
+        app.include_router(module.async_router, prefix="/api/v1", include_in_schema=False)
+
 # Include routers
 app.include_router(auth_router.router, prefix="/api/v1")
 app.include_router(user_router.router, prefix="/api/v1")
 app.include_router(inspection_router.router, prefix="/api/v1")
 app.include_router(incident_router.router, prefix="/api/v1")
 app.include_router(permit_router.router, prefix="/api/v1")
+app.include_router(search_router.router, prefix="/api/v1")
+app.include_router(stats_router.router, prefix="/api/v1")
+app.include_router(export_router.router, prefix="/api/v1")
+app.include_router(sync_router.router, prefix="/api/v1")
+
+
+@app.on_event("shutdown")
+def shutdown_event():
+    """Stop background worker pools, writing any queued inspections first."""
+    inspection_writer.stop()
+    shutdown_password_pool()
 
 
 @app.get("/", tags=["Root"])
@@ -70,7 +104,15 @@ def health_check():
     """
     Health check endpoint for monitoring.
     """
-    return {"status": "healthy"}
+    return {
+        "status": "healthy",
+        "caches": {
+            "principal": principal_cache.stats(),
+            "token": token_cache.stats(),
+            "stats": stats_cache.stats()
+        },
+        "group_commit": inspection_writer.stats()
+    }
 
 
 if __name__ == "__main__":
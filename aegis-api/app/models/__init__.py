@@ -2,6 +2,10 @@ from app.models.user import User
 from app.models.inspection import Inspection
 from app.models.incident import Incident
 from app.models.permit import Permit
+from app.models.entity_counter import EntityCounter
+from app.models.sync_change import SyncTombstone
+from app.models.idempotency_key import IdempotencyKey
+from app.models import search_index  # noqa: F401  registers search DDL
 
-__all__ = ["User", "Inspection", "Incident", "Permit"]
+__all__ = ["User", "Inspection", "Incident", "Permit", "EntityCounter", "SyncTombstone", "IdempotencyKey"]
 
@@ -0,0 +1,118 @@
+"""
+Row counts per entity, dimension and value.
+
+On PostgreSQL a row-level trigger on each counted table keeps
+``entity_counters`` current in the same transaction as the write, so list
+totals and counts read a few rows instead of running ``count(*)``. The
+``total`` dimension (value ``""``) counts every row.
+
+Each count is spread over ``COUNTER_SLOTS`` rows, one per ``id % COUNTER_SLOTS``,
+and read as their sum, so concurrent inserts rarely wait on the same row lock.
+``app.jobs.reconcile_counters`` recounts them periodically.
+"""
+from sqlalchemy import BigInteger, Column, DDL, SmallInteger, String, event
+
+from app.core.database import Base
+from app.models.incident import Incident
+from app.models.inspection import Inspection
+from app.models.permit import Permit
+from app.models.user import User
+
+TOTAL = "total"
+
+# Rows each count is spread over
+COUNTER_SLOTS = 16
+
+# Columns counted per value, by table
+COUNTED_DIMENSIONS = {
+    User.__tablename__: ("role",),
+    Inspection.__tablename__: ("status", "category"),
+    Incident.__tablename__: ("category", "investigation_status"),
+    Permit.__tablename__: ("permit_type", "approval_status"),
+}
+
+
+class EntityCounter(Base):
+    __tablename__ = "entity_counters"
+
+    entity = Column(String(50), primary_key=True)
+    dimension = Column(String(50), primary_key=True)
+    value = Column(String(100), primary_key=True)
+    slot = Column(SmallInteger, primary_key=True, default=0)
+    count = Column(BigInteger, nullable=False, default=0)
+
+    def __repr__(self):
+        return f"<EntityCounter {self.entity}.{self.dimension}={self.value}[{self.slot}]: {self.count}>"
+
+
+# Applies one row change to the counters; TG_ARGV lists the counted columns
+COUNTER_FUNCTION_SQL = f"""
+CREATE OR REPLACE FUNCTION entity_counters_apply() RETURNS trigger AS $$
+DECLARE
+    dimension_name text;
+    old_row jsonb := CASE WHEN TG_OP <> 'INSERT' THEN to_jsonb(OLD) END;
+    new_row jsonb := CASE WHEN TG_OP <> 'DELETE' THEN to_jsonb(NEW) END;
+    row_slot smallint := (coalesce(new_row, old_row) ->> 'id')::bigint % {COUNTER_SLOTS};
+BEGIN
+    FOREACH dimension_name IN ARRAY TG_ARGV || ARRAY['total'] LOOP
+        CONTINUE WHEN TG_OP = 'UPDATE'
+            AND old_row ->> dimension_name IS NOT DISTINCT FROM new_row ->> dimension_name;
+        IF old_row IS NOT NULL THEN
+            UPDATE entity_counters SET count = count - 1
+            WHERE entity = TG_TABLE_NAME
+              AND dimension = dimension_name
+              AND value = coalesce(old_row ->> dimension_name, '')
+              AND slot = row_slot;
+        END IF;
+        IF new_row IS NOT NULL THEN
+            INSERT INTO entity_counters (entity, dimension, value, slot, count)
+            VALUES (TG_TABLE_NAME, dimension_name, coalesce(new_row ->> dimension_name, ''), row_slot, 1)
+            ON CONFLICT (entity, dimension, value, slot)
+            DO UPDATE SET count = entity_counters.count + 1;
+        END IF;
+    END LOOP;
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql
+"""
+
+
+def counter_trigger_sql(table: str) -> str:
+    """Create the trigger that keeps a table's counters current."""
+    dimensions = COUNTED_DIMENSIONS[table]
+    arguments = ", ".join(f"'{dimension}'" for dimension in dimensions)
+    return (
+        f"CREATE TRIGGER {table}_entity_counters "
+        f"AFTER INSERT OR DELETE OR UPDATE OF {', '.join(dimensions)} ON {table} "
+        f"FOR EACH ROW EXECUTE FUNCTION entity_counters_apply({arguments})"
+    )
+
+
+def counts_select_sql(table: str) -> str:
+    """Select a table's true (entity, dimension, value, slot, count) rows."""
+    slot = f"id % {COUNTER_SLOTS}"
+    selects = [f"SELECT '{table}', '{TOTAL}', '', {slot}, count(*) FROM {table} GROUP BY {slot}"] + [
+        f"SELECT '{table}', '{dimension}', {dimension}, {slot}, count(*) FROM {table} "
+        f"GROUP BY {dimension}, {slot}"
+        for dimension in COUNTED_DIMENSIONS[table]
+    ]
+    return " UNION ALL ".join(selects)
+
+
+def _attach_ddl() -> None:
+    """Register the counter function and triggers to run after create_all."""
+    # DDL applies %-formatting to its statement, so the slot modulo is escaped
+    event.listen(
+        Base.metadata,
+        "after_create",
+        DDL(COUNTER_FUNCTION_SQL.replace("%", "%%")).execute_if(dialect="postgresql"),
+    )
+    for table in COUNTED_DIMENSIONS:
+        event.listen(
+            Base.metadata,
+            "after_create",
+            DDL(counter_trigger_sql(table)).execute_if(dialect="postgresql"),
+        )
+
+
+_attach_ddl()
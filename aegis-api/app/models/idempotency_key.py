@@ -0,0 +1,26 @@
+"""
+Responses of create requests, keyed by their ``Idempotency-Key`` header.
+
+Used when ``IDEMPOTENCY_STORE=database``, so every worker process sees the
+same keys. Rows expire after ``IDEMPOTENCY_TTL_SECONDS``;
+``app.jobs.purge_idempotency_keys`` deletes the expired ones.
+"""
+from sqlalchemy import Column, DateTime, LargeBinary, SmallInteger
+
+from app.core.database import Base
+
+
+class IdempotencyKey(Base):
+    __tablename__ = "idempotency_keys"
+
+    # Digest of (user, path, Idempotency-Key header)
+    key = Column(LargeBinary(16), primary_key=True)
+    # Digest of the request body the key was first used with
+    fingerprint = Column(LargeBinary(16), nullable=False)
+    # NULL while the first request is still running
+    status_code = Column(SmallInteger, nullable=True)
+    body = Column(LargeBinary, nullable=True)
+    expires_at = Column(DateTime(timezone=True), nullable=False, index=True)
+
+    def __repr__(self):
+        return f"<IdempotencyKey {self.key.hex()}>"
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Enum
+from sqlalchemy import BigInteger, Column, Integer, String, Text, DateTime, ForeignKey, Enum, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 import enum
@@ -19,8 +19,27 @@ class InvestigationStatus(str, enum.Enum):
     closed = "closed"
 
 
+# Closed incidents rarely change, so clients may reuse them briefly
+FINAL_INVESTIGATION_STATUSES = (InvestigationStatus.closed.value,)
+
+
 class Incident(Base):
     __tablename__ = "incidents"
+    # Fetch server-generated columns with RETURNING instead of a refresh
+    __mapper_args__ = {"eager_defaults": True}
+    # Newest-first listing, alone and behind each equality filter
+    __table_args__ = (
+        Index("ix_incidents_created_at_id", "created_at", "id"),
+        Index("ix_incidents_user_id_created_at_id", "user_id", "created_at", "id"),
+        Index("ix_incidents_category_created_at_id", "category", "created_at", "id"),
+        Index("ix_incidents_investigation_status_created_at_id", "investigation_status", "created_at", "id"),
+        # Occurred from/to range filter
+        Index("ix_incidents_incident_datetime", "incident_datetime"),
+        # Incremental Parquet exports (rows written after a change stamp)
+        Index("ix_incidents_change_xid_change_seq", "change_xid", "change_seq"),
+        # A user's /sync change feed
+        Index("ix_incidents_user_id_change_xid_change_seq", "user_id", "change_xid", "change_seq"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
@@ -34,6 +53,10 @@ class Incident(Base):
     investigation_notes = Column(Text, nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    # Position in the /sync change feed, stamped by a trigger on every write
+    # (see app.models.sync_change)
+    change_xid = Column(BigInteger, nullable=True)
+    change_seq = Column(BigInteger, nullable=True)
 
     # Relationship
     user = relationship("User", back_populates="incidents")
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Enum
+from sqlalchemy import BigInteger, Column, Integer, String, Text, DateTime, ForeignKey, Enum, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 import enum
@@ -13,6 +13,19 @@ class InspectionStatus(str, enum.Enum):
 
 class Inspection(Base):
     __tablename__ = "inspections"
+    # Fetch server-generated columns with RETURNING instead of a refresh
+    __mapper_args__ = {"eager_defaults": True}
+    # Newest-first listing, alone and behind each equality filter
+    __table_args__ = (
+        Index("ix_inspections_created_at_id", "created_at", "id"),
+        Index("ix_inspections_user_id_created_at_id", "user_id", "created_at", "id"),
+        Index("ix_inspections_status_created_at_id", "status", "created_at", "id"),
+        Index("ix_inspections_category_created_at_id", "category", "created_at", "id"),
+        # Incremental Parquet exports (rows written after a change stamp)
+        Index("ix_inspections_change_xid_change_seq", "change_xid", "change_seq"),
+        # A user's /sync change feed
+        Index("ix_inspections_user_id_change_xid_change_seq", "user_id", "change_xid", "change_seq"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
@@ -23,6 +36,10 @@ class Inspection(Base):
     status = Column(String(50), default=InspectionStatus.safe.value, nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    # Position in the /sync change feed, stamped by a trigger on every write
+    # (see app.models.sync_change)
+    change_xid = Column(BigInteger, nullable=True)
+    change_seq = Column(BigInteger, nullable=True)
 
     # Relationship
     user = relationship("User", back_populates="inspections")
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Enum
+from sqlalchemy import BigInteger, Column, Integer, String, Text, DateTime, ForeignKey, Enum, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 import enum
@@ -18,8 +18,27 @@ class ApprovalStatus(str, enum.Enum):
     rejected = "rejected"
 
 
+# Processed permits can no longer change
+FINAL_APPROVAL_STATUSES = (ApprovalStatus.approved.value, ApprovalStatus.rejected.value)
+
+
 class Permit(Base):
     __tablename__ = "permits"
+    # Fetch server-generated columns with RETURNING instead of a refresh
+    __mapper_args__ = {"eager_defaults": True}
+    # Newest-first listing, alone and behind each equality filter
+    __table_args__ = (
+        Index("ix_permits_created_at_id", "created_at", "id"),
+        Index("ix_permits_user_id_created_at_id", "user_id", "created_at", "id"),
+        Index("ix_permits_permit_type_created_at_id", "permit_type", "created_at", "id"),
+        Index("ix_permits_approval_status_created_at_id", "approval_status", "created_at", "id"),
+        # Start from/to range filter
+        Index("ix_permits_start_date", "start_date"),
+        # Incremental Parquet exports (rows written after a change stamp)
+        Index("ix_permits_change_xid_change_seq", "change_xid", "change_seq"),
+        # A user's /sync change feed
+        Index("ix_permits_user_id_change_xid_change_seq", "user_id", "change_xid", "change_seq"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
@@ -33,6 +52,10 @@ class Permit(Base):
     approval_notes = Column(Text, nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    # Position in the /sync change feed, stamped by a trigger on every write
+    # (see app.models.sync_change)
+    change_xid = Column(BigInteger, nullable=True)
+    change_seq = Column(BigInteger, nullable=True)
 
     # Relationships
     user = relationship("User", back_populates="permits", foreign_keys=[user_id])
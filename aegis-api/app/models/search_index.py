@@ -0,0 +1,165 @@
+"""
+Full-text search documents for incidents, inspections and permits.
+
+PostgreSQL stores a weighted ``search_vector`` tsvector as a generated column
+on each table (see the Alembic migration), so it is rebuilt on every write and
+served by a GIN index. SQLite has no tsvector; there an FTS5 table,
+``search_index``, is kept in sync by triggers. Both are attached to
+``Base.metadata`` so ``create_all`` builds them too.
+
+PostgreSQL also gets ``pg_trgm`` GIN indexes on user names and locations,
+which serve both ``ILIKE '%...%'`` and the typo-tolerant ``%`` similarity
+operator.
+"""
+from typing import NamedTuple
+
+from sqlalchemy import DDL, event
+
+from app.core.database import Base
+from app.models.incident import Incident
+from app.models.inspection import Inspection
+from app.models.permit import Permit
+from app.models.user import User
+
+# Text search configuration; "simple" does not stem, so it suits mixed-language reports
+TS_CONFIG = "simple"
+
+
+class SearchDocument(NamedTuple):
+    kind: str
+    table: str
+    # SQL expressions over the row; {row} is "" or a trigger's NEW./OLD. prefix
+    title: str
+    body: str
+    # Distinguishes entity types inside the shared FTS5 rowid space
+    rowid_offset: int
+
+
+SEARCH_DOCUMENTS = (
+    SearchDocument(
+        kind="incident",
+        table=Incident.__tablename__,
+        title="{row}title",
+        body="coalesce({row}description, '') || ' ' || {row}location || ' ' || {row}category",
+        rowid_offset=1,
+    ),
+    SearchDocument(
+        kind="inspection",
+        table=Inspection.__tablename__,
+        title="{row}location",
+        body="{row}category || ' ' || coalesce({row}description, '')",
+        rowid_offset=2,
+    ),
+    SearchDocument(
+        kind="permit",
+        table=Permit.__tablename__,
+        title="coalesce({row}location, {row}permit_type)",
+        body="{row}permit_type || ' ' || coalesce({row}description, '')",
+        rowid_offset=3,
+    ),
+)
+
+SEARCH_KINDS = tuple(document.kind for document in SEARCH_DOCUMENTS)
+
+# Columns with a trigram index, for substring and fuzzy matching
+TRIGRAM_COLUMNS = {
+    User.__tablename__: ("full_name", "email", "username"),
+    Incident.__tablename__: ("location",),
+    Inspection.__tablename__: ("location",),
+    Permit.__tablename__: ("location",),
+}
+
+
+def search_vector_sql(document: SearchDocument) -> str:
+    """Build the weighted tsvector expression for a table (title ranks above body)."""
+    title = document.title.format(row="")
+    body = document.body.format(row="")
+    return (
+        f"setweight(to_tsvector('{TS_CONFIG}', coalesce({title}, '')), 'A') || "
+        f"setweight(to_tsvector('{TS_CONFIG}', coalesce({body}, '')), 'B')"
+    )
+
+
+def sqlite_rowid_sql(document: SearchDocument, row: str) -> str:
+    """Map an entity id to its FTS5 rowid."""
+    return f"{row}id * 4 + {document.rowid_offset}"
+
+
+def _sqlite_insert_sql(document: SearchDocument, row: str = "NEW.") -> str:
+    return (
+        "INSERT INTO search_index(rowid, title, body, kind, ref_id) VALUES ("
+        f"{sqlite_rowid_sql(document, row)}, "
+        f"{document.title.format(row=row)}, "
+        f"{document.body.format(row=row)}, "
+        f"'{document.kind}', {row}id);"
+    )
+
+
+def _sqlite_delete_sql(document: SearchDocument) -> str:
+    return f"DELETE FROM search_index WHERE rowid = {sqlite_rowid_sql(document, 'OLD.')};"
+
+
+def _attach_ddl() -> None:
+    """Register search DDL to run after create_all builds the tables."""
+    event.listen(
+        Base.metadata,
+        "before_create",
+        DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(dialect="postgresql"),
+    )
+    for table_name, columns in TRIGRAM_COLUMNS.items():
+        for column in columns:
+            event.listen(
+                Base.metadata.tables[table_name],
+                "after_create",
+                DDL(
+                    f"CREATE INDEX IF NOT EXISTS ix_{table_name}_{column}_trgm "
+                    f"ON {table_name} USING gin ({column} gin_trgm_ops)"
+                ).execute_if(dialect="postgresql"),
+            )
+
+    for document in SEARCH_DOCUMENTS:
+        table = Base.metadata.tables[document.table]
+        for statement in (
+            f"ALTER TABLE {document.table} ADD COLUMN IF NOT EXISTS search_vector tsvector "
+            f"GENERATED ALWAYS AS ({search_vector_sql(document)}) STORED",
+            f"CREATE INDEX IF NOT EXISTS ix_{document.table}_search_vector "
+            f"ON {document.table} USING gin (search_vector)",
+        ):
+            event.listen(table, "after_create", DDL(statement).execute_if(dialect="postgresql"))
+
+    event.listen(
+        Base.metadata,
+        "after_create",
+        DDL(
+            "CREATE VIRTUAL TABLE IF NOT EXISTS search_index "
+            "USING fts5(title, body, kind UNINDEXED, ref_id UNINDEXED)"
+        ).execute_if(dialect="sqlite"),
+    )
+    for document in SEARCH_DOCUMENTS:
+        for name, timing, body in (
+            ("ai", "AFTER INSERT", _sqlite_insert_sql(document)),
+            ("au", "AFTER UPDATE", _sqlite_delete_sql(document) + " " + _sqlite_insert_sql(document)),
+            ("ad", "AFTER DELETE", _sqlite_delete_sql(document)),
+        ):
+            event.listen(
+                Base.metadata,
+                "after_create",
+                DDL(
+                    f"CREATE TRIGGER IF NOT EXISTS {document.table}_search_{name} "
+                    f"{timing} ON {document.table} BEGIN {body} END"
+                ).execute_if(dialect="sqlite"),
+            )
+        # Index rows that predate the triggers
+        event.listen(
+            Base.metadata,
+            "after_create",
+            DDL(
+                "INSERT INTO search_index(rowid, title, body, kind, ref_id) "
+                f"SELECT {sqlite_rowid_sql(document, '')}, {document.title.format(row='')}, "
+                f"{document.body.format(row='')}, '{document.kind}', id FROM {document.table} "
+                f"WHERE {sqlite_rowid_sql(document, '')} NOT IN (SELECT rowid FROM search_index)"
+            ).execute_if(dialect="sqlite"),
+        )
+
+
+_attach_ddl()
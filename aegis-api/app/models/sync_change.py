@@ -0,0 +1,140 @@
+"""
+Change feed for offline clients (``GET /api/v1/sync``).
+
+Every insert or update of a synced table stamps the row with
+``(change_xid, change_seq)``: the writing transaction's id and the next value
+of one shared sequence. Every delete leaves a ``sync_tombstones`` row stamped
+the same way. Clients page through changes in stamp order.
+
+Sequence values are taken when a row is written, not when its transaction
+commits, so a slow transaction can commit a lower ``change_seq`` after a
+client has read past it. On PostgreSQL, ``/sync`` therefore only returns
+changes from transactions older than every transaction still running (the
+snapshot's xmin); anything newer waits for the next call. SQLite runs one
+writer at a time, so there ``change_xid`` is always 0 and a plain counter in
+``sync_sequence`` orders the changes.
+
+``users`` rows are stamped the same way (without tombstones) so incremental
+Parquet exports can pick up changes by stamp under the same horizon.
+"""
+from sqlalchemy import BigInteger, Column, DateTime, DDL, Index, Integer, String, event
+from sqlalchemy.sql import func
+
+from app.core.database import Base
+from app.models.incident import Incident
+from app.models.inspection import Inspection
+from app.models.permit import Permit
+from app.models.user import User
+
+# Owned by a user and streamed to their devices
+SYNCED_TABLES = (
+    Inspection.__tablename__,
+    Incident.__tablename__,
+    Permit.__tablename__,
+)
+
+# Stamped on every write; deletes leave tombstones only for the synced tables
+STAMPED_TABLES = SYNCED_TABLES + (User.__tablename__,)
+
+CHANGE_COLUMNS = ("change_xid", "change_seq")
+
+
+class SyncTombstone(Base):
+    __tablename__ = "sync_tombstones"
+    __table_args__ = (
+        Index("ix_sync_tombstones_user_id_change_xid_change_seq", "user_id", "change_xid", "change_seq"),
+    )
+
+    change_seq = Column(BigInteger, primary_key=True, autoincrement=False)
+    change_xid = Column(BigInteger, nullable=False)
+    entity = Column(String(50), nullable=False)
+    entity_id = Column(Integer, nullable=False)
+    user_id = Column(Integer, nullable=False)
+    deleted_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    def __repr__(self):
+        return f"<SyncTombstone {self.entity} {self.entity_id}>"
+
+
+STAMP_FUNCTION_SQL = """
+CREATE OR REPLACE FUNCTION sync_stamp_change() RETURNS trigger AS $$
+BEGIN
+    NEW.change_xid := pg_current_xact_id()::text::bigint;
+    NEW.change_seq := nextval('sync_change_seq');
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql
+"""
+
+TOMBSTONE_FUNCTION_SQL = """
+CREATE OR REPLACE FUNCTION sync_record_tombstone() RETURNS trigger AS $$
+BEGIN
+    INSERT INTO sync_tombstones (change_seq, change_xid, entity, entity_id, user_id)
+    VALUES (nextval('sync_change_seq'), pg_current_xact_id()::text::bigint, TG_TABLE_NAME, OLD.id, OLD.user_id);
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql
+"""
+
+
+def sync_trigger_sql(table: str) -> list:
+    """Create the triggers that stamp a table's writes and, when synced, record its deletes."""
+    statements = [
+        f"CREATE TRIGGER {table}_sync_stamp BEFORE INSERT OR UPDATE ON {table} "
+        f"FOR EACH ROW EXECUTE FUNCTION sync_stamp_change()",
+    ]
+    if table in SYNCED_TABLES:
+        statements.append(
+            f"CREATE TRIGGER {table}_sync_tombstone AFTER DELETE ON {table} "
+            f"FOR EACH ROW EXECUTE FUNCTION sync_record_tombstone()"
+        )
+    return statements
+
+
+def _sqlite_trigger_sql(table: str) -> list:
+    next_seq = "UPDATE sync_sequence SET value = value + 1;"
+    stamp = (
+        f"UPDATE {table} SET change_xid = 0, change_seq = (SELECT value FROM sync_sequence) "
+        "WHERE id = NEW.id;"
+    )
+    # Listing the columns keeps the stamping UPDATE from firing the trigger again
+    columns = ", ".join(
+        column.name for column in Base.metadata.tables[table].columns
+        if column.name not in CHANGE_COLUMNS
+    )
+    statements = [
+        f"CREATE TRIGGER IF NOT EXISTS {table}_sync_ai AFTER INSERT ON {table} "
+        f"BEGIN {next_seq} {stamp} END",
+        f"CREATE TRIGGER IF NOT EXISTS {table}_sync_au AFTER UPDATE OF {columns} ON {table} "
+        f"BEGIN {next_seq} {stamp} END",
+    ]
+    if table in SYNCED_TABLES:
+        statements.append(
+            f"CREATE TRIGGER IF NOT EXISTS {table}_sync_ad AFTER DELETE ON {table} "
+            f"BEGIN {next_seq} "
+            "INSERT INTO sync_tombstones (change_seq, change_xid, entity, entity_id, user_id, deleted_at) "
+            f"VALUES ((SELECT value FROM sync_sequence), 0, '{table}', OLD.id, OLD.user_id, CURRENT_TIMESTAMP); "
+            "END"
+        )
+    return statements
+
+
+def _attach_ddl() -> None:
+    """Register the change sequence and triggers to run after create_all."""
+    for statement in (
+        "CREATE SEQUENCE IF NOT EXISTS sync_change_seq",
+        STAMP_FUNCTION_SQL,
+        TOMBSTONE_FUNCTION_SQL,
+        *(sql for table in STAMPED_TABLES for sql in sync_trigger_sql(table)),
+    ):
+        event.listen(Base.metadata, "after_create", DDL(statement).execute_if(dialect="postgresql"))
+
+    for statement in (
+        "CREATE TABLE IF NOT EXISTS sync_sequence (value INTEGER NOT NULL)",
+        "INSERT INTO sync_sequence (value) SELECT 0 WHERE NOT EXISTS (SELECT 1 FROM sync_sequence)",
+        *(sql for table in STAMPED_TABLES for sql in _sqlite_trigger_sql(table)),
+    ):
+        event.listen(Base.metadata, "after_create", DDL(statement).execute_if(dialect="sqlite"))
+
+
+_attach_ddl()
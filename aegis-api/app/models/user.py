@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, Enum
+from sqlalchemy import BigInteger, Column, Integer, String, Boolean, DateTime, Enum, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 import enum
@@ -15,6 +15,15 @@ class UserRole(str, enum.Enum):
 
 class User(Base):
     __tablename__ = "users"
+    # Fetch server-generated columns with RETURNING instead of a refresh
+    __mapper_args__ = {"eager_defaults": True}
+    # Newest-first listing and role filters
+    __table_args__ = (
+        Index("ix_users_created_at_id", "created_at", "id"),
+        Index("ix_users_role", "role"),
+        # Incremental Parquet exports (rows written after a change stamp)
+        Index("ix_users_change_xid_change_seq", "change_xid", "change_seq"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     email = Column(String(255), unique=True, index=True, nullable=False)
@@ -25,13 +34,18 @@ class User(Base):
     department = Column(String(100), nullable=True)
     role = Column(String(50), default=UserRole.user.value, nullable=False)
     is_active = Column(Boolean, default=True)
+    token_version = Column(Integer, default=0, server_default="0", nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    # Stamped by a trigger on every write, like the synced tables
+    # (see app.models.sync_change)
+    change_xid = Column(BigInteger, nullable=True)
+    change_seq = Column(BigInteger, nullable=True)
 
     # Relationships
     inspections = relationship("Inspection", back_populates="user", lazy="dynamic")
     incidents = relationship("Incident", back_populates="user", lazy="dynamic")
-    permits = relationship("Permit", back_populates="user", lazy="dynamic")
+    permits = relationship("Permit", back_populates="user", lazy="dynamic", foreign_keys="Permit.user_id")
 
     def __repr__(self):
         return f"<User {self.username}>"
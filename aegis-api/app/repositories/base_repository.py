@@ -1,9 +1,116 @@
-from typing import TypeVar, Generic, Type, Optional, List
+from typing import TypeVar, Generic, Type, Optional, Iterator, List, Sequence, Tuple
+from pydantic import BaseModel
+from sqlalchemy import Integer, any_, bindparam, func, insert, or_, select
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.engine import Row
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
+from app.core.config import settings
 from app.core.database import Base
+from app.models.entity_counter import COUNTED_DIMENSIONS, TOTAL
+from app.core.pagination import (
+    Cursor,
+    Page,
+    count_statement,
+    explain_statement,
+    newest_first,
+    page_statement,
+    plan_rows,
+)
+from app.repositories.counter_repository import counter_statement
 
 ModelType = TypeVar("ModelType", bound=Base)
 
+# (dimension, value) of an entity_counters row
+CounterKey = Tuple[str, str]
+
+
+def equal_criteria(model, values: dict) -> list:
+    """Turn {column: value} into equality criteria, skipping None values."""
+    return [getattr(model, field) == value for field, value in values.items() if value is not None]
+
+
+def id_criteria(model, ids: List[int], dialect_name: str):
+    """
+    Match rows whose id is in ids.
+    
+    PostgreSQL gets id = ANY(:ids) with a single array parameter, so the
+    statement text is the same however many ids there are.
+    """
+    if dialect_name == "postgresql":
+        return model.id == any_(bindparam("ids", ids, type_=ARRAY(Integer), unique=True))
+    return model.id.in_(ids)
+
+
+def range_criteria(column, start=None, end=None) -> list:
+    """Bound a column to [start, end], skipping missing ends."""
+    criteria = []
+    if start is not None:
+        criteria.append(column >= start)
+    if end is not None:
+        criteria.append(column <= end)
+    return criteria
+
+
+def contains_criteria(columns: list, text: Optional[str]) -> list:
+    """Match text as a case-insensitive substring of any of the columns."""
+    if not text:
+        return []
+    pattern = f"%{text}%"
+    return [or_(*(column.ilike(pattern) for column in columns))]
+
+
+def similar_criteria(columns: list, text: Optional[str]) -> list:
+    """
+    Match text as a substring of, or trigram-similar to, any of the columns.
+    
+    Needs PostgreSQL's pg_trgm; both tests are served by the trigram indexes.
+    """
+    if not text:
+        return []
+    pattern = f"%{text}%"
+    return [or_(
+        *(column.ilike(pattern) for column in columns),
+        *(column.op("%")(text) for column in columns)
+    )]
+
+
+def similarity_rank(columns: list, text: str):
+    """Best pg_trgm similarity between text and any of the columns."""
+    scores = [func.similarity(column, text) for column in columns]
+    return scores[0] if len(scores) == 1 else func.greatest(*scores)
+
+
+def counter_key(model, filters: BaseModel) -> Optional[CounterKey]:
+    """Get the counter holding the total for filters, if a single one does."""
+    given = filters.model_dump(exclude_defaults=True)
+    if not given:
+        return TOTAL, ""
+    if len(given) == 1:
+        (field, value), = given.items()
+        if field in COUNTED_DIMENSIONS.get(model.__tablename__, ()):
+            return field, str(value)
+    return None
+
+
+def counter_totals_enabled(db) -> bool:
+    """Check whether totals can be read from entity_counters."""
+    return settings.COUNTER_TOTALS and db.get_bind().dialect.name == "postgresql"
+
+
+def _plan_estimate(db: Session, model, criteria: list) -> int:
+    """Get the planner's row estimate for the rows of model matching criteria."""
+    sql, params = explain_statement(model, criteria, db.get_bind().dialect)
+    return plan_rows(db.connection().exec_driver_sql(sql, params).scalar())
+
+
+def _estimate_totals(db) -> bool:
+    """Check whether list totals should come from the planner."""
+    return (
+        settings.LIST_TOTAL_MODE == "estimated"
+        and db.get_bind().dialect.name == "postgresql"
+    )
+
 
 class BaseRepository(Generic[ModelType]):
     """Base repository with basic CRUD operations."""
@@ -12,29 +119,69 @@ class BaseRepository(Generic[ModelType]):
         self.model = model
         self.db = db
     
+    def _dialect_name(self) -> str:
+        """Get the name of the database dialect the session is bound to."""
+        return self.db.get_bind().dialect.name
+    
     def get(self, id: int) -> Optional[ModelType]:
         """Get a single record by ID."""
         return self.db.query(self.model).filter(self.model.id == id).first()
     
+    def get_version(self, id: int, *columns) -> Optional[Row]:
+        """Get a record's id, timestamps and columns without loading the entity."""
+        return self.db.execute(
+            select(*self.version_columns(), *columns).where(self.model.id == id)
+        ).first()
+    
     def get_all(self, skip: int = 0, limit: int = 100) -> List[ModelType]:
         """Get all records with pagination."""
         return self.db.query(self.model).offset(skip).limit(limit).all()
     
+    def existing_ids(self, ids: List[int]) -> set:
+        """Get which of ids exist, without loading the records."""
+        if not ids:
+            return set()
+        return set(self.db.scalars(
+            select(self.model.id).where(id_criteria(self.model, ids, self._dialect_name()))
+        ))
+    
     def create(self, obj_in: dict) -> ModelType:
         """Create a new record."""
+        if hasattr(self.model, "updated_at"):
+            # Starts NULL; setting it keeps eager_defaults from re-selecting it
+            obj_in = {"updated_at": None, **obj_in}
         db_obj = self.model(**obj_in)
         self.db.add(db_obj)
-        self.db.commit()
-        self.db.refresh(db_obj)
+        self._persist()
         return db_obj
     
+    def create_many(self, objs_in: List[dict]) -> List[ModelType]:
+        """
+        Create records with one multi-row INSERT ... RETURNING.
+        
+        All rows go in the same transaction and come back in the order given;
+        every dict must have the same keys. (SQLite cannot keep RETURNING in
+        order for a multi-row INSERT, so there rows are sent one at a time.)
+        """
+        if not objs_in:
+            return []
+        if hasattr(self.model, "updated_at"):
+            objs_in = [{"updated_at": None, **obj_in} for obj_in in objs_in]
+        created = list(self.db.scalars(
+            insert(self.model).returning(self.model, sort_by_parameter_order=True),
+            objs_in,
+            # Send None as NULL, so rows with different missing fields share one statement
+            execution_options={"render_nulls": True}
+        ))
+        self._persist()
+        return created
+    
     def update(self, db_obj: ModelType, obj_in: dict) -> ModelType:
         """Update an existing record."""
         for field, value in obj_in.items():
             if value is not None:
                 setattr(db_obj, field, value)
-        self.db.commit()
-        self.db.refresh(db_obj)
+        self._persist()
         return db_obj
     
     def delete(self, id: int) -> bool:
@@ -42,10 +189,243 @@ class BaseRepository(Generic[ModelType]):
         obj = self.get(id)
         if obj:
             self.db.delete(obj)
-            self.db.commit()
+            self._persist()
             return True
         return False
     
     def count(self) -> int:
         """Count total records."""
+        if counter_totals_enabled(self.db):
+            return self._counter(TOTAL, "")
         return self.db.query(self.model).count()
+    
+    def get_page(
+        self,
+        criteria: list,
+        skip: int = 0,
+        limit: int = 100,
+        cursor: Optional[Cursor] = None,
+        counter: Optional[CounterKey] = None,
+        columns: Optional[tuple] = None
+    ) -> Page:
+        """
+        Get a newest-first page and the number of records matching criteria.
+        
+        When counter names the entity_counters row equal to that number, the
+        total is read from it instead of being counted. With columns, items
+        are rows of those columns rather than entities.
+        """
+        if counter is not None and counter_totals_enabled(self.db):
+            items = self._items(
+                page_statement(self.model, criteria, skip, limit, cursor, False, columns),
+                columns
+            )
+            return Page(items, self._counter(*counter))
+        
+        if _estimate_totals(self.db):
+            items = self._items(
+                page_statement(self.model, criteria, skip, limit, cursor, False, columns),
+                columns
+            )
+            estimate = _plan_estimate(self.db, self.model, criteria)
+            if estimate >= settings.ESTIMATED_TOTAL_MIN_ROWS:
+                return Page(items, estimate, estimated=True)
+            return Page(items, self.db.scalar(count_statement(self.model, criteria)))
+        
+        rows = self.db.execute(
+            page_statement(self.model, criteria, skip, limit, cursor, columns=columns)
+        ).all()
+        if rows:
+            return Page([row if columns else row[0] for row in rows], rows[0][-1])
+        if skip == 0 and cursor is None:
+            return Page([], 0)
+        # Past the last page: no row carried the total
+        return Page([], self.db.scalar(count_statement(self.model, criteria)))
+    
+    def stream(
+        self,
+        criteria: list,
+        columns: tuple,
+        batch_size: Optional[int] = None,
+        order_by: Optional[tuple] = None
+    ) -> Iterator[Sequence[Row]]:
+        """
+        Yield every row of columns matching criteria in batches.
+        
+        Rows come newest first unless order_by gives other sort keys. They are
+        fetched batch_size (default EXPORT_BATCH_SIZE) at a time through a
+        server-side cursor, so memory use stays flat however many rows match.
+        """
+        if order_by is None:
+            order_by = (self.model.created_at.desc(), self.model.id.desc())
+        stmt = (
+            select(*columns)
+            .where(*criteria)
+            .order_by(*order_by)
+            .execution_options(yield_per=batch_size or settings.EXPORT_BATCH_SIZE)
+        )
+        yield from self.db.execute(stmt).partitions()
+    
+    def _page(self, query, skip: int = 0, limit: int = 100, cursor: Optional[Cursor] = None):
+        """Order newest first and apply a cursor or offset page."""
+        return newest_first(query, self.model, skip, limit, cursor)
+    
+    def _counter(self, dimension: str, value: str) -> int:
+        """Read this entity's counter for dimension = value."""
+        count = self.db.scalar(counter_statement(self.model.__tablename__, dimension, value))
+        return count or 0
+    
+    def _items(self, stmt, columns: Optional[tuple] = None) -> list:
+        """Execute a page select: entities, or rows when columns were selected."""
+        if columns:
+            return list(self.db.execute(stmt).all())
+        return list(self.db.scalars(stmt))
+    
+    def version_columns(self) -> tuple:
+        """Columns that identify a record's version, for ETags."""
+        return self.model.id, self.model.created_at, self.model.updated_at
+    
+    def columns_of(self, schema: Type[BaseModel]) -> tuple:
+        """Columns named by a schema's fields, in field order."""
+        return tuple(getattr(self.model, name) for name in schema.model_fields)
+    
+    def _persist(self) -> None:
+        """
+        Write pending changes.
+        
+        In unit-of-work mode this only flushes; the request commits once at the
+        end. Server-generated columns come back through RETURNING, so no
+        refresh is needed either way.
+        """
+        if settings.UNIT_OF_WORK:
+            self.db.flush()
+        else:
+            self.db.commit()
+
+
+class AsyncBaseRepository(Generic[ModelType]):
+    """Async base repository with basic CRUD operations."""
+    
+    def __init__(self, model: Type[ModelType], db: AsyncSession):
+        self.model = model
+        self.db = db
+    
+    def _dialect_name(self) -> str:
+        """Get the name of the database dialect the session is bound to."""
+        return self.db.get_bind().dialect.name
+    
+    async def get(self, id: int) -> Optional[ModelType]:
+        """Get a single record by ID."""
+        return await self.db.get(self.model, id)
+    
+    async def get_version(self, id: int, *columns) -> Optional[Row]:
+        """Get a record's id, timestamps and columns without loading the entity."""
+        result = await self.db.execute(
+            select(*self.version_columns(), *columns).where(self.model.id == id)
+        )
+        return result.first()
+    
+    async def get_all(self, skip: int = 0, limit: int = 100) -> List[ModelType]:
+        """Get all records with pagination."""
+        return await self._all(select(self.model).offset(skip).limit(limit))
+    
+    async def create(self, obj_in: dict) -> ModelType:
+        """Create a new record."""
+        if hasattr(self.model, "updated_at"):
+            obj_in = {"updated_at": None, **obj_in}
+        db_obj = self.model(**obj_in)
+        self.db.add(db_obj)
+        await self.db.commit()
+        return db_obj
+    
+    async def update(self, db_obj: ModelType, obj_in: dict) -> ModelType:
+        """Update an existing record."""
+        for field, value in obj_in.items():
+            if value is not None:
+                setattr(db_obj, field, value)
+        await self.db.commit()
+        return db_obj
+    
+    async def delete(self, id: int) -> bool:
+        """Delete a record by ID."""
+        obj = await self.get(id)
+        if obj:
+            await self.db.delete(obj)
+            await self.db.commit()
+            return True
+        return False
+    
+    async def count(self) -> int:
+        """Count total records."""
+        if counter_totals_enabled(self.db):
+            return await self._counter(TOTAL, "")
+        return await self._count(select(func.count()).select_from(self.model))
+    
+    async def get_page(
+        self,
+        criteria: list,
+        skip: int = 0,
+        limit: int = 100,
+        cursor: Optional[Cursor] = None,
+        counter: Optional[CounterKey] = None,
+        columns: Optional[tuple] = None
+    ) -> Page:
+        """Get a newest-first page and the number of records matching criteria."""
+        if counter is not None and counter_totals_enabled(self.db):
+            items = await self._items(
+                page_statement(self.model, criteria, skip, limit, cursor, False, columns),
+                columns
+            )
+            return Page(items, await self._counter(*counter))
+        
+        if _estimate_totals(self.db):
+            items = await self._items(
+                page_statement(self.model, criteria, skip, limit, cursor, False, columns),
+                columns
+            )
+            estimate = await self.db.run_sync(_plan_estimate, self.model, criteria)
+            if estimate >= settings.ESTIMATED_TOTAL_MIN_ROWS:
+                return Page(items, estimate, estimated=True)
+            return Page(items, await self._count(count_statement(self.model, criteria)))
+        
+        rows = (await self.db.execute(
+            page_statement(self.model, criteria, skip, limit, cursor, columns=columns)
+        )).all()
+        if rows:
+            return Page([row if columns else row[0] for row in rows], rows[0][-1])
+        if skip == 0 and cursor is None:
+            return Page([], 0)
+        # Past the last page: no row carried the total
+        return Page([], await self._count(count_statement(self.model, criteria)))
+    
+    def _page(self, stmt, skip: int = 0, limit: int = 100, cursor: Optional[Cursor] = None):
+        """Order newest first and apply a cursor or offset page."""
+        return newest_first(stmt, self.model, skip, limit, cursor)
+    
+    async def _all(self, stmt) -> List[ModelType]:
+        """Execute a select and return all entities."""
+        result = await self.db.scalars(stmt)
+        return list(result.all())
+    
+    async def _count(self, stmt) -> int:
+        """Execute a count select."""
+        return await self.db.scalar(stmt)
+    
+    async def _counter(self, dimension: str, value: str) -> int:
+        """Read this entity's counter for dimension = value."""
+        count = await self.db.scalar(counter_statement(self.model.__tablename__, dimension, value))
+        return count or 0
+    
+    async def _items(self, stmt, columns: Optional[tuple] = None) -> list:
+        """Execute a page select: entities, or rows when columns were selected."""
+        if columns:
+            return list((await self.db.execute(stmt)).all())
+        return await self._all(stmt)
+    
+    def version_columns(self) -> tuple:
+        """Columns that identify a record's version, for ETags."""
+        return self.model.id, self.model.created_at, self.model.updated_at
+    
+    def columns_of(self, schema: Type[BaseModel]) -> tuple:
+        """Columns named by a schema's fields, in field order."""
+        return tuple(getattr(self.model, name) for name in schema.model_fields)
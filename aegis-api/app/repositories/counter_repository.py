@@ -0,0 +1,59 @@
+from typing import Optional
+from sqlalchemy import BigInteger, cast, func, select, text
+from sqlalchemy.orm import Session
+
+from app.models.entity_counter import EntityCounter, counts_select_sql
+
+
+def counter_statement(entity: str, dimension: str, value: str):
+    """Select one counter's value, the sum of its slots."""
+    return select(cast(func.sum(EntityCounter.count), BigInteger)).where(
+        EntityCounter.entity == entity,
+        EntityCounter.dimension == dimension,
+        EntityCounter.value == value
+    )
+
+
+class CounterRepository:
+    """Repository for the trigger-maintained entity_counters table."""
+    
+    def __init__(self, db: Session):
+        self.db = db
+    
+    def get(self, entity: str, dimension: str, value: str) -> int:
+        """Get a counter; a missing counter means no rows."""
+        count: Optional[int] = self.db.scalar(counter_statement(entity, dimension, value))
+        return count or 0
+    
+    def reconcile(self, entity: str) -> int:
+        """
+        Recount an entity's counters from its table.
+        
+        Holds a SHARE lock on the table until the caller commits, so writes
+        to it wait instead of racing the recount. Returns the number of
+        counter slots that had drifted.
+        """
+        self.db.execute(text(f"LOCK TABLE {entity} IN SHARE MODE"))
+        stored = {
+            (counter.dimension, counter.value, counter.slot): counter.count
+            for counter in self.db.scalars(
+                select(EntityCounter).where(EntityCounter.entity == entity)
+            )
+        }
+        actual = {
+            (dimension, value, slot): count
+            for _, dimension, value, slot, count in self.db.execute(text(counts_select_sql(entity)))
+        }
+        drifted = sum(
+            1 for key in stored.keys() | actual.keys()
+            if stored.get(key, 0) != actual.get(key, 0)
+        )
+        if drifted:
+            self.db.execute(
+                EntityCounter.__table__.delete().where(EntityCounter.entity == entity)
+            )
+            self.db.execute(text(
+                "INSERT INTO entity_counters (entity, dimension, value, slot, count) "
+                + counts_select_sql(entity)
+            ))
+        return drifted
@@ -0,0 +1,82 @@
+from typing import Iterator, Optional, Sequence
+
+from sqlalchemy import select, tuple_
+from sqlalchemy.engine import Row
+from sqlalchemy.orm import Session
+
+from app.models.incident import Incident
+from app.models.inspection import Inspection
+from app.models.permit import Permit
+from app.models.sync_change import CHANGE_COLUMNS
+from app.models.user import User
+from app.repositories.base_repository import BaseRepository
+from app.repositories.sync_repository import ChangeStamp, SyncRepository
+
+EXPORT_MODELS = {
+    model.__tablename__: model for model in (User, Inspection, Incident, Permit)
+}
+
+# Credentials, auth and sync bookkeeping never leave the database
+EXCLUDED_COLUMNS = {
+    **{table: CHANGE_COLUMNS for table in EXPORT_MODELS},
+    User.__tablename__: ("hashed_password", "token_version", *CHANGE_COLUMNS),
+}
+
+
+def change_stamp(model):
+    """(change_xid, change_seq) of a row's last write; served by the ix_<table>_change_xid_change_seq indexes."""
+    return tuple_(model.change_xid, model.change_seq)
+
+
+class ExportRepository:
+    """Bulk reads of whole tables for Parquet exports."""
+    
+    def __init__(self, db: Session):
+        self.db = db
+    
+    def export_columns(self, table: str) -> tuple:
+        """Columns of a table that are exported."""
+        excluded = EXCLUDED_COLUMNS.get(table, ())
+        return tuple(
+            column for column in EXPORT_MODELS[table].__table__.columns
+            if column.name not in excluded
+        )
+    
+    def horizon(self) -> int:
+        """Get the first transaction id whose writes may not all be visible yet (see SyncRepository.horizon)."""
+        return SyncRepository(self.db).horizon()
+    
+    def latest_change(self, table: str, horizon: int) -> Optional[ChangeStamp]:
+        """Get the highest stamp written by a transaction below horizon, or None when there is none."""
+        model = EXPORT_MODELS[table]
+        latest = self.db.execute(
+            select(model.change_xid, model.change_seq)
+            .where(model.change_xid < horizon)
+            .order_by(model.change_xid.desc(), model.change_seq.desc())
+            .limit(1)
+        ).first()
+        return tuple(latest) if latest else None
+    
+    def stream_changes(
+        self,
+        table: str,
+        since: Optional[ChangeStamp],
+        until: ChangeStamp,
+        batch_size: int
+    ) -> Iterator[Sequence[Row]]:
+        """
+        Stream batches of rows stamped after since (from the start when None) and by until.
+        
+        Rows come in stamp order, so the range is one walk of the change stamp
+        index without a sort, and a file's row groups follow the watermark.
+        """
+        model = EXPORT_MODELS[table]
+        criteria = [change_stamp(model) <= tuple_(*until)]
+        if since is not None:
+            criteria.append(change_stamp(model) > tuple_(*since))
+        return BaseRepository(model, self.db).stream(
+            criteria,
+            self.export_columns(table),
+            batch_size,
+            order_by=(model.change_xid, model.change_seq)
+        )
@@ -0,0 +1,97 @@
+from datetime import datetime
+from typing import NamedTuple, Optional
+from sqlalchemy import delete, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from app.models.idempotency_key import IdempotencyKey
+
+DIALECT_INSERTS = {
+    "postgresql": postgresql.insert,
+    "sqlite": sqlite.insert,
+}
+
+
+class StoredResponse(NamedTuple):
+    fingerprint: bytes
+    # None while the first request with the key is still running
+    status_code: Optional[int]
+    body: Optional[bytes]
+
+
+class IdempotencyRepository:
+    """Repository for the idempotency_keys table."""
+    
+    def __init__(self, db: Session):
+        self.db = db
+    
+    def claim(self, key: bytes, fingerprint: bytes, now: datetime, expires_at: datetime) -> Optional[StoredResponse]:
+        """
+        Claim a key for a new request, or get what is stored for it.
+        
+        A single INSERT ... ON CONFLICT takes a new or expired key; the unique
+        key makes concurrent claims of the same key race safely. Returns None
+        when the key was claimed, otherwise the live entry.
+        """
+        insert = DIALECT_INSERTS[self.db.get_bind().dialect.name]
+        stmt = insert(IdempotencyKey).values(
+            key=key,
+            fingerprint=fingerprint,
+            status_code=None,
+            body=None,
+            expires_at=expires_at
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[IdempotencyKey.key],
+            set_={
+                "fingerprint": stmt.excluded.fingerprint,
+                "status_code": None,
+                "body": None,
+                "expires_at": stmt.excluded.expires_at,
+            },
+            where=IdempotencyKey.expires_at <= now
+        )
+        if self.db.execute(stmt).rowcount:
+            return None
+        row = self.db.execute(
+            select(IdempotencyKey.fingerprint, IdempotencyKey.status_code, IdempotencyKey.body)
+            .where(IdempotencyKey.key == key)
+        ).first()
+        # Deleted in between; treat it as taken so the client retries
+        return StoredResponse(*row) if row else StoredResponse(fingerprint, None, None)
+    
+    def complete(self, key: bytes, fingerprint: bytes, status_code: int, body: bytes, expires_at: datetime) -> None:
+        """Store the response of a claimed key."""
+        self.db.execute(
+            update(IdempotencyKey)
+            .where(IdempotencyKey.key == key, IdempotencyKey.fingerprint == fingerprint)
+            .values(status_code=status_code, body=body, expires_at=expires_at)
+        )
+    
+    def refresh(self, key: bytes, fingerprint: bytes, expires_at: datetime) -> None:
+        """Move the expiry of a claim that is still held."""
+        self.db.execute(
+            update(IdempotencyKey)
+            .where(
+                IdempotencyKey.key == key,
+                IdempotencyKey.fingerprint == fingerprint,
+                IdempotencyKey.status_code.is_(None)
+            )
+            .values(expires_at=expires_at)
+        )
+    
+    def release(self, key: bytes, fingerprint: bytes) -> None:
+        """Drop a claim whose request failed, so the key can be used again."""
+        self.db.execute(
+            delete(IdempotencyKey).where(
+                IdempotencyKey.key == key,
+                IdempotencyKey.fingerprint == fingerprint,
+                IdempotencyKey.status_code.is_(None)
+            )
+        )
+    
+    def purge_expired(self, now: datetime) -> int:
+        """Delete expired entries; returns how many were removed."""
+        return self.db.execute(
+            delete(IdempotencyKey).where(IdempotencyKey.expires_at <= now)
+        ).rowcount
@@ -1,8 +1,36 @@
-from typing import Optional, List
+from typing import Iterator, List, Optional, Sequence
+from sqlalchemy import update
+from sqlalchemy.engine import Row
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
+from app.core.pagination import Cursor, Page
 from app.models.incident import Incident
-from app.repositories.base_repository import BaseRepository
+from app.repositories.base_repository import (
+    AsyncBaseRepository,
+    BaseRepository,
+    counter_key,
+    equal_criteria,
+    id_criteria,
+    range_criteria,
+)
+from app.repositories.search_repository import location_criteria, text_match_criteria
+from app.schemas.incident import IncidentFilter
+
+
+def incident_criteria(filters: IncidentFilter, dialect_name: str) -> list:
+    """Compile an IncidentFilter into WHERE criteria for the given database."""
+    return [
+        *equal_criteria(Incident, {
+            "category": filters.category,
+            "investigation_status": filters.investigation_status,
+            "user_id": filters.user_id,
+        }),
+        *range_criteria(Incident.incident_datetime, filters.occurred_from, filters.occurred_to),
+        *range_criteria(Incident.created_at, filters.created_from, filters.created_to),
+        *location_criteria(Incident.location, filters.location, filters.location_fuzzy, dialect_name),
+        *text_match_criteria(Incident, "incident", filters.q, dialect_name, [Incident.title, Incident.description]),
+    ]
 
 
 class IncidentRepository(BaseRepository[Incident]):
@@ -11,48 +39,27 @@ class IncidentRepository(BaseRepository[Incident]):
     def __init__(self, db: Session):
         super().__init__(Incident, db)
     
-    def get_by_user(self, user_id: int, skip: int = 0, limit: int = 100) -> List[Incident]:
-        """Get all incidents by user."""
-        return self.db.query(Incident).filter(
-            Incident.user_id == user_id
-        ).order_by(Incident.created_at.desc()).offset(skip).limit(limit).all()
-    
-    def count_by_user(self, user_id: int) -> int:
-        """Count incidents by user."""
-        return self.db.query(Incident).filter(Incident.user_id == user_id).count()
-    
-    def get_by_category(self, category: str, skip: int = 0, limit: int = 100) -> List[Incident]:
-        """Get incidents by category."""
-        return self.db.query(Incident).filter(
-            Incident.category == category
-        ).order_by(Incident.created_at.desc()).offset(skip).limit(limit).all()
-    
-    def count_by_category(self, category: str) -> int:
-        """Count incidents by category."""
-        return self.db.query(Incident).filter(Incident.category == category).count()
-    
-    def get_by_investigation_status(self, status: str, skip: int = 0, limit: int = 100) -> List[Incident]:
-        """Get incidents by investigation status."""
-        return self.db.query(Incident).filter(
-            Incident.investigation_status == status
-        ).order_by(Incident.created_at.desc()).offset(skip).limit(limit).all()
-    
-    def count_by_investigation_status(self, status: str) -> int:
-        """Count incidents by investigation status."""
-        return self.db.query(Incident).filter(Incident.investigation_status == status).count()
+    def get_filtered(
+        self,
+        filters: IncidentFilter,
+        skip: int = 0,
+        limit: int = 100,
+        cursor: Optional[Cursor] = None,
+        columns: Optional[tuple] = None
+    ) -> Page:
+        """Get a newest-first page of incidents matching filters."""
+        return self.get_page(
+            incident_criteria(filters, self._dialect_name()),
+            skip,
+            limit,
+            cursor,
+            counter_key(Incident, filters),
+            columns
+        )
     
-    def get_by_location(self, location: str, skip: int = 0, limit: int = 100) -> List[Incident]:
-        """Get incidents by location."""
-        search_filter = f"%{location}%"
-        return self.db.query(Incident).filter(
-            Incident.location.ilike(search_filter)
-        ).order_by(Incident.created_at.desc()).offset(skip).limit(limit).all()
-    
-    def get_all_sorted(self, skip: int = 0, limit: int = 100) -> List[Incident]:
-        """Get all incidents sorted by newest first."""
-        return self.db.query(Incident).order_by(
-            Incident.created_at.desc()
-        ).offset(skip).limit(limit).all()
+    def stream_filtered(self, filters: IncidentFilter, columns: tuple) -> Iterator[Sequence[Row]]:
+        """Stream batches of rows of columns for every incident matching filters."""
+        return self.stream(incident_criteria(filters, self._dialect_name()), columns)
     
     def update_investigation_status(
         self, 
@@ -60,20 +67,65 @@ class IncidentRepository(BaseRepository[Incident]):
         status: str, 
         notes: Optional[str] = None
     ) -> Optional[Incident]:
-        """Update incident investigation status."""
-        incident = self.get(incident_id)
+        """Update incident investigation status in one UPDATE ... RETURNING."""
+        values = {"investigation_status": status}
+        if notes:
+            values["investigation_notes"] = notes
+        incident = self.db.execute(
+            update(Incident)
+            .where(Incident.id == incident_id)
+            .values(**values)
+            .returning(Incident)
+        ).scalar_one_or_none()
         if incident:
-            incident.investigation_status = status
-            if notes:
-                incident.investigation_notes = notes
-            self.db.commit()
-            self.db.refresh(incident)
+            self._persist()
         return incident
     
-    def search_incidents(self, query: str, skip: int = 0, limit: int = 100) -> List[Incident]:
-        """Search incidents by title or description."""
-        search_filter = f"%{query}%"
-        return self.db.query(Incident).filter(
-            (Incident.title.ilike(search_filter)) |
-            (Incident.description.ilike(search_filter))
-        ).order_by(Incident.created_at.desc()).offset(skip).limit(limit).all()
+    def update_investigation_statuses(
+        self,
+        incident_ids: List[int],
+        status: str,
+        notes: Optional[str] = None
+    ) -> List[Incident]:
+        """
+        Update the investigation status of incident_ids in one UPDATE ... RETURNING.
+        
+        Returns only the incidents it changed; missing incidents are left out.
+        """
+        values = {"investigation_status": status}
+        if notes:
+            values["investigation_notes"] = notes
+        incidents = self.db.execute(
+            update(Incident)
+            .where(id_criteria(Incident, incident_ids, self._dialect_name()))
+            .values(**values)
+            .returning(Incident)
+        ).scalars().all()
+        if incidents:
+            self._persist()
+        return incidents
+
+
+class AsyncIncidentRepository(AsyncBaseRepository[Incident]):
+    """Async repository for Incident read operations."""
+    
+    def __init__(self, db: AsyncSession):
+        super().__init__(Incident, db)
+    
+    async def get_filtered(
+        self,
+        filters: IncidentFilter,
+        skip: int = 0,
+        limit: int = 100,
+        cursor: Optional[Cursor] = None,
+        columns: Optional[tuple] = None
+    ) -> Page:
+        """Get a newest-first page of incidents matching filters."""
+        return await self.get_page(
+            incident_criteria(filters, self._dialect_name()),
+            skip,
+            limit,
+            cursor,
+            counter_key(Incident, filters),
+            columns
+        )
@@ -1,8 +1,35 @@
-from typing import Optional, List
+from typing import Iterator, List, Optional, Sequence
+from sqlalchemy import update
+from sqlalchemy.engine import Row
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
+from app.core.pagination import Cursor, Page
 from app.models.inspection import Inspection
-from app.repositories.base_repository import BaseRepository
+from app.repositories.base_repository import (
+    AsyncBaseRepository,
+    BaseRepository,
+    counter_key,
+    equal_criteria,
+    id_criteria,
+    range_criteria,
+)
+from app.repositories.search_repository import location_criteria, text_match_criteria
+from app.schemas.inspection import InspectionFilter
+
+
+def inspection_criteria(filters: InspectionFilter, dialect_name: str) -> list:
+    """Compile an InspectionFilter into WHERE criteria for the given database."""
+    return [
+        *equal_criteria(Inspection, {
+            "status": filters.status,
+            "category": filters.category,
+            "user_id": filters.user_id,
+        }),
+        *range_criteria(Inspection.created_at, filters.created_from, filters.created_to),
+        *location_criteria(Inspection.location, filters.location, filters.location_fuzzy, dialect_name),
+        *text_match_criteria(Inspection, "inspection", filters.q, dialect_name, [Inspection.location, Inspection.description]),
+    ]
 
 
 class InspectionRepository(BaseRepository[Inspection]):
@@ -11,50 +38,73 @@ class InspectionRepository(BaseRepository[Inspection]):
     def __init__(self, db: Session):
         super().__init__(Inspection, db)
     
-    def get_by_user(self, user_id: int, skip: int = 0, limit: int = 100) -> List[Inspection]:
-        """Get all inspections by user."""
-        return self.db.query(Inspection).filter(
-            Inspection.user_id == user_id
-        ).order_by(Inspection.created_at.desc()).offset(skip).limit(limit).all()
-    
-    def count_by_user(self, user_id: int) -> int:
-        """Count inspections by user."""
-        return self.db.query(Inspection).filter(Inspection.user_id == user_id).count()
-    
-    def get_by_status(self, status: str, skip: int = 0, limit: int = 100) -> List[Inspection]:
-        """Get inspections by status."""
-        return self.db.query(Inspection).filter(
-            Inspection.status == status
-        ).order_by(Inspection.created_at.desc()).offset(skip).limit(limit).all()
-    
-    def count_by_status(self, status: str) -> int:
-        """Count inspections by status."""
-        return self.db.query(Inspection).filter(Inspection.status == status).count()
-    
-    def get_by_category(self, category: str, skip: int = 0, limit: int = 100) -> List[Inspection]:
-        """Get inspections by category."""
-        return self.db.query(Inspection).filter(
-            Inspection.category == category
-        ).order_by(Inspection.created_at.desc()).offset(skip).limit(limit).all()
-    
-    def get_by_location(self, location: str, skip: int = 0, limit: int = 100) -> List[Inspection]:
-        """Get inspections by location."""
-        search_filter = f"%{location}%"
-        return self.db.query(Inspection).filter(
-            Inspection.location.ilike(search_filter)
-        ).order_by(Inspection.created_at.desc()).offset(skip).limit(limit).all()
+    def get_filtered(
+        self,
+        filters: InspectionFilter,
+        skip: int = 0,
+        limit: int = 100,
+        cursor: Optional[Cursor] = None,
+        columns: Optional[tuple] = None
+    ) -> Page:
+        """Get a newest-first page of inspections matching filters."""
+        return self.get_page(
+            inspection_criteria(filters, self._dialect_name()),
+            skip,
+            limit,
+            cursor,
+            counter_key(Inspection, filters),
+            columns
+        )
     
-    def get_all_sorted(self, skip: int = 0, limit: int = 100) -> List[Inspection]:
-        """Get all inspections sorted by newest first."""
-        return self.db.query(Inspection).order_by(
-            Inspection.created_at.desc()
-        ).offset(skip).limit(limit).all()
+    def stream_filtered(self, filters: InspectionFilter, columns: tuple) -> Iterator[Sequence[Row]]:
+        """Stream batches of rows of columns for every inspection matching filters."""
+        return self.stream(inspection_criteria(filters, self._dialect_name()), columns)
     
     def update_status(self, inspection_id: int, status: str) -> Optional[Inspection]:
-        """Update inspection status."""
-        inspection = self.get(inspection_id)
+        """Update inspection status in one UPDATE ... RETURNING."""
+        inspection = self.db.execute(
+            update(Inspection)
+            .where(Inspection.id == inspection_id)
+            .values(status=status)
+            .returning(Inspection)
+        ).scalar_one_or_none()
         if inspection:
-            inspection.status = status
-            self.db.commit()
-            self.db.refresh(inspection)
+            self._persist()
         return inspection
+    
+    def update_statuses(self, inspection_ids: List[int], status: str) -> List[Inspection]:
+        """Update the status of inspection_ids in one UPDATE ... RETURNING, skipping missing ids."""
+        inspections = self.db.execute(
+            update(Inspection)
+            .where(id_criteria(Inspection, inspection_ids, self._dialect_name()))
+            .values(status=status)
+            .returning(Inspection)
+        ).scalars().all()
+        if inspections:
+            self._persist()
+        return inspections
+
+
+class AsyncInspectionRepository(AsyncBaseRepository[Inspection]):
+    """Async repository for Inspection read operations."""
+    
+    def __init__(self, db: AsyncSession):
+        super().__init__(Inspection, db)
+    
+    async def get_filtered(
+        self,
+        filters: InspectionFilter,
+        skip: int = 0,
+        limit: int = 100,
+        cursor: Optional[Cursor] = None,
+        columns: Optional[tuple] = None
+    ) -> Page:
+        """Get a newest-first page of inspections matching filters."""
+        return await self.get_page(
+            inspection_criteria(filters, self._dialect_name()),
+            skip,
+            limit,
+            cursor,
+            counter_key(Inspection, filters),
+            columns
+        )
@@ -1,8 +1,36 @@
-from typing import Optional, List
+from typing import Iterator, List, Optional, Sequence
+from sqlalchemy import update
+from sqlalchemy.engine import Row
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
+from app.core.pagination import Cursor, Page
 from app.models.permit import Permit
-from app.repositories.base_repository import BaseRepository
+from app.repositories.base_repository import (
+    AsyncBaseRepository,
+    BaseRepository,
+    counter_key,
+    equal_criteria,
+    id_criteria,
+    range_criteria,
+)
+from app.repositories.search_repository import location_criteria, text_match_criteria
+from app.schemas.permit import PermitFilter
+
+
+def permit_criteria(filters: PermitFilter, dialect_name: str) -> list:
+    """Compile a PermitFilter into WHERE criteria for the given database."""
+    return [
+        *equal_criteria(Permit, {
+            "permit_type": filters.permit_type,
+            "approval_status": filters.approval_status,
+            "user_id": filters.user_id,
+        }),
+        *range_criteria(Permit.start_date, filters.start_from, filters.start_to),
+        *range_criteria(Permit.created_at, filters.created_from, filters.created_to),
+        *location_criteria(Permit.location, filters.location, filters.location_fuzzy, dialect_name),
+        *text_match_criteria(Permit, "permit", filters.q, dialect_name, [Permit.location, Permit.description]),
+    ]
 
 
 class PermitRepository(BaseRepository[Permit]):
@@ -11,51 +39,27 @@ class PermitRepository(BaseRepository[Permit]):
     def __init__(self, db: Session):
         super().__init__(Permit, db)
     
-    def get_by_user(self, user_id: int, skip: int = 0, limit: int = 100) -> List[Permit]:
-        """Get all permits by user."""
-        return self.db.query(Permit).filter(
-            Permit.user_id == user_id
-        ).order_by(Permit.created_at.desc()).offset(skip).limit(limit).all()
-    
-    def count_by_user(self, user_id: int) -> int:
-        """Count permits by user."""
-        return self.db.query(Permit).filter(Permit.user_id == user_id).count()
-    
-    def get_by_type(self, permit_type: str, skip: int = 0, limit: int = 100) -> List[Permit]:
-        """Get permits by type."""
-        return self.db.query(Permit).filter(
-            Permit.permit_type == permit_type
-        ).order_by(Permit.created_at.desc()).offset(skip).limit(limit).all()
-    
-    def count_by_type(self, permit_type: str) -> int:
-        """Count permits by type."""
-        return self.db.query(Permit).filter(Permit.permit_type == permit_type).count()
-    
-    def get_by_approval_status(self, status: str, skip: int = 0, limit: int = 100) -> List[Permit]:
-        """Get permits by approval status."""
-        return self.db.query(Permit).filter(
-            Permit.approval_status == status
-        ).order_by(Permit.created_at.desc()).offset(skip).limit(limit).all()
+    def get_filtered(
+        self,
+        filters: PermitFilter,
+        skip: int = 0,
+        limit: int = 100,
+        cursor: Optional[Cursor] = None,
+        columns: Optional[tuple] = None
+    ) -> Page:
+        """Get a newest-first page of permits matching filters."""
+        return self.get_page(
+            permit_criteria(filters, self._dialect_name()),
+            skip,
+            limit,
+            cursor,
+            counter_key(Permit, filters),
+            columns
+        )
     
-    def count_by_approval_status(self, status: str) -> int:
-        """Count permits by approval status."""
-        return self.db.query(Permit).filter(Permit.approval_status == status).count()
-    
-    def get_pending_permits(self, skip: int = 0, limit: int = 100) -> List[Permit]:
-        """Get all pending permits."""
-        return self.db.query(Permit).filter(
-            Permit.approval_status == "pending"
-        ).order_by(Permit.created_at.desc()).offset(skip).limit(limit).all()
-    
-    def count_pending_permits(self) -> int:
-        """Count pending permits."""
-        return self.db.query(Permit).filter(Permit.approval_status == "pending").count()
-    
-    def get_all_sorted(self, skip: int = 0, limit: int = 100) -> List[Permit]:
-        """Get all permits sorted by newest first."""
-        return self.db.query(Permit).order_by(
-            Permit.created_at.desc()
-        ).offset(skip).limit(limit).all()
+    def stream_filtered(self, filters: PermitFilter, columns: tuple) -> Iterator[Sequence[Row]]:
+        """Stream batches of rows of columns for every permit matching filters."""
+        return self.stream(permit_criteria(filters, self._dialect_name()), columns)
     
     def approve_permit(
         self, 
@@ -63,16 +67,8 @@ class PermitRepository(BaseRepository[Permit]):
         approved_by: int, 
         notes: Optional[str] = None
     ) -> Optional[Permit]:
-        """Approve permit."""
-        permit = self.get(permit_id)
-        if permit:
-            permit.approval_status = "approved"
-            permit.approved_by = approved_by
-            if notes:
-                permit.approval_notes = notes
-            self.db.commit()
-            self.db.refresh(permit)
-        return permit
+        """Approve permit if it is still pending."""
+        return self._review_permit(permit_id, "approved", approved_by, notes)
     
     def reject_permit(
         self, 
@@ -80,13 +76,87 @@ class PermitRepository(BaseRepository[Permit]):
         rejected_by: int, 
         notes: Optional[str] = None
     ) -> Optional[Permit]:
-        """Reject permit."""
-        permit = self.get(permit_id)
+        """Reject permit if it is still pending."""
+        return self._review_permit(permit_id, "rejected", rejected_by, notes)
+    
+    def review_permits(
+        self,
+        permit_ids: List[int],
+        status: str,
+        reviewer_id: int,
+        notes: Optional[str] = None
+    ) -> List[Permit]:
+        """
+        Move the pending permits among permit_ids to approved/rejected in one
+        conditional UPDATE ... RETURNING.
+        
+        Returns only the permits it changed; missing and already processed
+        permits are left out.
+        """
+        permits = self.db.execute(
+            update(Permit)
+            .where(
+                id_criteria(Permit, permit_ids, self._dialect_name()),
+                Permit.approval_status == "pending"
+            )
+            .values(**self._review_values(status, reviewer_id, notes))
+            .returning(Permit)
+        ).scalars().all()
+        if permits:
+            self._persist()
+        return permits
+    
+    def _review_permit(
+        self,
+        permit_id: int,
+        status: str,
+        reviewer_id: int,
+        notes: Optional[str]
+    ) -> Optional[Permit]:
+        """
+        Move a pending permit to approved/rejected in one conditional UPDATE.
+        
+        Returns None if the permit does not exist or was already processed, so
+        two reviewers can never both process the same permit.
+        """
+        permit = self.db.execute(
+            update(Permit)
+            .where(Permit.id == permit_id, Permit.approval_status == "pending")
+            .values(**self._review_values(status, reviewer_id, notes))
+            .returning(Permit)
+        ).scalar_one_or_none()
         if permit:
-            permit.approval_status = "rejected"
-            permit.approved_by = rejected_by
-            if notes:
-                permit.approval_notes = notes
-            self.db.commit()
-            self.db.refresh(permit)
+            self._persist()
         return permit
+    
+    def _review_values(self, status: str, reviewer_id: int, notes: Optional[str]) -> dict:
+        """Columns set by an approve/reject."""
+        values = {"approval_status": status, "approved_by": reviewer_id}
+        if notes:
+            values["approval_notes"] = notes
+        return values
+
+
+class AsyncPermitRepository(AsyncBaseRepository[Permit]):
+    """Async repository for Permit read operations."""
+    
+    def __init__(self, db: AsyncSession):
+        super().__init__(Permit, db)
+    
+    async def get_filtered(
+        self,
+        filters: PermitFilter,
+        skip: int = 0,
+        limit: int = 100,
+        cursor: Optional[Cursor] = None,
+        columns: Optional[tuple] = None
+    ) -> Page:
+        """Get a newest-first page of permits matching filters."""
+        return await self.get_page(
+            permit_criteria(filters, self._dialect_name()),
+            skip,
+            limit,
+            cursor,
+            counter_key(Permit, filters),
+            columns
+        )
@@ -0,0 +1,111 @@
+from typing import List, Sequence
+
+from sqlalchemy import bindparam, column, func, literal_column, text
+from sqlalchemy.engine import Row
+from sqlalchemy.orm import Session
+
+from app.models.search_index import SEARCH_DOCUMENTS, TRIGRAM_COLUMNS, TS_CONFIG
+from app.repositories.base_repository import contains_criteria, similar_criteria
+
+
+def fts5_query(query: str) -> str:
+    """Quote each term so user input cannot use FTS5 query syntax."""
+    terms = ['"' + term.replace('"', '""') + '"' for term in query.split()]
+    return " ".join(terms)
+
+
+def text_match_criteria(model, kind: str, query: str, dialect_name: str, columns: list) -> list:
+    """
+    Match query against an entity's full-text document.
+    
+    Uses the GIN-indexed search_vector on PostgreSQL and the FTS5 table on
+    SQLite; other databases fall back to ILIKE over columns.
+    """
+    if not query:
+        return []
+    if dialect_name == "postgresql":
+        tsquery = func.websearch_to_tsquery(literal_column(f"'{TS_CONFIG}'"), query)
+        return [literal_column(f"{model.__tablename__}.search_vector").op("@@")(tsquery)]
+    if dialect_name == "sqlite":
+        terms = fts5_query(query)
+        if not terms:
+            return []
+        matches = text(
+            f"SELECT ref_id FROM search_index WHERE search_index MATCH :terms AND kind = '{kind}'"
+        ).bindparams(bindparam("terms", terms, unique=True)).columns(column("ref_id"))
+        return [model.id.in_(matches)]
+    return contains_criteria(columns, query)
+
+
+def location_criteria(column, location: str, fuzzy: bool, dialect_name: str) -> list:
+    """Match a location by substring, also allowing typos when fuzzy on PostgreSQL."""
+    if fuzzy and dialect_name == "postgresql":
+        return similar_criteria([column], location)
+    return contains_criteria([column], location)
+
+
+class SearchRepository:
+    """Ranked full-text search across incidents, inspections and permits."""
+    
+    def __init__(self, db: Session):
+        self.db = db
+    
+    def search(self, query: str, kinds: Sequence[str], limit: int = 20) -> List[Row]:
+        """Get (type, id, title, rank) rows, best match first."""
+        if self.db.get_bind().dialect.name == "sqlite":
+            return self._search_fts5(query, kinds, limit)
+        return self._search_tsvector(query, kinds, limit)
+    
+    def _search_tsvector(self, query: str, kinds: Sequence[str], limit: int) -> List[Row]:
+        """One GIN-indexed tsvector match per table, merged by ts_rank."""
+        selects = [
+            f"SELECT '{document.kind}' AS type, id, {document.title.format(row='')} AS title, "
+            f"ts_rank(search_vector, websearch_to_tsquery('{TS_CONFIG}', :query)) AS rank "
+            f"FROM {document.table} "
+            f"WHERE search_vector @@ websearch_to_tsquery('{TS_CONFIG}', :query)"
+            for document in SEARCH_DOCUMENTS
+            if document.kind in kinds
+        ]
+        statement = text(
+            " UNION ALL ".join(selects) + " ORDER BY rank DESC, id DESC LIMIT :limit"
+        )
+        return self.db.execute(statement, {"query": query, "limit": limit}).all()
+    
+    def _search_fts5(self, query: str, kinds: Sequence[str], limit: int) -> List[Row]:
+        """SQLite fallback over the trigger-maintained FTS5 table."""
+        terms = fts5_query(query)
+        if not terms:
+            return []
+        # bm25() is lower for better matches; negate it to rank like ts_rank
+        statement = text(
+            "SELECT kind AS type, ref_id AS id, title, -bm25(search_index, 2.0, 1.0) AS rank "
+            "FROM search_index WHERE search_index MATCH :query AND kind IN :kinds "
+            "ORDER BY rank DESC, id DESC LIMIT :limit"
+        ).bindparams(bindparam("kinds", expanding=True))
+        return self.db.execute(
+            statement,
+            {"query": terms, "kinds": list(kinds), "limit": limit}
+        ).all()
+    
+    def search_locations(self, query: str, limit: int = 20) -> List[Row]:
+        """Get distinct (location, rank) rows across all entities, closest first."""
+        tables = [table for table, columns in TRIGRAM_COLUMNS.items() if "location" in columns]
+        params = {"query": query, "pattern": f"%{query}%", "limit": limit}
+        if self.db.get_bind().dialect.name == "postgresql":
+            # Each branch is served by that table's trigram index
+            selects = [
+                f"SELECT location FROM {table} "
+                "WHERE location ILIKE :pattern OR location % :query"
+                for table in tables
+            ]
+            rank = "similarity(location, :query)"
+        else:
+            selects = [f"SELECT location FROM {table} WHERE location LIKE :pattern" for table in tables]
+            # No trigrams; rank substring matches by how much of the location they cover
+            rank = "CAST(length(:query) AS REAL) / length(location)"
+        statement = text(
+            f"SELECT location, {rank} AS rank FROM ("
+            + " UNION ".join(selects)
+            + ") AS locations ORDER BY rank DESC, location LIMIT :limit"
+        )
+        return self.db.execute(statement, params).all()
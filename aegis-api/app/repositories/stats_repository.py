@@ -0,0 +1,51 @@
+from datetime import datetime
+from typing import Dict, Optional
+from sqlalchemy import func, literal, literal_column, select, union_all
+from sqlalchemy.orm import Session
+
+from app.repositories.base_repository import range_criteria
+
+
+def month_bucket(column, dialect_name: str):
+    """Truncate a timestamp column to a 'YYYY-MM' string."""
+    # Literal formats keep GROUP BY and the select list textually identical
+    if dialect_name == "postgresql":
+        return func.to_char(column, literal_column("'YYYY-MM'"))
+    return func.strftime(literal_column("'%Y-%m'"), column)
+
+
+class StatsRepository:
+    """Aggregate counts for the dashboard."""
+    
+    def __init__(self, db: Session):
+        self.db = db
+    
+    def grouped_counts(
+        self,
+        model,
+        dimensions: Dict[str, str],
+        date_from: Optional[datetime] = None,
+        date_to: Optional[datetime] = None
+    ) -> Dict[str, Dict[str, int]]:
+        """
+        Count rows created in [date_from, date_to] per value of each dimension.
+        
+        dimensions maps a result name to a column name; a "month" bucket over
+        created_at is always added. Every GROUP BY runs in one UNION ALL query.
+        """
+        criteria = range_criteria(model.created_at, date_from, date_to)
+        columns = {name: getattr(model, column) for name, column in dimensions.items()}
+        columns["month"] = month_bucket(model.created_at, self.db.get_bind().dialect.name)
+        statement = union_all(*(
+            select(
+                literal(name).label("dimension"),
+                column.label("value"),
+                func.count().label("count")
+            ).where(*criteria).group_by(column)
+            for name, column in columns.items()
+        ))
+        counts = {name: {} for name in columns}
+        for dimension, value, count in self.db.execute(statement):
+            if value is not None:
+                counts[dimension][value] = count
+        return counts
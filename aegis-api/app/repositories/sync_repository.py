@@ -0,0 +1,86 @@
+from typing import List, Sequence, Tuple
+
+from sqlalchemy import literal, select, text, tuple_, union_all
+from sqlalchemy.engine import Row
+from sqlalchemy.orm import Session
+
+from app.models.incident import Incident
+from app.models.inspection import Inspection
+from app.models.permit import Permit
+from app.models.sync_change import SyncTombstone
+
+# (change_xid, change_seq) of a change; changes are ordered by it
+ChangeStamp = Tuple[int, int]
+
+SYNCED_MODELS = {
+    model.__tablename__: model for model in (Inspection, Incident, Permit)
+}
+
+
+class SyncRepository:
+    """Reads of the per-user change feed behind /sync."""
+    
+    def __init__(self, db: Session):
+        self.db = db
+    
+    def horizon(self) -> int:
+        """
+        Get the first transaction id whose changes may not all be visible yet.
+        
+        Every transaction below the snapshot's xmin has finished, so no change
+        stamped below it can still appear.
+        """
+        if self.db.get_bind().dialect.name == "postgresql":
+            return self.db.scalar(text("SELECT pg_snapshot_xmin(pg_current_snapshot())::text::bigint"))
+        # SQLite stamps every change with xid 0
+        return 1
+    
+    def changes_after(self, user_id: int, after: ChangeStamp, horizon: int, limit: int) -> List[Row]:
+        """
+        Get a user's first (entity, id, change_xid, change_seq, deleted) changes after a stamp.
+        
+        Each table contributes at most limit rows, read in stamp order from its
+        (user_id, change_xid, change_seq) index, so the cost follows the
+        number of changes rather than the number of records.
+        """
+        sources = [
+            (literal(table), model.id, model.user_id, model.change_xid, model.change_seq, False)
+            for table, model in SYNCED_MODELS.items()
+        ]
+        sources.append((
+            SyncTombstone.entity,
+            SyncTombstone.entity_id,
+            SyncTombstone.user_id,
+            SyncTombstone.change_xid,
+            SyncTombstone.change_seq,
+            True
+        ))
+        selects = [
+            select(
+                select(
+                    entity.label("entity"),
+                    id.label("id"),
+                    change_xid.label("change_xid"),
+                    change_seq.label("change_seq"),
+                    literal(deleted).label("deleted")
+                )
+                .where(
+                    owner == user_id,
+                    tuple_(change_xid, change_seq) > tuple_(*after),
+                    change_xid < horizon
+                )
+                .order_by(change_xid, change_seq)
+                .limit(limit)
+                .subquery()
+            )
+            for entity, id, owner, change_xid, change_seq, deleted in sources
+        ]
+        changes = union_all(*selects).subquery()
+        return self.db.execute(
+            select(changes).order_by(changes.c.change_xid, changes.c.change_seq).limit(limit)
+        ).all()
+    
+    def get_many(self, table: str, ids: Sequence[int]) -> list:
+        """Load the records of a synced table with the given ids."""
+        model = SYNCED_MODELS[table]
+        return list(self.db.scalars(select(model).where(model.id.in_(ids))))
@@ -1,8 +1,18 @@
 from typing import Optional, List
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
+from app.core.pagination import Cursor
 from app.models.user import User
-from app.repositories.base_repository import BaseRepository
+from app.repositories.base_repository import (
+    AsyncBaseRepository,
+    BaseRepository,
+    counter_totals_enabled,
+    contains_criteria,
+    similar_criteria,
+    similarity_rank,
+)
 
 
 class UserRepository(BaseRepository[User]):
@@ -19,6 +29,10 @@ class UserRepository(BaseRepository[User]):
         """Get user by username."""
         return self.db.query(User).filter(User.username == username).first()
     
+    def get_all_sorted(self, skip: int = 0, limit: int = 100, cursor: Optional[Cursor] = None) -> List[User]:
+        """Get all users sorted by newest first."""
+        return self._page(self.db.query(User), skip, limit, cursor).all()
+    
     def get_active_users(self, skip: int = 0, limit: int = 100) -> List[User]:
         """Get all active users."""
         return self.db.query(User).filter(User.is_active == True).offset(skip).limit(limit).all()
@@ -27,17 +41,27 @@ class UserRepository(BaseRepository[User]):
         """Get users by role."""
         return self.db.query(User).filter(User.role == role).offset(skip).limit(limit).all()
     
-    def search_users(self, query: str, skip: int = 0, limit: int = 100) -> List[User]:
-        """Search users by name or email."""
-        search_filter = f"%{query}%"
-        return self.db.query(User).filter(
-            (User.full_name.ilike(search_filter)) |
-            (User.email.ilike(search_filter)) |
-            (User.username.ilike(search_filter))
-        ).offset(skip).limit(limit).all()
+    def search_users(self, query: str, skip: int = 0, limit: int = 100, fuzzy: bool = False) -> List[User]:
+        """
+        Search users by name or email.
+        
+        With fuzzy on PostgreSQL, near matches (typos) are included too and
+        results are ordered by trigram similarity, best first.
+        """
+        columns = [User.full_name, User.email, User.username]
+        users = self.db.query(User)
+        if fuzzy and self._dialect_name() == "postgresql":
+            users = users.filter(*similar_criteria(columns, query)).order_by(
+                similarity_rank(columns, query).desc(), User.id.desc()
+            )
+        else:
+            users = users.filter(*contains_criteria(columns, query))
+        return users.offset(skip).limit(limit).all()
     
     def count_by_role(self, role: str) -> int:
         """Count users by role."""
+        if counter_totals_enabled(self.db):
+            return self._counter("role", role)
         return self.db.query(User).filter(User.role == role).count()
     
     def deactivate_user(self, user_id: int) -> Optional[User]:
@@ -45,8 +69,9 @@ class UserRepository(BaseRepository[User]):
         user = self.get(user_id)
         if user:
             user.is_active = False
-            self.db.commit()
-            self.db.refresh(user)
+            # Revoke tokens issued before deactivation
+            user.token_version = User.token_version + 1
+            self._persist()
         return user
     
     def activate_user(self, user_id: int) -> Optional[User]:
@@ -54,6 +79,40 @@ class UserRepository(BaseRepository[User]):
         user = self.get(user_id)
         if user:
             user.is_active = True
-            self.db.commit()
-            self.db.refresh(user)
+            self._persist()
         return user
+
+
+class AsyncUserRepository(AsyncBaseRepository[User]):
+    """Async repository for User read operations."""
+    
+    def __init__(self, db: AsyncSession):
+        super().__init__(User, db)
+    
+    async def get_by_email(self, email: str) -> Optional[User]:
+        """Get user by email."""
+        return await self.db.scalar(select(User).where(User.email == email))
+    
+    async def get_by_username(self, username: str) -> Optional[User]:
+        """Get user by username."""
+        return await self.db.scalar(select(User).where(User.username == username))
+    
+    async def get_all_sorted(self, skip: int = 0, limit: int = 100, cursor: Optional[Cursor] = None) -> List[User]:
+        """Get all users sorted by newest first."""
+        return await self._all(self._page(select(User), skip, limit, cursor))
+    
+    async def get_active_users(self, skip: int = 0, limit: int = 100) -> List[User]:
+        """Get all active users."""
+        return await self._all(
+            select(User).where(User.is_active == True).offset(skip).limit(limit)
+        )
+    
+    async def get_users_by_role(self, role: str, skip: int = 0, limit: int = 100) -> List[User]:
+        """Get users by role."""
+        return await self._all(select(User).where(User.role == role).offset(skip).limit(limit))
+    
+    async def count_by_role(self, role: str) -> int:
+        """Count users by role."""
+        if counter_totals_enabled(self.db):
+            return await self._counter("role", role)
+        return await self._count(select(func.count()).select_from(User).where(User.role == role))
@@ -2,15 +2,16 @@ from fastapi import APIRouter, Depends, status
 from sqlalchemy.orm import Session
 
 from app.core.database import get_db
+from app.core.unit_of_work import UnitOfWorkRoute
 from app.schemas.auth import Token, LoginRequest, RegisterRequest, RefreshTokenRequest
 from app.schemas.user import UserResponse
 from app.services.auth_service import AuthService
 
-router = APIRouter(prefix="/auth", tags=["Authentication"])
+router = APIRouter(prefix="/auth", tags=["Authentication"], route_class=UnitOfWorkRoute)
 
 
 @router.post("/register", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
-def register(
+async def register(
     user_data: RegisterRequest,
     db: Session = Depends(get_db)
 ):
@@ -25,11 +26,11 @@ def register(
     - **department**: Department name (optional)
     """
     auth_service = AuthService(db)
-    return auth_service.register(user_data)
+    return await auth_service.register(user_data)
 
 
 @router.post("/login", response_model=Token)
-def login(
+async def login(
     login_data: LoginRequest,
     db: Session = Depends(get_db)
 ):
@@ -42,7 +43,7 @@ def login(
     Returns access_token and refresh_token.
     """
     auth_service = AuthService(db)
-    return auth_service.login(login_data)
+    return await auth_service.login(login_data)
 
 
 @router.post("/refresh", response_model=Token)
@@ -0,0 +1,56 @@
+import os
+import tempfile
+from typing import Optional
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import FileResponse
+from sqlalchemy.orm import Session
+from starlette.background import BackgroundTask
+
+from app.core.database import get_db
+from app.core.unit_of_work import UnitOfWorkRoute
+from app.core.security import require_principal_roles
+from app.models.user import User
+from app.schemas.export import ExportTable
+from app.services.export_service import ExportService
+
+router = APIRouter(prefix="/exports", tags=["Exports"], route_class=UnitOfWorkRoute)
+
+
+@router.get("/{table}.parquet", response_class=FileResponse)
+def export_table_parquet(
+    table: ExportTable,
+    changed_since: Optional[str] = Query(
+        None,
+        description="Only rows created or updated since the X-Export-Watermark of the previous export"
+    ),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_principal_roles(["admin"]))
+):
+    """
+    Download a table as Parquet (Admin only).
+    
+    - **table**: users / inspections / incidents / permits (users without password hashes)
+    - **changed_since**: Incremental export; omit for every row
+    
+    The X-Export-Watermark header is an opaque marker of the latest change
+    included; pass it as changed_since on the next run to fetch only rows
+    written since.
+    """
+    fd, path = tempfile.mkstemp(suffix=".parquet")
+    os.close(fd)
+    try:
+        export_service = ExportService(db)
+        result = export_service.export_table(table, path, changed_since)
+    except Exception:
+        os.remove(path)
+        raise
+    headers = {"X-Export-Rows": str(result.rows)}
+    if result.watermark is not None:
+        headers["X-Export-Watermark"] = result.watermark
+    return FileResponse(
+        path,
+        media_type="application/vnd.apache.parquet",
+        filename=f"{table.value}.parquet",
+        headers=headers,
+        background=BackgroundTask(os.remove, path)
+    )
@@ -1,23 +1,187 @@
-from typing import List, Optional
-from fastapi import APIRouter, Depends, Query, status
+from typing import Any, Callable, Dict, List, Optional, Type, Union
+from fastapi import APIRouter, Body, Depends, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.core.database import get_db
-from app.core.security import get_current_user, require_roles, SAFETY_OFFICER_AND_ABOVE, ALL_ROLES
+from app.core.bulk import bulk_fields, transition_fields
+from app.core.config import settings
+from app.core.database import get_async_db, get_db, run_db
+from app.core.export import ExportFormat, export_response
+from app.core.http_cache import (
+    cache_control,
+    entity_etag,
+    etag_matches,
+    not_modified,
+    page_etag,
+    revalidating,
+    set_cache_headers,
+)
+from app.core.idempotency import IdempotentRoute, idempotency_key
+from app.core.pagination import page_fields
+from app.core.responses import fast_list_response
+from app.core.security import (
+    get_current_user,
+    get_current_principal,
+    get_current_principal_async,
+    require_roles,
+    SAFETY_OFFICER_AND_ABOVE,
+    ALL_ROLES
+)
+from app.models.incident import FINAL_INVESTIGATION_STATUSES
 from app.models.user import User
+from app.schemas.bulk import BulkCreateResponse, BulkTransitionResponse
 from app.schemas.incident import (
     IncidentCreate, 
     IncidentUpdate, 
     IncidentResponse, 
     IncidentListResponse,
-    InvestigationStatusUpdate
+    IncidentFilter,
+    InvestigationStatusUpdate,
+    BulkInvestigationStatusUpdate
 )
-from app.services.incident_service import IncidentService
+from app.services.incident_service import AsyncIncidentService, IncidentService
+
+router = APIRouter(prefix="/incidents", tags=["Incidents"], route_class=IdempotentRoute)
 
-router = APIRouter(prefix="/incidents", tags=["Incidents"])
+
+async def _incident_page(
+    request: Request,
+    response: Response,
+    incident_service: Union[IncidentService, AsyncIncidentService],
+    filters: IncidentFilter,
+    skip: int,
+    limit: int,
+    cursor: Optional[str]
+):
+    """List incidents, answering 304 when the client's copy of the page is current."""
+    if revalidating(request):
+        versions = await run_db(incident_service.list_incident_versions, filters, skip, limit, cursor)
+        etag = page_etag(request, versions)
+        if etag_matches(request, etag):
+            return not_modified(etag)
+    if settings.FAST_LIST_RESPONSES:
+        page = await run_db(incident_service.list_incident_rows, filters, skip, limit, cursor)
+        fast_response = fast_list_response(page, limit, IncidentResponse)
+        set_cache_headers(fast_response, page_etag(request, page))
+        return fast_response
+    page = await run_db(incident_service.list_incidents, filters, skip, limit, cursor)
+    set_cache_headers(response, page_etag(request, page))
+    return IncidentListResponse(**page_fields(page, limit))
 
 
-@router.post("", response_model=IncidentResponse, status_code=status.HTTP_201_CREATED)
+async def _incident_detail(
+    request: Request,
+    response: Response,
+    incident_service: Union[IncidentService, AsyncIncidentService],
+    incident_id: int
+):
+    """Get an incident, answering 304 before loading it when the client's copy is current."""
+    if revalidating(request):
+        version = await run_db(incident_service.get_incident_version, incident_id)
+        etag = entity_etag(version)
+        if etag_matches(request, etag):
+            final = version.investigation_status in FINAL_INVESTIGATION_STATUSES
+            return not_modified(etag, cache_control(final))
+    incident = await run_db(incident_service.get_incident, incident_id)
+    final = incident.investigation_status in FINAL_INVESTIGATION_STATUSES
+    set_cache_headers(response, entity_etag(incident), cache_control(final))
+    return incident
+
+
+def _add_read_routes(
+    router: APIRouter,
+    get_session: Callable,
+    service_class: Type[Union[IncidentService, AsyncIncidentService]],
+    current: Callable
+) -> None:
+    """
+    Register the list, search and detail routes on a router.
+    
+    Used for the sync stack (get_db, IncidentService) and the async one
+    (get_async_db, AsyncIncidentService), with the matching auth dependency.
+    """
+    
+    @router.get("", response_model=IncidentListResponse)
+    async def get_all_incidents(
+        request: Request,
+        response: Response,
+        skip: int = Query(0, ge=0),
+        limit: int = Query(100, ge=1, le=100),
+        cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+        filters: IncidentFilter = Depends(),
+        db: Union[Session, AsyncSession] = Depends(get_session),
+        current_user: User = Depends(current)
+    ):
+        """
+        Get all incidents with optional filters.
+        
+        - **skip**: Number of records to skip (pagination)
+        - **limit**: Maximum number of records to return
+        - **cursor**: Continue after the previous page (faster than skip)
+        - **Filters** (optional, combined): category, investigation_status, user_id, location (+location_fuzzy), occurred_from/occurred_to, created_from/created_to, q
+        """
+        incident_service = service_class(db)
+        return await _incident_page(request, response, incident_service, filters, skip, limit, cursor)
+    
+    @router.get("/my", response_model=IncidentListResponse)
+    async def get_my_incidents(
+        request: Request,
+        response: Response,
+        skip: int = Query(0, ge=0),
+        limit: int = Query(100, ge=1, le=100),
+        cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+        filters: IncidentFilter = Depends(),
+        db: Union[Session, AsyncSession] = Depends(get_session),
+        current_user: User = Depends(current)
+    ):
+        """
+        Get current user's incident reports.
+        """
+        filters = filters.model_copy(update={"user_id": current_user.id})
+        incident_service = service_class(db)
+        return await _incident_page(request, response, incident_service, filters, skip, limit, cursor)
+    
+    @router.get("/search", response_model=IncidentListResponse)
+    async def search_incidents(
+        request: Request,
+        response: Response,
+        q: str = Query(..., min_length=1),
+        skip: int = Query(0, ge=0),
+        limit: int = Query(100, ge=1, le=100),
+        cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+        filters: IncidentFilter = Depends(),
+        db: Union[Session, AsyncSession] = Depends(get_session),
+        current_user: User = Depends(current)
+    ):
+        """
+        Search incidents by title or description, with the same filters as the list.
+        """
+        filters = filters.model_copy(update={"q": q})
+        incident_service = service_class(db)
+        return await _incident_page(request, response, incident_service, filters, skip, limit, cursor)
+    
+    @router.get("/{incident_id:int}", response_model=IncidentResponse)
+    async def get_incident(
+        request: Request,
+        response: Response,
+        incident_id: int,
+        db: Union[Session, AsyncSession] = Depends(get_session),
+        current_user: User = Depends(current)
+    ):
+        """
+        Get incident by ID.
+        """
+        incident_service = service_class(db)
+        return await _incident_detail(request, response, incident_service, incident_id)
+
+
+@router.post(
+    "",
+    response_model=IncidentResponse,
+    status_code=status.HTTP_201_CREATED,
+    dependencies=[Depends(idempotency_key)]
+)
 def create_incident(
     incident_data: IncidentCreate,
     db: Session = Depends(get_db),
@@ -28,6 +192,9 @@ def create_incident(
     
     Any authenticated user can report an incident.
     
+    Send an Idempotency-Key header to make retries safe: a repeat returns the
+    first response instead of creating a duplicate.
+    
     - **title**: Incident title (required)
     - **description**: Description (optional)
     - **location**: Location (required)
@@ -39,79 +206,84 @@ def create_incident(
     return incident_service.create_incident(incident_data, current_user.id)
 
 
-@router.get("", response_model=IncidentListResponse)
-def get_all_incidents(
-    skip: int = Query(0, ge=0),
-    limit: int = Query(100, ge=1, le=100),
-    category: Optional[str] = Query(None, description="Filter by category: minor / major / near_miss"),
-    investigation_status: Optional[str] = Query(None, description="Filter by investigation status"),
+@router.post(
+    "/bulk",
+    response_model=BulkCreateResponse[IncidentResponse],
+    status_code=status.HTTP_201_CREATED,
+    responses={status.HTTP_207_MULTI_STATUS: {"description": "Some items were rejected"}},
+    dependencies=[Depends(idempotency_key)]
+)
+def create_incidents_bulk(
+    response: Response,
+    items: List[Dict[str, Any]] = Body(..., min_length=1, max_length=settings.BULK_CREATE_MAX_ITEMS),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
     """
-    Get all incidents with optional filters.
+    Create many incidents at once, e.g. when an offline device reconnects.
+    
+    Each item is validated like a single create; valid items are inserted with
+    one multi-row INSERT in a single transaction. Rejected items are listed in
+    errors by position, with the detail a single create would return.
+    Answers 201 when every item was created, otherwise 207.
     
-    - **skip**: Number of records to skip (pagination)
-    - **limit**: Maximum number of records to return
-    - **category**: Filter by category (optional)
-    - **investigation_status**: Filter by investigation status (optional)
+    Honours Idempotency-Key like the single create.
     """
     incident_service = IncidentService(db)
-    
-    if category:
-        items = incident_service.get_incidents_by_category(category, skip, limit)
-    elif investigation_status:
-        items = incident_service.get_incidents_by_status(investigation_status, skip, limit)
-    else:
-        items = incident_service.get_all_incidents(skip, limit)
-    
-    total = incident_service.get_incidents_count()
-    return IncidentListResponse(total=total, items=items)
+    result = incident_service.create_incidents(items, current_user.id)
+    if result.errors:
+        response.status_code = status.HTTP_207_MULTI_STATUS
+    return BulkCreateResponse[IncidentResponse](**bulk_fields(result))
 
 
-@router.get("/my", response_model=IncidentListResponse)
-def get_my_incidents(
-    skip: int = Query(0, ge=0),
-    limit: int = Query(100, ge=1, le=100),
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
-):
-    """
-    Get current user's incident reports.
-    """
-    incident_service = IncidentService(db)
-    items = incident_service.get_incidents_by_user(current_user.id, skip, limit)
-    total = incident_service.count_incidents_by_user(current_user.id)
-    return IncidentListResponse(total=total, items=items)
+_add_read_routes(router, get_db, IncidentService, get_current_principal)
 
 
-@router.get("/search", response_model=IncidentListResponse)
-def search_incidents(
-    q: str = Query(..., min_length=1),
-    skip: int = Query(0, ge=0),
-    limit: int = Query(100, ge=1, le=100),
+@router.get("/export", response_class=StreamingResponse)
+def export_incidents(
+    export_format: ExportFormat = Query(ExportFormat.csv, alias="format"),
+    filters: IncidentFilter = Depends(),
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(get_current_principal)
 ):
     """
-    Search incidents by title or description.
+    Export every matching incident as a CSV or NDJSON download.
+    
+    Rows are streamed as they are read from the database, so there is no limit.
+    
+    - **format**: csv / ndjson (default: csv)
+    - **Filters** (optional, combined): category, investigation_status, user_id, location (+location_fuzzy), occurred_from/occurred_to, created_from/created_to, q
     """
     incident_service = IncidentService(db)
-    items = incident_service.search_incidents(q, skip, limit)
-    return IncidentListResponse(total=len(items), items=items)
+    return export_response(incident_service.export_incidents(filters), IncidentResponse, export_format, "incidents")
 
 
-@router.get("/{incident_id}", response_model=IncidentResponse)
-def get_incident(
-    incident_id: int,
+@router.patch(
+    "/bulk/investigation",
+    response_model=BulkTransitionResponse[IncidentResponse],
+    responses={status.HTTP_207_MULTI_STATUS: {"description": "Some ids were not updated"}}
+)
+def update_investigation_statuses_bulk(
+    response: Response,
+    status_data: BulkInvestigationStatusUpdate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(require_roles(SAFETY_OFFICER_AND_ABOVE))
 ):
     """
-    Get incident by ID.
+    Update the investigation status of many incidents at once (Safety Officer and Admin only).
+    
+    All incidents among the ids are updated by one UPDATE. Missing ids (404)
+    are listed in errors; the answer is 207 when there are any.
+    
+    - **ids**: Incident ids (up to BULK_TRANSITION_MAX_IDS)
+    - **investigation_status**: pending / in_progress / completed / closed
+    - **investigation_notes**: Investigation notes (optional)
     """
     incident_service = IncidentService(db)
-    return incident_service.get_incident(incident_id)
+    result = incident_service.update_investigation_statuses(status_data, current_user)
+    if result.errors:
+        response.status_code = status.HTTP_207_MULTI_STATUS
+    return BulkTransitionResponse[IncidentResponse](**transition_fields(result))
 
 
 @router.put("/{incident_id}", response_model=IncidentResponse)
@@ -161,3 +333,8 @@ def delete_incident(
     incident_service.delete_incident(incident_id, current_user)
     return None
 
+
+# Async variants of the read routes, registered ahead of `router` when
+# DATABASE_ASYNC is enabled
+async_router = APIRouter(prefix="/incidents", tags=["Incidents"])
+_add_read_routes(async_router, get_async_db, AsyncIncidentService, get_current_principal_async)
@@ -1,24 +1,185 @@
-from typing import List, Optional
-from fastapi import APIRouter, Depends, Query, status
+from typing import Any, Callable, Dict, List, Optional, Type, Union
+from fastapi import APIRouter, Body, Depends, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.core.database import get_db
-from app.core.security import get_current_user, require_roles, SUPERVISOR_AND_ABOVE, ALL_ROLES
+from app.core.bulk import bulk_fields, transition_fields
+from app.core.config import settings
+from app.core.database import get_async_db, get_db, run_db
+from app.core.export import ExportFormat, export_response
+from app.core.http_cache import (
+    cache_control,
+    entity_etag,
+    etag_matches,
+    not_modified,
+    page_etag,
+    revalidating,
+    set_cache_headers,
+)
+from app.core.idempotency import IdempotentRoute, idempotency_key
+from app.core.pagination import page_fields
+from app.core.responses import fast_list_response
+from app.core.security import (
+    get_current_user,
+    get_current_principal,
+    get_current_principal_async,
+    require_roles,
+    SUPERVISOR_AND_ABOVE,
+    ALL_ROLES
+)
 from app.models.user import User
+from app.schemas.bulk import BulkCreateResponse, BulkTransitionResponse
 from app.schemas.inspection import (
     InspectionCreate, 
     InspectionUpdate, 
     InspectionResponse, 
     InspectionListResponse,
-    InspectionStatusUpdate
+    InspectionFilter,
+    InspectionStatusUpdate,
+    BulkInspectionStatusUpdate
 )
-from app.services.inspection_service import InspectionService
+from app.services.inspection_service import AsyncInspectionService, InspectionService
+
+router = APIRouter(prefix="/inspections", tags=["Inspections"], route_class=IdempotentRoute)
+
+
+async def _inspection_page(
+    request: Request,
+    response: Response,
+    inspection_service: Union[InspectionService, AsyncInspectionService],
+    filters: InspectionFilter,
+    skip: int,
+    limit: int,
+    cursor: Optional[str]
+):
+    """List inspections, answering 304 when the client's copy of the page is current."""
+    if revalidating(request):
+        versions = await run_db(inspection_service.list_inspection_versions, filters, skip, limit, cursor)
+        etag = page_etag(request, versions)
+        if etag_matches(request, etag):
+            return not_modified(etag)
+    if settings.FAST_LIST_RESPONSES:
+        page = await run_db(inspection_service.list_inspection_rows, filters, skip, limit, cursor)
+        fast_response = fast_list_response(page, limit, InspectionResponse)
+        set_cache_headers(fast_response, page_etag(request, page))
+        return fast_response
+    page = await run_db(inspection_service.list_inspections, filters, skip, limit, cursor)
+    set_cache_headers(response, page_etag(request, page))
+    return InspectionListResponse(**page_fields(page, limit))
+
+
+async def _inspection_detail(
+    request: Request,
+    response: Response,
+    inspection_service: Union[InspectionService, AsyncInspectionService],
+    inspection_id: int
+):
+    """Get an inspection, answering 304 before loading it when the client's copy is current."""
+    if revalidating(request):
+        version = await run_db(inspection_service.get_inspection_version, inspection_id)
+        etag = entity_etag(version)
+        if etag_matches(request, etag):
+            return not_modified(etag, cache_control())
+    inspection = await run_db(inspection_service.get_inspection, inspection_id)
+    set_cache_headers(response, entity_etag(inspection), cache_control())
+    return inspection
+
 
-router = APIRouter(prefix="/inspections", tags=["Inspections"])
+def _add_read_routes(
+    router: APIRouter,
+    get_session: Callable,
+    service_class: Type[Union[InspectionService, AsyncInspectionService]],
+    current: Callable
+) -> None:
+    """
+    Register the list, by-user and detail routes on a router.
+    
+    Used for the sync stack (get_db, InspectionService) and the async one
+    (get_async_db, AsyncInspectionService), with the matching auth dependency.
+    """
+    
+    @router.get("", response_model=InspectionListResponse)
+    async def get_all_inspections(
+        request: Request,
+        response: Response,
+        skip: int = Query(0, ge=0),
+        limit: int = Query(100, ge=1, le=100),
+        cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+        filters: InspectionFilter = Depends(),
+        db: Union[Session, AsyncSession] = Depends(get_session),
+        current_user: User = Depends(current)
+    ):
+        """
+        Get all inspections with optional filters.
+        
+        - **skip**: Number of records to skip (pagination)
+        - **limit**: Maximum number of records to return
+        - **cursor**: Continue after the previous page (faster than skip)
+        - **Filters** (optional, combined): status, category, user_id, location (+location_fuzzy), created_from/created_to, q
+        """
+        inspection_service = service_class(db)
+        return await _inspection_page(request, response, inspection_service, filters, skip, limit, cursor)
+    
+    @router.get("/my", response_model=InspectionListResponse)
+    async def get_my_inspections(
+        request: Request,
+        response: Response,
+        skip: int = Query(0, ge=0),
+        limit: int = Query(100, ge=1, le=100),
+        cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+        filters: InspectionFilter = Depends(),
+        db: Union[Session, AsyncSession] = Depends(get_session),
+        current_user: User = Depends(current)
+    ):
+        """
+        Get current user's inspections.
+        """
+        filters = filters.model_copy(update={"user_id": current_user.id})
+        inspection_service = service_class(db)
+        return await _inspection_page(request, response, inspection_service, filters, skip, limit, cursor)
+    
+    @router.get("/user/{user_id:int}", response_model=InspectionListResponse)
+    async def get_inspections_by_user(
+        request: Request,
+        response: Response,
+        user_id: int,
+        skip: int = Query(0, ge=0),
+        limit: int = Query(100, ge=1, le=100),
+        cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+        filters: InspectionFilter = Depends(),
+        db: Union[Session, AsyncSession] = Depends(get_session),
+        current_user: User = Depends(require_roles(SUPERVISOR_AND_ABOVE, current))
+    ):
+        """
+        Get inspections by user ID (Supervisor and above).
+        """
+        filters = filters.model_copy(update={"user_id": user_id})
+        inspection_service = service_class(db)
+        return await _inspection_page(request, response, inspection_service, filters, skip, limit, cursor)
+    
+    @router.get("/{inspection_id:int}", response_model=InspectionResponse)
+    async def get_inspection(
+        request: Request,
+        response: Response,
+        inspection_id: int,
+        db: Union[Session, AsyncSession] = Depends(get_session),
+        current_user: User = Depends(current)
+    ):
+        """
+        Get inspection by ID.
+        """
+        inspection_service = service_class(db)
+        return await _inspection_detail(request, response, inspection_service, inspection_id)
 
 
-@router.post("", response_model=InspectionResponse, status_code=status.HTTP_201_CREATED)
-def create_inspection(
+@router.post(
+    "",
+    response_model=InspectionResponse,
+    status_code=status.HTTP_201_CREATED,
+    dependencies=[Depends(idempotency_key)]
+)
+async def create_inspection(
     inspection_data: InspectionCreate,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
@@ -28,6 +189,9 @@ def create_inspection(
     
     Any authenticated user can create an inspection.
     
+    Send an Idempotency-Key header to make retries safe: a repeat returns the
+    first response instead of creating a duplicate.
+    
     - **location**: Location of inspection (required)
     - **category**: Category of inspection (required)
     - **description**: Description (optional)
@@ -35,83 +199,86 @@ def create_inspection(
     - **status**: safe / unsafe (default: safe)
     """
     inspection_service = InspectionService(db)
-    return inspection_service.create_inspection(inspection_data, current_user.id)
+    return await inspection_service.create_inspection(inspection_data, current_user.id)
 
 
-@router.get("", response_model=InspectionListResponse)
-def get_all_inspections(
-    skip: int = Query(0, ge=0),
-    limit: int = Query(100, ge=1, le=100),
-    status: Optional[str] = Query(None, description="Filter by status: safe / unsafe"),
-    category: Optional[str] = Query(None, description="Filter by category"),
+@router.post(
+    "/bulk",
+    response_model=BulkCreateResponse[InspectionResponse],
+    status_code=status.HTTP_201_CREATED,
+    responses={status.HTTP_207_MULTI_STATUS: {"description": "Some items were rejected"}},
+    dependencies=[Depends(idempotency_key)]
+)
+def create_inspections_bulk(
+    response: Response,
+    items: List[Dict[str, Any]] = Body(..., min_length=1, max_length=settings.BULK_CREATE_MAX_ITEMS),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
     """
-    Get all inspections with optional filters.
+    Create many inspections at once, e.g. when an offline device reconnects.
     
-    - **skip**: Number of records to skip (pagination)
-    - **limit**: Maximum number of records to return
-    - **status**: Filter by status (optional)
-    - **category**: Filter by category (optional)
+    Each item is validated like a single create; valid items are inserted with
+    one multi-row INSERT in a single transaction. Rejected items are listed in
+    errors by position, with the detail a single create would return.
+    Answers 201 when every item was created, otherwise 207.
+    
+    Honours Idempotency-Key like the single create.
     """
     inspection_service = InspectionService(db)
-    
-    if status:
-        items = inspection_service.get_inspections_by_status(status, skip, limit)
-    elif category:
-        items = inspection_service.get_inspections_by_category(category, skip, limit)
-    else:
-        items = inspection_service.get_all_inspections(skip, limit)
-    
-    total = inspection_service.get_inspections_count()
-    return InspectionListResponse(total=total, items=items)
+    result = inspection_service.create_inspections(items, current_user.id)
+    if result.errors:
+        response.status_code = status.HTTP_207_MULTI_STATUS
+    return BulkCreateResponse[InspectionResponse](**bulk_fields(result))
 
 
-@router.get("/my", response_model=InspectionListResponse)
-def get_my_inspections(
-    skip: int = Query(0, ge=0),
-    limit: int = Query(100, ge=1, le=100),
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
-):
-    """
-    Get current user's inspections.
-    """
-    inspection_service = InspectionService(db)
-    items = inspection_service.get_inspections_by_user(current_user.id, skip, limit)
-    total = inspection_service.count_inspections_by_user(current_user.id)
-    return InspectionListResponse(total=total, items=items)
+_add_read_routes(router, get_db, InspectionService, get_current_principal)
 
 
-@router.get("/user/{user_id}", response_model=InspectionListResponse)
-def get_inspections_by_user(
-    user_id: int,
-    skip: int = Query(0, ge=0),
-    limit: int = Query(100, ge=1, le=100),
+@router.get("/export", response_class=StreamingResponse)
+def export_inspections(
+    export_format: ExportFormat = Query(ExportFormat.csv, alias="format"),
+    filters: InspectionFilter = Depends(),
     db: Session = Depends(get_db),
-    current_user: User = Depends(require_roles(SUPERVISOR_AND_ABOVE))
+    current_user: User = Depends(get_current_principal)
 ):
     """
-    Get inspections by user ID (Supervisor and above).
+    Export every matching inspection as a CSV or NDJSON download.
+    
+    Rows are streamed as they are read from the database, so there is no limit.
+    
+    - **format**: csv / ndjson (default: csv)
+    - **Filters** (optional, combined): status, category, user_id, location (+location_fuzzy), created_from/created_to, q
     """
     inspection_service = InspectionService(db)
-    items = inspection_service.get_inspections_by_user(user_id, skip, limit)
-    total = inspection_service.count_inspections_by_user(user_id)
-    return InspectionListResponse(total=total, items=items)
+    return export_response(inspection_service.export_inspections(filters), InspectionResponse, export_format, "inspections")
 
 
-@router.get("/{inspection_id}", response_model=InspectionResponse)
-def get_inspection(
-    inspection_id: int,
+@router.patch(
+    "/bulk/status",
+    response_model=BulkTransitionResponse[InspectionResponse],
+    responses={status.HTTP_207_MULTI_STATUS: {"description": "Some ids were not updated"}}
+)
+def update_inspection_statuses_bulk(
+    response: Response,
+    status_data: BulkInspectionStatusUpdate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(require_roles(SUPERVISOR_AND_ABOVE))
 ):
     """
-    Get inspection by ID.
+    Update the status of many inspections at once (Supervisor and above).
+    
+    All the inspections are updated by one UPDATE. Missing ids (404) are
+    listed in errors; the answer is 207 when there are any.
+    
+    - **ids**: Inspection ids (up to BULK_TRANSITION_MAX_IDS)
+    - **status**: safe / unsafe
     """
     inspection_service = InspectionService(db)
-    return inspection_service.get_inspection(inspection_id)
+    result = inspection_service.update_inspection_statuses(status_data, current_user)
+    if result.errors:
+        response.status_code = status.HTTP_207_MULTI_STATUS
+    return BulkTransitionResponse[InspectionResponse](**transition_fields(result))
 
 
 @router.put("/{inspection_id}", response_model=InspectionResponse)
@@ -160,3 +327,8 @@ def delete_inspection(
     inspection_service.delete_inspection(inspection_id, current_user)
     return None
 
+
+# Async variants of the read routes, registered ahead of `router` when
+# DATABASE_ASYNC is enabled
+async_router = APIRouter(prefix="/inspections", tags=["Inspections"])
+_add_read_routes(async_router, get_async_db, AsyncInspectionService, get_current_principal_async)
@@ -1,23 +1,188 @@
-from typing import List, Optional
-from fastapi import APIRouter, Depends, Query, status
+from typing import Any, Callable, Dict, List, Optional, Type, Union
+from fastapi import APIRouter, Body, Depends, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.core.database import get_db
-from app.core.security import get_current_user, require_roles, SUPERVISOR_AND_ABOVE, ALL_ROLES
+from app.core.bulk import bulk_fields, transition_fields
+from app.core.config import settings
+from app.core.database import get_async_db, get_db, run_db
+from app.core.export import ExportFormat, export_response
+from app.core.http_cache import (
+    cache_control,
+    entity_etag,
+    etag_matches,
+    not_modified,
+    page_etag,
+    revalidating,
+    set_cache_headers,
+)
+from app.core.idempotency import IdempotentRoute, idempotency_key
+from app.core.pagination import page_fields
+from app.core.responses import fast_list_response
+from app.core.security import (
+    get_current_user,
+    get_current_principal,
+    get_current_principal_async,
+    require_roles,
+    SUPERVISOR_AND_ABOVE,
+    ALL_ROLES
+)
+from app.models.permit import FINAL_APPROVAL_STATUSES
 from app.models.user import User
+from app.schemas.bulk import BulkCreateResponse, BulkTransitionResponse
 from app.schemas.permit import (
     PermitCreate, 
     PermitUpdate, 
     PermitResponse, 
     PermitListResponse,
-    PermitApprovalRequest
+    PermitFilter,
+    PermitApprovalRequest,
+    BulkPermitApprovalRequest
 )
-from app.services.permit_service import PermitService
+from app.services.permit_service import AsyncPermitService, PermitService
+
+router = APIRouter(prefix="/permits", tags=["Permits (PTW)"], route_class=IdempotentRoute)
+
+
+async def _permit_page(
+    request: Request,
+    response: Response,
+    permit_service: Union[PermitService, AsyncPermitService],
+    filters: PermitFilter,
+    skip: int,
+    limit: int,
+    cursor: Optional[str]
+):
+    """List permits, answering 304 when the client's copy of the page is current."""
+    if revalidating(request):
+        versions = await run_db(permit_service.list_permit_versions, filters, skip, limit, cursor)
+        etag = page_etag(request, versions)
+        if etag_matches(request, etag):
+            return not_modified(etag)
+    if settings.FAST_LIST_RESPONSES:
+        page = await run_db(permit_service.list_permit_rows, filters, skip, limit, cursor)
+        fast_response = fast_list_response(page, limit, PermitResponse)
+        set_cache_headers(fast_response, page_etag(request, page))
+        return fast_response
+    page = await run_db(permit_service.list_permits, filters, skip, limit, cursor)
+    set_cache_headers(response, page_etag(request, page))
+    return PermitListResponse(**page_fields(page, limit))
+
+
+async def _permit_detail(
+    request: Request,
+    response: Response,
+    permit_service: Union[PermitService, AsyncPermitService],
+    permit_id: int
+):
+    """Get a permit, answering 304 before loading it when the client's copy is current."""
+    if revalidating(request):
+        version = await run_db(permit_service.get_permit_version, permit_id)
+        etag = entity_etag(version)
+        if etag_matches(request, etag):
+            final = version.approval_status in FINAL_APPROVAL_STATUSES
+            return not_modified(etag, cache_control(final))
+    permit = await run_db(permit_service.get_permit, permit_id)
+    final = permit.approval_status in FINAL_APPROVAL_STATUSES
+    set_cache_headers(response, entity_etag(permit), cache_control(final))
+    return permit
+
 
-router = APIRouter(prefix="/permits", tags=["Permits (PTW)"])
+def _add_read_routes(
+    router: APIRouter,
+    get_session: Callable,
+    service_class: Type[Union[PermitService, AsyncPermitService]],
+    current: Callable
+) -> None:
+    """
+    Register the list, pending and detail routes on a router.
+    
+    Used for the sync stack (get_db, PermitService) and the async one
+    (get_async_db, AsyncPermitService), with the matching auth dependency.
+    """
+    
+    @router.get("", response_model=PermitListResponse)
+    async def get_all_permits(
+        request: Request,
+        response: Response,
+        skip: int = Query(0, ge=0),
+        limit: int = Query(100, ge=1, le=100),
+        cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+        filters: PermitFilter = Depends(),
+        db: Union[Session, AsyncSession] = Depends(get_session),
+        current_user: User = Depends(current)
+    ):
+        """
+        Get all permits with optional filters.
+        
+        - **skip**: Number of records to skip (pagination)
+        - **limit**: Maximum number of records to return
+        - **cursor**: Continue after the previous page (faster than skip)
+        - **Filters** (optional, combined): permit_type, approval_status, user_id, location (+location_fuzzy), start_from/start_to, created_from/created_to, q
+        """
+        permit_service = service_class(db)
+        return await _permit_page(request, response, permit_service, filters, skip, limit, cursor)
+    
+    @router.get("/my", response_model=PermitListResponse)
+    async def get_my_permits(
+        request: Request,
+        response: Response,
+        skip: int = Query(0, ge=0),
+        limit: int = Query(100, ge=1, le=100),
+        cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+        filters: PermitFilter = Depends(),
+        db: Union[Session, AsyncSession] = Depends(get_session),
+        current_user: User = Depends(current)
+    ):
+        """
+        Get current user's permits.
+        """
+        filters = filters.model_copy(update={"user_id": current_user.id})
+        permit_service = service_class(db)
+        return await _permit_page(request, response, permit_service, filters, skip, limit, cursor)
+    
+    @router.get("/pending", response_model=PermitListResponse)
+    async def get_pending_permits(
+        request: Request,
+        response: Response,
+        skip: int = Query(0, ge=0),
+        limit: int = Query(100, ge=1, le=100),
+        cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+        filters: PermitFilter = Depends(),
+        db: Union[Session, AsyncSession] = Depends(get_session),
+        current_user: User = Depends(require_roles(SUPERVISOR_AND_ABOVE, current))
+    ):
+        """
+        Get all pending permits (Supervisor and above).
+        
+        Used for approval workflow.
+        """
+        filters = filters.model_copy(update={"approval_status": "pending"})
+        permit_service = service_class(db)
+        return await _permit_page(request, response, permit_service, filters, skip, limit, cursor)
+    
+    @router.get("/{permit_id:int}", response_model=PermitResponse)
+    async def get_permit(
+        request: Request,
+        response: Response,
+        permit_id: int,
+        db: Union[Session, AsyncSession] = Depends(get_session),
+        current_user: User = Depends(current)
+    ):
+        """
+        Get permit by ID.
+        """
+        permit_service = service_class(db)
+        return await _permit_detail(request, response, permit_service, permit_id)
 
 
-@router.post("", response_model=PermitResponse, status_code=status.HTTP_201_CREATED)
+@router.post(
+    "",
+    response_model=PermitResponse,
+    status_code=status.HTTP_201_CREATED,
+    dependencies=[Depends(idempotency_key)]
+)
 def create_permit(
     permit_data: PermitCreate,
     db: Session = Depends(get_db),
@@ -28,6 +193,9 @@ def create_permit(
     
     Any authenticated user can create a permit request.
     
+    Send an Idempotency-Key header to make retries safe: a repeat returns the
+    first response instead of creating a duplicate.
+    
     - **permit_type**: hot_work / confined_space / work_at_height (required)
     - **description**: Description (optional)
     - **location**: Work location (optional)
@@ -38,81 +206,110 @@ def create_permit(
     return permit_service.create_permit(permit_data, current_user.id)
 
 
-@router.get("", response_model=PermitListResponse)
-def get_all_permits(
-    skip: int = Query(0, ge=0),
-    limit: int = Query(100, ge=1, le=100),
-    permit_type: Optional[str] = Query(None, description="Filter by type: hot_work / confined_space / work_at_height"),
-    approval_status: Optional[str] = Query(None, description="Filter by status: pending / approved / rejected"),
+@router.post(
+    "/bulk",
+    response_model=BulkCreateResponse[PermitResponse],
+    status_code=status.HTTP_201_CREATED,
+    responses={status.HTTP_207_MULTI_STATUS: {"description": "Some items were rejected"}},
+    dependencies=[Depends(idempotency_key)]
+)
+def create_permits_bulk(
+    response: Response,
+    items: List[Dict[str, Any]] = Body(..., min_length=1, max_length=settings.BULK_CREATE_MAX_ITEMS),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
     """
-    Get all permits with optional filters.
+    Create many permits at once, e.g. when an offline device reconnects.
     
-    - **skip**: Number of records to skip (pagination)
-    - **limit**: Maximum number of records to return
-    - **permit_type**: Filter by permit type (optional)
-    - **approval_status**: Filter by approval status (optional)
+    Each item is validated like a single create; valid items are inserted with
+    one multi-row INSERT in a single transaction. Rejected items are listed in
+    errors by position, with the detail a single create would return.
+    Answers 201 when every item was created, otherwise 207.
+    
+    Honours Idempotency-Key like the single create.
     """
     permit_service = PermitService(db)
-    
-    if permit_type:
-        items = permit_service.get_permits_by_type(permit_type, skip, limit)
-    elif approval_status:
-        items = permit_service.get_permits_by_status(approval_status, skip, limit)
-    else:
-        items = permit_service.get_all_permits(skip, limit)
-    
-    total = permit_service.get_permits_count()
-    return PermitListResponse(total=total, items=items)
+    result = permit_service.create_permits(items, current_user.id)
+    if result.errors:
+        response.status_code = status.HTTP_207_MULTI_STATUS
+    return BulkCreateResponse[PermitResponse](**bulk_fields(result))
+
+
+_add_read_routes(router, get_db, PermitService, get_current_principal)
 
 
-@router.get("/my", response_model=PermitListResponse)
-def get_my_permits(
-    skip: int = Query(0, ge=0),
-    limit: int = Query(100, ge=1, le=100),
+@router.get("/export", response_class=StreamingResponse)
+def export_permits(
+    export_format: ExportFormat = Query(ExportFormat.csv, alias="format"),
+    filters: PermitFilter = Depends(),
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(get_current_principal)
 ):
     """
-    Get current user's permits.
+    Export every matching permit as a CSV or NDJSON download.
+    
+    Rows are streamed as they are read from the database, so there is no limit.
+    
+    - **format**: csv / ndjson (default: csv)
+    - **Filters** (optional, combined): permit_type, approval_status, user_id, location (+location_fuzzy), start_from/start_to, created_from/created_to, q
     """
     permit_service = PermitService(db)
-    items = permit_service.get_permits_by_user(current_user.id, skip, limit)
-    total = permit_service.count_permits_by_user(current_user.id)
-    return PermitListResponse(total=total, items=items)
+    return export_response(permit_service.export_permits(filters), PermitResponse, export_format, "permits")
 
 
-@router.get("/pending", response_model=PermitListResponse)
-def get_pending_permits(
-    skip: int = Query(0, ge=0),
-    limit: int = Query(100, ge=1, le=100),
+@router.post(
+    "/bulk/approve",
+    response_model=BulkTransitionResponse[PermitResponse],
+    responses={status.HTTP_207_MULTI_STATUS: {"description": "Some ids were not updated"}}
+)
+def approve_permits_bulk(
+    response: Response,
+    approval_data: BulkPermitApprovalRequest,
     db: Session = Depends(get_db),
     current_user: User = Depends(require_roles(SUPERVISOR_AND_ABOVE))
 ):
     """
-    Get all pending permits (Supervisor and above).
+    Approve many pending permits at once (Supervisor and above).
+    
+    All pending permits among the ids are approved by one conditional UPDATE.
+    Ids that are missing (404) or already processed (400) are listed in
+    errors; the answer is 207 when there are any.
     
-    Used for approval workflow.
+    - **ids**: Permit ids (up to BULK_TRANSITION_MAX_IDS)
+    - **approval_notes**: Optional approval notes
     """
     permit_service = PermitService(db)
-    items = permit_service.get_pending_permits(skip, limit)
-    total = permit_service.count_pending_permits()
-    return PermitListResponse(total=total, items=items)
+    result = permit_service.approve_permits(approval_data, current_user)
+    if result.errors:
+        response.status_code = status.HTTP_207_MULTI_STATUS
+    return BulkTransitionResponse[PermitResponse](**transition_fields(result))
 
 
-@router.get("/{permit_id}", response_model=PermitResponse)
-def get_permit(
-    permit_id: int,
+@router.post(
+    "/bulk/reject",
+    response_model=BulkTransitionResponse[PermitResponse],
+    responses={status.HTTP_207_MULTI_STATUS: {"description": "Some ids were not updated"}}
+)
+def reject_permits_bulk(
+    response: Response,
+    rejection_data: BulkPermitApprovalRequest,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(require_roles(SUPERVISOR_AND_ABOVE))
 ):
     """
-    Get permit by ID.
+    Reject many pending permits at once (Supervisor and above).
+    
+    Works like bulk approve.
+    
+    - **ids**: Permit ids (up to BULK_TRANSITION_MAX_IDS)
+    - **approval_notes**: Optional rejection reason
     """
     permit_service = PermitService(db)
-    return permit_service.get_permit(permit_id)
+    result = permit_service.reject_permits(rejection_data, current_user)
+    if result.errors:
+        response.status_code = status.HTTP_207_MULTI_STATUS
+    return BulkTransitionResponse[PermitResponse](**transition_fields(result))
 
 
 @router.put("/{permit_id}", response_model=PermitResponse)
@@ -177,3 +374,8 @@ def delete_permit(
     permit_service.delete_permit(permit_id, current_user)
     return None
 
+
+# Async variants of the read routes, registered ahead of `router` when
+# DATABASE_ASYNC is enabled
+async_router = APIRouter(prefix="/permits", tags=["Permits (PTW)"])
+_add_read_routes(async_router, get_async_db, AsyncPermitService, get_current_principal_async)
@@ -0,0 +1,52 @@
+from typing import List, Optional
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+
+from app.core.database import get_db
+from app.core.unit_of_work import UnitOfWorkRoute
+from app.core.security import get_current_principal
+from app.models.user import User
+from app.schemas.search import LocationSearchResponse, SearchResponse, SearchType
+from app.services.search_service import SearchService
+
+router = APIRouter(prefix="/search", tags=["Search"], route_class=UnitOfWorkRoute)
+
+
+@router.get("", response_model=SearchResponse)
+def search(
+    q: str = Query(..., min_length=1, max_length=200),
+    types: Optional[List[SearchType]] = Query(None, description="Limit to incident / inspection / permit"),
+    limit: int = Query(20, ge=1, le=100),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_principal)
+):
+    """
+    Full-text search across incidents, inspections and permits.
+    
+    - **q**: Search terms (PostgreSQL web search syntax: quotes, `or`, `-term`)
+    - **types**: Entity types to search (repeat the parameter; default all)
+    - **limit**: Maximum number of results
+    
+    Results are ranked by relevance; title matches rank above body matches.
+    """
+    search_service = SearchService(db)
+    return search_service.search(q, types, limit)
+
+
+@router.get("/locations", response_model=LocationSearchResponse)
+def search_locations(
+    q: str = Query(..., min_length=1, max_length=200),
+    limit: int = Query(20, ge=1, le=100),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_principal)
+):
+    """
+    Find locations used by incidents, inspections and permits.
+    
+    - **q**: Location text; on PostgreSQL, misspellings still match
+    - **limit**: Maximum number of results
+    
+    Each distinct location is returned once, most similar first.
+    """
+    search_service = SearchService(db)
+    return search_service.search_locations(q, limit)
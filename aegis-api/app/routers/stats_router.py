@@ -0,0 +1,33 @@
+from datetime import datetime
+from typing import Optional
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+
+from app.core.database import get_db
+from app.core.unit_of_work import UnitOfWorkRoute
+from app.core.security import get_current_principal
+from app.models.user import User
+from app.schemas.stats import StatsResponse
+from app.services.stats_service import StatsService
+
+router = APIRouter(prefix="/stats", tags=["Statistics"], route_class=UnitOfWorkRoute)
+
+
+@router.get("", response_model=StatsResponse)
+def get_stats(
+    date_from: Optional[datetime] = Query(None, description="Only count records created at or after this time"),
+    date_to: Optional[datetime] = Query(None, description="Only count records created at or before this time"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_principal)
+):
+    """
+    Dashboard statistics for inspections, incidents and permits.
+    
+    - **date_from** / **date_to**: Limit counts to records created in this range (default all time)
+    
+    Returns totals, counts by status, category, permit type and approval
+    status, and counts per month of creation. Results are cached for
+    STATS_CACHE_TTL_SECONDS, so they can lag new records slightly.
+    """
+    stats_service = StatsService(db)
+    return stats_service.get_stats(date_from, date_to)
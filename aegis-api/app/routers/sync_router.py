@@ -0,0 +1,30 @@
+from typing import Optional
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+
+from app.core.database import get_db
+from app.core.unit_of_work import UnitOfWorkRoute
+from app.core.security import get_current_principal
+from app.models.user import User
+from app.schemas.sync import SyncResponse
+from app.services.sync_service import SyncService
+
+router = APIRouter(prefix="/sync", tags=["Sync"], route_class=UnitOfWorkRoute)
+
+
+@router.get("", response_model=SyncResponse)
+def sync_changes(
+    since: Optional[str] = Query(None, description="watermark from the previous sync; omit for a full download"),
+    limit: int = Query(500, ge=1, le=1000, description="Maximum number of changes to return"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_principal)
+):
+    """
+    Get the current user's inspections, incidents and permits changed since a watermark.
+    
+    Returns records created or updated, and the ids of records deleted, after
+    `since`. Store the returned `watermark` and send it as `since` next time;
+    while `has_more` is true, call again straight away.
+    """
+    sync_service = SyncService(db)
+    return sync_service.get_changes(current_user.id, since, limit)
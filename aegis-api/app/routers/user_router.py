@@ -1,18 +1,66 @@
-from typing import List, Optional
-from fastapi import APIRouter, Depends, Query, status
+from typing import Callable, List, Optional, Type, Union
+from fastapi import APIRouter, Depends, Query, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.core.database import get_db
-from app.core.security import get_current_user, require_roles, ADMIN_ONLY, ALL_ROLES
+from app.core.database import get_async_db, get_db, run_db
+from app.core.pagination import next_cursor
+from app.core.unit_of_work import UnitOfWorkRoute
+from app.core.security import get_current_user, get_current_user_async, require_roles, ADMIN_ONLY, ALL_ROLES
 from app.models.user import User
 from app.schemas.user import UserCreate, UserUpdate, UserResponse, UserProfileResponse
-from app.services.user_service import UserService
+from app.services.user_service import AsyncUserService, UserService
 
-router = APIRouter(prefix="/users", tags=["Users"])
+router = APIRouter(prefix="/users", tags=["Users"], route_class=UnitOfWorkRoute)
+
+
+def _set_next_cursor(response: Response, users: List[User], limit: int) -> None:
+    """Expose the next page's cursor without changing the list body."""
+    cursor = next_cursor(users, limit)
+    if cursor:
+        response.headers["X-Next-Cursor"] = cursor
+
+
+def _add_read_routes(
+    router: APIRouter,
+    get_session: Callable,
+    service_class: Type[Union[UserService, AsyncUserService]],
+    current: Callable
+) -> None:
+    """
+    Register the list route on a router.
+    
+    Used for the sync stack (get_db, UserService) and the async one
+    (get_async_db, AsyncUserService), with the matching auth dependency.
+    """
+    
+    @router.get("", response_model=List[UserResponse])
+    async def get_all_users(
+        response: Response,
+        skip: int = Query(0, ge=0),
+        limit: int = Query(100, ge=1, le=100),
+        cursor: Optional[str] = Query(None, description="X-Next-Cursor from the previous page"),
+        db: Union[Session, AsyncSession] = Depends(get_session),
+        current_user: User = Depends(require_roles(ADMIN_ONLY, current))
+    ):
+        """
+        Get all users (Admin only).
+        
+        - **skip**: Number of records to skip (pagination)
+        - **limit**: Maximum number of records to return
+        - **cursor**: Continue after the previous page (faster than skip)
+        
+        The next page's cursor is returned in the X-Next-Cursor header.
+        """
+        user_service = service_class(db)
+        users = await run_db(user_service.get_all_users, skip, limit, cursor)
+        _set_next_cursor(response, users, limit)
+        return users
 
 
 @router.get("/me", response_model=UserProfileResponse)
 def get_profile(
+    db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
     """
@@ -20,7 +68,8 @@ def get_profile(
     
     Requires authentication.
     """
-    return current_user
+    user_service = UserService(db)
+    return user_service.get_profile(current_user)
 
 
 @router.put("/me", response_model=UserResponse)
@@ -38,25 +87,11 @@ def update_profile(
     return user_service.update_user(current_user.id, user_data, current_user)
 
 
-@router.get("", response_model=List[UserResponse])
-def get_all_users(
-    skip: int = Query(0, ge=0),
-    limit: int = Query(100, ge=1, le=100),
-    db: Session = Depends(get_db),
-    current_user: User = Depends(require_roles(ADMIN_ONLY))
-):
-    """
-    Get all users (Admin only).
-    
-    - **skip**: Number of records to skip (pagination)
-    - **limit**: Maximum number of records to return
-    """
-    user_service = UserService(db)
-    return user_service.get_all_users(skip, limit)
+_add_read_routes(router, get_db, UserService, get_current_user)
 
 
 @router.post("", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
-def create_user(
+async def create_user(
     user_data: UserCreate,
     db: Session = Depends(get_db),
     current_user: User = Depends(require_roles(ADMIN_ONLY))
@@ -67,7 +102,7 @@ def create_user(
     Admin can assign any role to the new user.
     """
     user_service = UserService(db)
-    return user_service.create_user(user_data)
+    return await user_service.create_user(user_data)
 
 
 @router.get("/{user_id}", response_model=UserResponse)
@@ -147,14 +182,17 @@ def search_users(
     q: str = Query(..., min_length=1),
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=100),
+    fuzzy: bool = Query(False, description="Also match typos, ranked by similarity"),
     db: Session = Depends(get_db),
     current_user: User = Depends(require_roles(ADMIN_ONLY))
 ):
     """
     Search users by name, email, or username (Admin only).
+    
+    - **fuzzy**: Tolerate typos and order by similarity, best first (PostgreSQL)
     """
     user_service = UserService(db)
-    return user_service.search_users(q, skip, limit)
+    return user_service.search_users(q, skip, limit, fuzzy)
 
 
 @router.get("/role/{role}", response_model=List[UserResponse])
@@ -173,3 +211,8 @@ def get_users_by_role(
     user_service = UserService(db)
     return user_service.get_users_by_role(role, skip, limit)
 
+
+# Async variants of the read routes, registered ahead of `router` when
+# DATABASE_ASYNC is enabled
+async_router = APIRouter(prefix="/users", tags=["Users"])
+_add_read_routes(async_router, get_async_db, AsyncUserService, get_current_user_async)
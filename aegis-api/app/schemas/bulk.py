@@ -0,0 +1,40 @@
+from pydantic import BaseModel, Field
+from typing import Any, Generic, List, TypeVar
+
+from app.core.config import settings
+
+ItemT = TypeVar("ItemT")
+
+
+class BulkCreated(BaseModel, Generic[ItemT]):
+    # Position of the item in the request
+    index: int
+    item: ItemT
+
+
+class BulkItemError(BaseModel):
+    index: int
+    # Same as the "detail" of a rejected single create (422 or 400 body)
+    detail: Any
+
+
+class BulkCreateResponse(BaseModel, Generic[ItemT]):
+    created: List[BulkCreated[ItemT]]
+    errors: List[BulkItemError]
+
+
+class BulkIds(BaseModel):
+    # Records to transition; duplicates are ignored
+    ids: List[int] = Field(..., min_length=1, max_length=settings.BULK_TRANSITION_MAX_IDS)
+
+
+class BulkTransitionError(BaseModel):
+    id: int
+    # Status the single-record endpoint would have answered (404 or 400)
+    status_code: int
+    detail: str
+
+
+class BulkTransitionResponse(BaseModel, Generic[ItemT]):
+    updated: List[ItemT]
+    errors: List[BulkTransitionError]
@@ -0,0 +1,17 @@
+from pydantic import BaseModel
+from typing import Optional
+import enum
+
+
+class ExportTable(str, enum.Enum):
+    users = "users"
+    inspections = "inspections"
+    incidents = "incidents"
+    permits = "permits"
+
+
+class ExportResult(BaseModel):
+    table: ExportTable
+    rows: int
+    # Opaque latest change stamp covered; pass as changed_since next time
+    watermark: Optional[str] = None
@@ -3,6 +3,8 @@ from typing import Optional
 from datetime import datetime
 from enum import Enum
 
+from app.schemas.bulk import BulkIds
+
 
 class IncidentCategory(str, Enum):
     minor = "minor"
@@ -43,6 +45,10 @@ class InvestigationStatusUpdate(BaseModel):
     investigation_notes: Optional[str] = None
 
 
+class BulkInvestigationStatusUpdate(BulkIds, InvestigationStatusUpdate):
+    pass
+
+
 class IncidentResponse(IncidentBase):
     id: int
     user_id: int
@@ -58,5 +64,25 @@ class IncidentResponse(IncidentBase):
 
 class IncidentListResponse(BaseModel):
     total: int
+    # True when total is a planner estimate (LIST_TOTAL_MODE=estimated)
+    total_estimated: bool = False
     items: list[IncidentResponse]
+    next_cursor: Optional[str] = None
+
 
+class IncidentFilter(BaseModel):
+    """Filters for incident lists; all given filters must match."""
+    category: Optional[IncidentCategory] = None
+    investigation_status: Optional[InvestigationStatus] = None
+    user_id: Optional[int] = None
+    location: Optional[str] = None
+    # Also match locations with typos (trigram similarity, PostgreSQL only)
+    location_fuzzy: bool = False
+    occurred_from: Optional[datetime] = None
+    occurred_to: Optional[datetime] = None
+    created_from: Optional[datetime] = None
+    created_to: Optional[datetime] = None
+    q: Optional[str] = None
+
+    class Config:
+        use_enum_values = True
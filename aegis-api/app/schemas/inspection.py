@@ -3,6 +3,8 @@ from typing import Optional
 from datetime import datetime
 from enum import Enum
 
+from app.schemas.bulk import BulkIds
+
 
 class InspectionStatus(str, Enum):
     safe = "safe"
@@ -32,6 +34,10 @@ class InspectionStatusUpdate(BaseModel):
     status: InspectionStatus
 
 
+class BulkInspectionStatusUpdate(BulkIds, InspectionStatusUpdate):
+    pass
+
+
 class InspectionResponse(InspectionBase):
     id: int
     user_id: int
@@ -45,5 +51,23 @@ class InspectionResponse(InspectionBase):
 
 class InspectionListResponse(BaseModel):
     total: int
+    # True when total is a planner estimate (LIST_TOTAL_MODE=estimated)
+    total_estimated: bool = False
     items: list[InspectionResponse]
+    next_cursor: Optional[str] = None
 
+
+class InspectionFilter(BaseModel):
+    """Filters for inspection lists; all given filters must match."""
+    status: Optional[InspectionStatus] = None
+    category: Optional[str] = None
+    user_id: Optional[int] = None
+    location: Optional[str] = None
+    # Also match locations with typos (trigram similarity, PostgreSQL only)
+    location_fuzzy: bool = False
+    created_from: Optional[datetime] = None
+    created_to: Optional[datetime] = None
+    q: Optional[str] = None
+
+    class Config:
+        use_enum_values = True
@@ -3,6 +3,8 @@ from typing import Optional
 from datetime import datetime
 from enum import Enum
 
+from app.schemas.bulk import BulkIds
+
 
 class PermitType(str, Enum):
     hot_work = "hot_work"
@@ -40,6 +42,10 @@ class PermitApprovalRequest(BaseModel):
     approval_notes: Optional[str] = None
 
 
+class BulkPermitApprovalRequest(BulkIds, PermitApprovalRequest):
+    pass
+
+
 class PermitResponse(PermitBase):
     id: int
     user_id: int
@@ -55,5 +61,25 @@ class PermitResponse(PermitBase):
 
 class PermitListResponse(BaseModel):
     total: int
+    # True when total is a planner estimate (LIST_TOTAL_MODE=estimated)
+    total_estimated: bool = False
     items: list[PermitResponse]
+    next_cursor: Optional[str] = None
+
 
+class PermitFilter(BaseModel):
+    """Filters for permit lists; all given filters must match."""
+    permit_type: Optional[PermitType] = None
+    approval_status: Optional[ApprovalStatus] = None
+    user_id: Optional[int] = None
+    location: Optional[str] = None
+    # Also match locations with typos (trigram similarity, PostgreSQL only)
+    location_fuzzy: bool = False
+    start_from: Optional[datetime] = None
+    start_to: Optional[datetime] = None
+    created_from: Optional[datetime] = None
+    created_to: Optional[datetime] = None
+    q: Optional[str] = None
+
+    class Config:
+        use_enum_values = True
@@ -0,0 +1,30 @@
+from pydantic import BaseModel
+from enum import Enum
+
+
+class SearchType(str, Enum):
+    incident = "incident"
+    inspection = "inspection"
+    permit = "permit"
+
+
+class SearchResult(BaseModel):
+    type: SearchType
+    id: int
+    title: str
+    rank: float
+
+
+class SearchResponse(BaseModel):
+    query: str
+    items: list[SearchResult]
+
+
+class LocationMatch(BaseModel):
+    location: str
+    rank: float
+
+
+class LocationSearchResponse(BaseModel):
+    query: str
+    items: list[LocationMatch]
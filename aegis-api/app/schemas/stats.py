@@ -0,0 +1,37 @@
+from pydantic import BaseModel
+from typing import Dict, List, Optional
+from datetime import datetime
+
+
+class MonthCount(BaseModel):
+    month: str  # YYYY-MM
+    count: int
+
+
+class InspectionStats(BaseModel):
+    total: int
+    by_status: Dict[str, int]
+    by_category: Dict[str, int]
+    by_month: List[MonthCount]
+
+
+class IncidentStats(BaseModel):
+    total: int
+    by_category: Dict[str, int]
+    by_investigation_status: Dict[str, int]
+    by_month: List[MonthCount]
+
+
+class PermitStats(BaseModel):
+    total: int
+    by_permit_type: Dict[str, int]
+    by_approval_status: Dict[str, int]
+    by_month: List[MonthCount]
+
+
+class StatsResponse(BaseModel):
+    date_from: Optional[datetime] = None
+    date_to: Optional[datetime] = None
+    inspections: InspectionStats
+    incidents: IncidentStats
+    permits: PermitStats
@@ -0,0 +1,23 @@
+from pydantic import BaseModel
+from typing import List
+
+from app.schemas.incident import IncidentResponse
+from app.schemas.inspection import InspectionResponse
+from app.schemas.permit import PermitResponse
+
+
+class SyncDeletion(BaseModel):
+    entity: str  # inspections / incidents / permits
+    id: int
+
+
+class SyncResponse(BaseModel):
+    # Current state of records created or updated since the watermark
+    inspections: List[InspectionResponse]
+    incidents: List[IncidentResponse]
+    permits: List[PermitResponse]
+    deleted: List[SyncDeletion]
+    # Pass as `since` on the next call
+    watermark: str
+    # More changes are waiting; call again right away with the new watermark
+    has_more: bool
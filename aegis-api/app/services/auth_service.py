@@ -2,13 +2,15 @@ from typing import Optional
 from datetime import timedelta
 from sqlalchemy.orm import Session
 from fastapi import HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 
 from app.models.user import User
 from app.repositories.user_repository import UserRepository
 from app.schemas.auth import LoginRequest, RegisterRequest, Token, RefreshTokenRequest
 from app.core.security import (
     verify_password, 
-    get_password_hash, 
+    verify_password_async,
+    get_password_hash_async,
     create_access_token, 
     create_refresh_token,
     decode_token
@@ -23,24 +25,24 @@ class AuthService:
         self.db = db
         self.user_repo = UserRepository(db)
     
-    def register(self, user_data: RegisterRequest) -> User:
+    async def register(self, user_data: RegisterRequest) -> User:
         """Register a new user."""
         # Check if email already exists
-        if self.user_repo.get_by_email(user_data.email):
+        if await run_in_threadpool(self.user_repo.get_by_email, user_data.email):
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Email already registered"
             )
         
         # Check if username already exists
-        if self.user_repo.get_by_username(user_data.username):
+        if await run_in_threadpool(self.user_repo.get_by_username, user_data.username):
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Username already taken"
             )
         
         # Hash password
-        hashed_password = get_password_hash(user_data.password)
+        hashed_password = await get_password_hash_async(user_data.password)
         
         # Create new user
         user_dict = {
@@ -54,11 +56,11 @@ class AuthService:
             "is_active": True
         }
         
-        return self.user_repo.create(user_dict)
+        return await run_in_threadpool(self.user_repo.create, user_dict)
     
-    def login(self, login_data: LoginRequest) -> Token:
+    async def login(self, login_data: LoginRequest) -> Token:
         """Login user."""
-        user = self.user_repo.get_by_email(login_data.email)
+        user = await run_in_threadpool(self.user_repo.get_by_email, login_data.email)
         
         if not user:
             raise HTTPException(
@@ -66,7 +68,7 @@ class AuthService:
                 detail="Invalid email or password"
             )
         
-        if not verify_password(login_data.password, user.hashed_password):
+        if not await verify_password_async(login_data.password, user.hashed_password):
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Invalid email or password"
@@ -79,12 +81,9 @@ class AuthService:
             )
         
         # Create tokens
-        access_token = create_access_token(
-            data={"sub": str(user.id), "role": user.role}
-        )
-        refresh_token = create_refresh_token(
-            data={"sub": str(user.id), "role": user.role}
-        )
+        claims = {"sub": str(user.id), "role": user.role, "ver": user.token_version}
+        access_token = create_access_token(data=claims)
+        refresh_token = create_refresh_token(data=claims)
         
         return Token(
             access_token=access_token,
@@ -117,6 +116,12 @@ class AuthService:
                 detail="User not found"
             )
         
+        if payload.get("ver", 0) != user.token_version:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Token has been revoked"
+            )
+        
         if not user.is_active:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
@@ -124,12 +129,9 @@ class AuthService:
             )
         
         # Create new tokens
-        access_token = create_access_token(
-            data={"sub": str(user.id), "role": user.role}
-        )
-        refresh_token = create_refresh_token(
-            data={"sub": str(user.id), "role": user.role}
-        )
+        claims = {"sub": str(user.id), "role": user.role, "ver": user.token_version}
+        access_token = create_access_token(data=claims)
+        refresh_token = create_refresh_token(data=claims)
         
         return Token(
             access_token=access_token,
@@ -1,11 +1,22 @@
-from typing import List, Optional
+from typing import Iterator, List, Optional, Sequence
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.engine import Row
 from sqlalchemy.orm import Session
 from fastapi import HTTPException, status
 
+from app.core.bulk import BulkResult, TransitionResult, prepare_rows, transition_result
+from app.core.pagination import Page, decode_cursor
 from app.models.incident import Incident
 from app.models.user import User
-from app.repositories.incident_repository import IncidentRepository
-from app.schemas.incident import IncidentCreate, IncidentUpdate, InvestigationStatusUpdate
+from app.repositories.incident_repository import AsyncIncidentRepository, IncidentRepository
+from app.schemas.incident import (
+    IncidentCreate,
+    IncidentUpdate,
+    InvestigationStatusUpdate,
+    BulkInvestigationStatusUpdate,
+    IncidentFilter,
+    IncidentResponse
+)
 
 
 class IncidentService:
@@ -17,7 +28,18 @@ class IncidentService:
     
     def create_incident(self, incident_data: IncidentCreate, user_id: int) -> Incident:
         """Create a new incident report."""
-        incident_dict = {
+        return self.incident_repo.create(self._incident_row(incident_data, user_id))
+    
+    def create_incidents(self, items: List[dict], user_id: int) -> BulkResult:
+        """Validate items and create the valid ones in one INSERT, reporting the rest."""
+        indexes, rows, errors = prepare_rows(
+            items, IncidentCreate, lambda incident_data: self._incident_row(incident_data, user_id)
+        )
+        return BulkResult(list(zip(indexes, self.incident_repo.create_many(rows))), errors)
+    
+    def _incident_row(self, incident_data: IncidentCreate, user_id: int) -> dict:
+        """Build the incidents row for a new incident report."""
+        return {
             "user_id": user_id,
             "title": incident_data.title,
             "description": incident_data.description,
@@ -27,7 +49,6 @@ class IncidentService:
             "incident_datetime": incident_data.incident_datetime,
             "investigation_status": "pending"
         }
-        return self.incident_repo.create(incident_dict)
     
     def get_incident(self, incident_id: int) -> Incident:
         """Get incident by ID."""
@@ -39,43 +60,53 @@ class IncidentService:
             )
         return incident
     
-    def get_all_incidents(self, skip: int = 0, limit: int = 100) -> List[Incident]:
-        """Get all incidents."""
-        return self.incident_repo.get_all_sorted(skip, limit)
+    def list_incidents(
+        self,
+        filters: IncidentFilter,
+        skip: int = 0,
+        limit: int = 100,
+        cursor: Optional[str] = None
+    ) -> Page:
+        """List incidents matching every given filter, with their total."""
+        return self.incident_repo.get_filtered(filters, skip, limit, decode_cursor(cursor))
     
-    def get_incidents_count(self) -> int:
-        """Get total incidents count."""
-        return self.incident_repo.count()
+    def list_incident_versions(
+        self,
+        filters: IncidentFilter,
+        skip: int = 0,
+        limit: int = 100,
+        cursor: Optional[str] = None
+    ) -> Page:
+        """List only the ids and timestamps of the page list_incidents would return."""
+        return self.incident_repo.get_filtered(
+            filters, skip, limit, decode_cursor(cursor), self.incident_repo.version_columns()
+        )
     
-    def get_incidents_by_user(self, user_id: int, skip: int = 0, limit: int = 100) -> List[Incident]:
-        """Get incidents by user."""
-        return self.incident_repo.get_by_user(user_id, skip, limit)
+    def list_incident_rows(
+        self,
+        filters: IncidentFilter,
+        skip: int = 0,
+        limit: int = 100,
+        cursor: Optional[str] = None
+    ) -> Page:
+        """List matching incidents as rows of their IncidentResponse columns, without loading entities."""
+        return self.incident_repo.get_filtered(
+            filters, skip, limit, decode_cursor(cursor), self.incident_repo.columns_of(IncidentResponse)
+        )
     
-    def count_incidents_by_user(self, user_id: int) -> int:
-        """Count incidents by user."""
-        return self.incident_repo.count_by_user(user_id)
+    def export_incidents(self, filters: IncidentFilter) -> Iterator[Sequence[Row]]:
+        """Stream batches of IncidentResponse column rows for every incident matching filters."""
+        return self.incident_repo.stream_filtered(filters, self.incident_repo.columns_of(IncidentResponse))
     
-    def get_incidents_by_category(
-        self, 
-        category: str, 
-        skip: int = 0, 
-        limit: int = 100
-    ) -> List[Incident]:
-        """Get incidents by category."""
-        return self.incident_repo.get_by_category(category, skip, limit)
-    
-    def count_incidents_by_category(self, category: str) -> int:
-        """Count incidents by category."""
-        return self.incident_repo.count_by_category(category)
-    
-    def get_incidents_by_status(
-        self, 
-        status_inv: str, 
-        skip: int = 0, 
-        limit: int = 100
-    ) -> List[Incident]:
-        """Get incidents by investigation status."""
-        return self.incident_repo.get_by_investigation_status(status_inv, skip, limit)
+    def get_incident_version(self, incident_id: int) -> Row:
+        """Get an incident's version without loading it."""
+        version = self.incident_repo.get_version(incident_id, Incident.investigation_status)
+        if not version:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Incident not found"
+            )
+        return version
     
     def update_incident(
         self, 
@@ -113,26 +144,47 @@ class IncidentService:
         current_user: User
     ) -> Incident:
         """Update incident investigation status."""
-        incident = self.incident_repo.get(incident_id)
+        self._check_investigator(current_user)
+        
+        incident = self.incident_repo.update_investigation_status(
+            incident_id, 
+            status_data.investigation_status.value,
+            status_data.investigation_notes
+        )
         if not incident:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Incident not found"
             )
+        return incident
+    
+    def update_investigation_statuses(
+        self,
+        status_data: BulkInvestigationStatusUpdate,
+        current_user: User
+    ) -> TransitionResult:
+        """Update the investigation status of every incident among the ids, reporting missing ones."""
+        self._check_investigator(current_user)
         
-        # Only safety_officer or admin can update investigation status
+        incidents = self.incident_repo.update_investigation_statuses(
+            status_data.ids,
+            status_data.investigation_status.value,
+            status_data.investigation_notes
+        )
+        return transition_result(
+            status_data.ids,
+            incidents,
+            "Incident not found"
+        )
+    
+    def _check_investigator(self, current_user: User) -> None:
+        """Only safety_officer or admin can update investigation status."""
         allowed_roles = ["admin", "safety_officer"]
         if current_user.role not in allowed_roles:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="Only Safety Officer or Admin can update investigation status"
             )
-        
-        return self.incident_repo.update_investigation_status(
-            incident_id, 
-            status_data.investigation_status.value,
-            status_data.investigation_notes
-        )
     
     def delete_incident(self, incident_id: int, current_user: User) -> bool:
         """Delete incident."""
@@ -151,7 +203,65 @@ class IncidentService:
             )
         
         return self.incident_repo.delete(incident_id)
+
+
+class AsyncIncidentService:
+    """Async service for Incident read operations."""
     
-    def search_incidents(self, query: str, skip: int = 0, limit: int = 100) -> List[Incident]:
-        """Search incidents."""
-        return self.incident_repo.search_incidents(query, skip, limit)
+    def __init__(self, db: AsyncSession):
+        self.db = db
+        self.incident_repo = AsyncIncidentRepository(db)
+    
+    async def get_incident(self, incident_id: int) -> Incident:
+        """Get incident by ID."""
+        incident = await self.incident_repo.get(incident_id)
+        if not incident:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Incident not found"
+            )
+        return incident
+    
+    async def list_incidents(
+        self,
+        filters: IncidentFilter,
+        skip: int = 0,
+        limit: int = 100,
+        cursor: Optional[str] = None
+    ) -> Page:
+        """List incidents matching every given filter, with their total."""
+        return await self.incident_repo.get_filtered(filters, skip, limit, decode_cursor(cursor))
+    
+    async def list_incident_versions(
+        self,
+        filters: IncidentFilter,
+        skip: int = 0,
+        limit: int = 100,
+        cursor: Optional[str] = None
+    ) -> Page:
+        """List only the ids and timestamps of the page list_incidents would return."""
+        return await self.incident_repo.get_filtered(
+            filters, skip, limit, decode_cursor(cursor), self.incident_repo.version_columns()
+        )
+    
+    async def list_incident_rows(
+        self,
+        filters: IncidentFilter,
+        skip: int = 0,
+        limit: int = 100,
+        cursor: Optional[str] = None
+    ) -> Page:
+        """List matching incidents as rows of their IncidentResponse columns, without loading entities."""
+        return await self.incident_repo.get_filtered(
+            filters, skip, limit, decode_cursor(cursor), self.incident_repo.columns_of(IncidentResponse)
+        )
+    
+    async def get_incident_version(self, incident_id: int) -> Row:
+        """Get an incident's version without loading it."""
+        version = await self.incident_repo.get_version(incident_id, Incident.investigation_status)
+        if not version:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Incident not found"
+            )
+        return version
@@ -1,11 +1,43 @@
-from typing import List, Optional
+from typing import Iterator, List, Optional, Sequence
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.engine import Row
 from sqlalchemy.orm import Session
 from fastapi import HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 
+from app.core.bulk import BulkResult, TransitionResult, prepare_rows, transition_result
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.core.group_commit import GroupCommitWriter
+from app.core.pagination import Page, decode_cursor
 from app.models.inspection import Inspection
 from app.models.user import User
-from app.repositories.inspection_repository import InspectionRepository
-from app.schemas.inspection import InspectionCreate, InspectionUpdate, InspectionStatusUpdate
+from app.repositories.inspection_repository import AsyncInspectionRepository, InspectionRepository
+from app.schemas.inspection import (
+    InspectionCreate,
+    InspectionUpdate,
+    InspectionStatusUpdate,
+    BulkInspectionStatusUpdate,
+    InspectionFilter,
+    InspectionResponse
+)
+
+
+def _insert_inspections(rows: List[dict]) -> List[Inspection]:
+    """Insert a group-commit batch in its own transaction."""
+    with SessionLocal() as db:
+        inspections = InspectionRepository(db).create_many(rows)
+        db.commit()
+    return inspections
+
+
+# Batches POST /inspections when INSPECTION_GROUP_COMMIT is on; started on first use
+inspection_writer = GroupCommitWriter(
+    _insert_inspections,
+    max_rows=settings.GROUP_COMMIT_MAX_ROWS,
+    max_delay_ms=settings.GROUP_COMMIT_MAX_DELAY_MS,
+    max_pending=settings.GROUP_COMMIT_MAX_PENDING,
+)
 
 
 class InspectionService:
@@ -15,9 +47,26 @@ class InspectionService:
         self.db = db
         self.inspection_repo = InspectionRepository(db)
     
-    def create_inspection(self, inspection_data: InspectionCreate, user_id: int) -> Inspection:
-        """Create a new inspection."""
-        inspection_dict = {
+    async def create_inspection(self, inspection_data: InspectionCreate, user_id: int) -> Inspection:
+        """Create a new inspection, through the group-commit writer when enabled."""
+        inspection_row = self._inspection_row(inspection_data, user_id)
+        if settings.INSPECTION_GROUP_COMMIT:
+            inspection = await inspection_writer.write(inspection_row)
+            if inspection is not None:
+                return inspection
+            # Not written by the writer; fall back to a synchronous insert
+        return await run_in_threadpool(self.inspection_repo.create, inspection_row)
+    
+    def create_inspections(self, items: List[dict], user_id: int) -> BulkResult:
+        """Validate items and create the valid ones in one INSERT, reporting the rest."""
+        indexes, rows, errors = prepare_rows(
+            items, InspectionCreate, lambda inspection_data: self._inspection_row(inspection_data, user_id)
+        )
+        return BulkResult(list(zip(indexes, self.inspection_repo.create_many(rows))), errors)
+    
+    def _inspection_row(self, inspection_data: InspectionCreate, user_id: int) -> dict:
+        """Build the inspections row for a new inspection."""
+        return {
             "user_id": user_id,
             "location": inspection_data.location,
             "category": inspection_data.category,
@@ -25,7 +74,6 @@ class InspectionService:
             "photo": inspection_data.photo,
             "status": inspection_data.status.value
         }
-        return self.inspection_repo.create(inspection_dict)
     
     def get_inspection(self, inspection_id: int) -> Inspection:
         """Get inspection by ID."""
@@ -37,29 +85,53 @@ class InspectionService:
             )
         return inspection
     
-    def get_all_inspections(self, skip: int = 0, limit: int = 100) -> List[Inspection]:
-        """Get all inspections."""
-        return self.inspection_repo.get_all_sorted(skip, limit)
-    
-    def get_inspections_count(self) -> int:
-        """Get total inspections count."""
-        return self.inspection_repo.count()
+    def list_inspections(
+        self,
+        filters: InspectionFilter,
+        skip: int = 0,
+        limit: int = 100,
+        cursor: Optional[str] = None
+    ) -> Page:
+        """List inspections matching every given filter, with their total."""
+        return self.inspection_repo.get_filtered(filters, skip, limit, decode_cursor(cursor))
     
-    def get_inspections_by_user(self, user_id: int, skip: int = 0, limit: int = 100) -> List[Inspection]:
-        """Get inspections by user."""
-        return self.inspection_repo.get_by_user(user_id, skip, limit)
+    def list_inspection_versions(
+        self,
+        filters: InspectionFilter,
+        skip: int = 0,
+        limit: int = 100,
+        cursor: Optional[str] = None
+    ) -> Page:
+        """List only the ids and timestamps of the page list_inspections would return."""
+        return self.inspection_repo.get_filtered(
+            filters, skip, limit, decode_cursor(cursor), self.inspection_repo.version_columns()
+        )
     
-    def count_inspections_by_user(self, user_id: int) -> int:
-        """Count inspections by user."""
-        return self.inspection_repo.count_by_user(user_id)
+    def list_inspection_rows(
+        self,
+        filters: InspectionFilter,
+        skip: int = 0,
+        limit: int = 100,
+        cursor: Optional[str] = None
+    ) -> Page:
+        """List matching inspections as rows of their InspectionResponse columns, without loading entities."""
+        return self.inspection_repo.get_filtered(
+            filters, skip, limit, decode_cursor(cursor), self.inspection_repo.columns_of(InspectionResponse)
+        )
     
-    def get_inspections_by_status(self, status: str, skip: int = 0, limit: int = 100) -> List[Inspection]:
-        """Get inspections by status."""
-        return self.inspection_repo.get_by_status(status, skip, limit)
+    def export_inspections(self, filters: InspectionFilter) -> Iterator[Sequence[Row]]:
+        """Stream batches of InspectionResponse column rows for every inspection matching filters."""
+        return self.inspection_repo.stream_filtered(filters, self.inspection_repo.columns_of(InspectionResponse))
     
-    def get_inspections_by_category(self, category: str, skip: int = 0, limit: int = 100) -> List[Inspection]:
-        """Get inspections by category."""
-        return self.inspection_repo.get_by_category(category, skip, limit)
+    def get_inspection_version(self, inspection_id: int) -> Row:
+        """Get an inspection's version without loading it."""
+        version = self.inspection_repo.get_version(inspection_id)
+        if not version:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Inspection not found"
+            )
+        return version
     
     def update_inspection(
         self, 
@@ -97,22 +169,39 @@ class InspectionService:
         current_user: User
     ) -> Inspection:
         """Update inspection status."""
-        inspection = self.inspection_repo.get(inspection_id)
+        self._check_status_editor(current_user)
+        
+        inspection = self.inspection_repo.update_status(inspection_id, status_data.status.value)
         if not inspection:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Inspection not found"
             )
+        return inspection
+    
+    def update_inspection_statuses(
+        self,
+        status_data: BulkInspectionStatusUpdate,
+        current_user: User
+    ) -> TransitionResult:
+        """Update the status of every inspection among the ids, reporting missing ones."""
+        self._check_status_editor(current_user)
         
-        # Only supervisor, safety_officer, or admin can update status
+        inspections = self.inspection_repo.update_statuses(status_data.ids, status_data.status.value)
+        return transition_result(
+            status_data.ids,
+            inspections,
+            "Inspection not found"
+        )
+    
+    def _check_status_editor(self, current_user: User) -> None:
+        """Only supervisor, safety_officer, or admin can update status."""
         allowed_roles = ["admin", "safety_officer", "supervisor"]
         if current_user.role not in allowed_roles:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="You don't have permission to update inspection status"
             )
-        
-        return self.inspection_repo.update_status(inspection_id, status_data.status.value)
     
     def delete_inspection(self, inspection_id: int, current_user: User) -> bool:
         """Delete inspection."""
@@ -131,3 +220,65 @@ class InspectionService:
             )
         
         return self.inspection_repo.delete(inspection_id)
+
+
+class AsyncInspectionService:
+    """Async service for Inspection read operations."""
+    
+    def __init__(self, db: AsyncSession):
+        self.db = db
+        self.inspection_repo = AsyncInspectionRepository(db)
+    
+    async def get_inspection(self, inspection_id: int) -> Inspection:
+        """Get inspection by ID."""
+        inspection = await self.inspection_repo.get(inspection_id)
+        if not inspection:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Inspection not found"
+            )
+        return inspection
+    
+    async def list_inspections(
+        self,
+        filters: InspectionFilter,
+        skip: int = 0,
+        limit: int = 100,
+        cursor: Optional[str] = None
+    ) -> Page:
+        """List inspections matching every given filter, with their total."""
+        return await self.inspection_repo.get_filtered(filters, skip, limit, decode_cursor(cursor))
+    
+    async def list_inspection_versions(
+        self,
+        filters: InspectionFilter,
+        skip: int = 0,
+        limit: int = 100,
+        cursor: Optional[str] = None
+    ) -> Page:
+        """List only the ids and timestamps of the page list_inspections would return."""
+        return await self.inspection_repo.get_filtered(
+            filters, skip, limit, decode_cursor(cursor), self.inspection_repo.version_columns()
+        )
+    
+    async def list_inspection_rows(
+        self,
+        filters: InspectionFilter,
+        skip: int = 0,
+        limit: int = 100,
+        cursor: Optional[str] = None
+    ) -> Page:
+        """List matching inspections as rows of their InspectionResponse columns, without loading entities."""
+        return await self.inspection_repo.get_filtered(
+            filters, skip, limit, decode_cursor(cursor), self.inspection_repo.columns_of(InspectionResponse)
+        )
+    
+    async def get_inspection_version(self, inspection_id: int) -> Row:
+        """Get an inspection's version without loading it."""
+        version = await self.inspection_repo.get_version(inspection_id)
+        if not version:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Inspection not found"
+            )
+        return version
@@ -1,11 +1,22 @@
-from typing import List, Optional
+from typing import Iterator, List, Optional, Sequence
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.engine import Row
 from sqlalchemy.orm import Session
 from fastapi import HTTPException, status
 
+from app.core.bulk import BulkResult, TransitionResult, prepare_rows, transition_result
+from app.core.pagination import Page, decode_cursor
 from app.models.permit import Permit
 from app.models.user import User
-from app.repositories.permit_repository import PermitRepository
-from app.schemas.permit import PermitCreate, PermitUpdate, PermitApprovalRequest
+from app.repositories.permit_repository import AsyncPermitRepository, PermitRepository
+from app.schemas.permit import (
+    PermitCreate,
+    PermitUpdate,
+    PermitApprovalRequest,
+    BulkPermitApprovalRequest,
+    PermitFilter,
+    PermitResponse
+)
 
 
 class PermitService:
@@ -17,6 +28,17 @@ class PermitService:
     
     def create_permit(self, permit_data: PermitCreate, user_id: int) -> Permit:
         """Create a new permit."""
+        return self.permit_repo.create(self._permit_row(permit_data, user_id))
+    
+    def create_permits(self, items: List[dict], user_id: int) -> BulkResult:
+        """Validate items and create the valid ones in one INSERT, reporting the rest."""
+        indexes, rows, errors = prepare_rows(
+            items, PermitCreate, lambda permit_data: self._permit_row(permit_data, user_id)
+        )
+        return BulkResult(list(zip(indexes, self.permit_repo.create_many(rows))), errors)
+    
+    def _permit_row(self, permit_data: PermitCreate, user_id: int) -> dict:
+        """Build the permits row for a new permit, rejecting invalid dates."""
         # Validate dates
         if permit_data.start_date >= permit_data.end_date:
             raise HTTPException(
@@ -24,7 +46,7 @@ class PermitService:
                 detail="Start date must be before end date"
             )
         
-        permit_dict = {
+        return {
             "user_id": user_id,
             "permit_type": permit_data.permit_type.value,
             "description": permit_data.description,
@@ -33,7 +55,6 @@ class PermitService:
             "end_date": permit_data.end_date,
             "approval_status": "pending"
         }
-        return self.permit_repo.create(permit_dict)
     
     def get_permit(self, permit_id: int) -> Permit:
         """Get permit by ID."""
@@ -45,37 +66,53 @@ class PermitService:
             )
         return permit
     
-    def get_all_permits(self, skip: int = 0, limit: int = 100) -> List[Permit]:
-        """Get all permits."""
-        return self.permit_repo.get_all_sorted(skip, limit)
-    
-    def get_permits_count(self) -> int:
-        """Get total permits count."""
-        return self.permit_repo.count()
-    
-    def get_permits_by_user(self, user_id: int, skip: int = 0, limit: int = 100) -> List[Permit]:
-        """Get permits by user."""
-        return self.permit_repo.get_by_user(user_id, skip, limit)
-    
-    def count_permits_by_user(self, user_id: int) -> int:
-        """Count permits by user."""
-        return self.permit_repo.count_by_user(user_id)
+    def list_permits(
+        self,
+        filters: PermitFilter,
+        skip: int = 0,
+        limit: int = 100,
+        cursor: Optional[str] = None
+    ) -> Page:
+        """List permits matching every given filter, with their total."""
+        return self.permit_repo.get_filtered(filters, skip, limit, decode_cursor(cursor))
     
-    def get_permits_by_type(self, permit_type: str, skip: int = 0, limit: int = 100) -> List[Permit]:
-        """Get permits by type."""
-        return self.permit_repo.get_by_type(permit_type, skip, limit)
+    def list_permit_versions(
+        self,
+        filters: PermitFilter,
+        skip: int = 0,
+        limit: int = 100,
+        cursor: Optional[str] = None
+    ) -> Page:
+        """List only the ids and timestamps of the page list_permits would return."""
+        return self.permit_repo.get_filtered(
+            filters, skip, limit, decode_cursor(cursor), self.permit_repo.version_columns()
+        )
     
-    def get_permits_by_status(self, status_approval: str, skip: int = 0, limit: int = 100) -> List[Permit]:
-        """Get permits by approval status."""
-        return self.permit_repo.get_by_approval_status(status_approval, skip, limit)
+    def list_permit_rows(
+        self,
+        filters: PermitFilter,
+        skip: int = 0,
+        limit: int = 100,
+        cursor: Optional[str] = None
+    ) -> Page:
+        """List matching permits as rows of their PermitResponse columns, without loading entities."""
+        return self.permit_repo.get_filtered(
+            filters, skip, limit, decode_cursor(cursor), self.permit_repo.columns_of(PermitResponse)
+        )
     
-    def get_pending_permits(self, skip: int = 0, limit: int = 100) -> List[Permit]:
-        """Get pending permits."""
-        return self.permit_repo.get_pending_permits(skip, limit)
+    def export_permits(self, filters: PermitFilter) -> Iterator[Sequence[Row]]:
+        """Stream batches of PermitResponse column rows for every permit matching filters."""
+        return self.permit_repo.stream_filtered(filters, self.permit_repo.columns_of(PermitResponse))
     
-    def count_pending_permits(self) -> int:
-        """Count pending permits."""
-        return self.permit_repo.count_pending_permits()
+    def get_permit_version(self, permit_id: int) -> Row:
+        """Get a permit's version without loading it."""
+        version = self.permit_repo.get_version(permit_id, Permit.approval_status)
+        if not version:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Permit not found"
+            )
+        return version
     
     def update_permit(
         self, 
@@ -128,33 +165,17 @@ class PermitService:
         current_user: User
     ) -> Permit:
         """Approve permit."""
-        permit = self.permit_repo.get(permit_id)
-        if not permit:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Permit not found"
-            )
-        
-        # Only supervisor, safety_officer, or admin can approve
-        allowed_roles = ["admin", "safety_officer", "supervisor"]
-        if current_user.role not in allowed_roles:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="You don't have permission to approve permits"
-            )
+        self._check_reviewer(current_user, "approve")
         
-        # Cannot approve non-pending permit
-        if permit.approval_status != "pending":
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Permit has already been processed"
-            )
-        
-        return self.permit_repo.approve_permit(
+        # Only pending permits are updated, atomically
+        permit = self.permit_repo.approve_permit(
             permit_id, 
             current_user.id, 
             approval_data.approval_notes
         )
+        if not permit:
+            self._raise_review_failure(permit_id)
+        return permit
     
     def reject_permit(
         self, 
@@ -163,32 +184,76 @@ class PermitService:
         current_user: User
     ) -> Permit:
         """Reject permit."""
-        permit = self.permit_repo.get(permit_id)
-        if not permit:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Permit not found"
-            )
+        self._check_reviewer(current_user, "reject")
         
-        # Only supervisor, safety_officer, or admin can reject
+        # Only pending permits are updated, atomically
+        permit = self.permit_repo.reject_permit(
+            permit_id, 
+            current_user.id, 
+            rejection_data.approval_notes
+        )
+        if not permit:
+            self._raise_review_failure(permit_id)
+        return permit
+    
+    def approve_permits(
+        self,
+        approval_data: BulkPermitApprovalRequest,
+        current_user: User
+    ) -> TransitionResult:
+        """Approve every pending permit among the ids, reporting the others."""
+        self._check_reviewer(current_user, "approve")
+        return self._review_permits(approval_data, "approved", current_user)
+    
+    def reject_permits(
+        self,
+        rejection_data: BulkPermitApprovalRequest,
+        current_user: User
+    ) -> TransitionResult:
+        """Reject every pending permit among the ids, reporting the others."""
+        self._check_reviewer(current_user, "reject")
+        return self._review_permits(rejection_data, "rejected", current_user)
+    
+    def _review_permits(
+        self,
+        review_data: BulkPermitApprovalRequest,
+        approval_status: str,
+        current_user: User
+    ) -> TransitionResult:
+        """Review the pending permits in one conditional UPDATE."""
+        permits = self.permit_repo.review_permits(
+            review_data.ids,
+            approval_status,
+            current_user.id,
+            review_data.approval_notes
+        )
+        return transition_result(
+            review_data.ids,
+            permits,
+            "Permit not found",
+            self.permit_repo.existing_ids,
+            "Permit has already been processed"
+        )
+    
+    def _check_reviewer(self, current_user: User, action: str) -> None:
+        """Only supervisor, safety_officer, or admin can approve or reject."""
         allowed_roles = ["admin", "safety_officer", "supervisor"]
         if current_user.role not in allowed_roles:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
-                detail="You don't have permission to reject permits"
+                detail=f"You don't have permission to {action} permits"
             )
-        
-        # Cannot reject non-pending permit
-        if permit.approval_status != "pending":
+    
+    def _raise_review_failure(self, permit_id: int) -> None:
+        """Explain why a conditional approve/reject updated no row."""
+        if not self.permit_repo.get(permit_id):
             raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Permit has already been processed"
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Permit not found"
             )
-        
-        return self.permit_repo.reject_permit(
-            permit_id, 
-            current_user.id, 
-            rejection_data.approval_notes
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Permit has already been processed"
         )
     
     def delete_permit(self, permit_id: int, current_user: User) -> bool:
@@ -208,3 +273,65 @@ class PermitService:
             )
         
         return self.permit_repo.delete(permit_id)
+
+
+class AsyncPermitService:
+    """Async service for Permit read operations."""
+    
+    def __init__(self, db: AsyncSession):
+        self.db = db
+        self.permit_repo = AsyncPermitRepository(db)
+    
+    async def get_permit(self, permit_id: int) -> Permit:
+        """Get permit by ID."""
+        permit = await self.permit_repo.get(permit_id)
+        if not permit:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Permit not found"
+            )
+        return permit
+    
+    async def list_permits(
+        self,
+        filters: PermitFilter,
+        skip: int = 0,
+        limit: int = 100,
+        cursor: Optional[str] = None
+    ) -> Page:
+        """List permits matching every given filter, with their total."""
+        return await self.permit_repo.get_filtered(filters, skip, limit, decode_cursor(cursor))
+    
+    async def list_permit_versions(
+        self,
+        filters: PermitFilter,
+        skip: int = 0,
+        limit: int = 100,
+        cursor: Optional[str] = None
+    ) -> Page:
+        """List only the ids and timestamps of the page list_permits would return."""
+        return await self.permit_repo.get_filtered(
+            filters, skip, limit, decode_cursor(cursor), self.permit_repo.version_columns()
+        )
+    
+    async def list_permit_rows(
+        self,
+        filters: PermitFilter,
+        skip: int = 0,
+        limit: int = 100,
+        cursor: Optional[str] = None
+    ) -> Page:
+        """List matching permits as rows of their PermitResponse columns, without loading entities."""
+        return await self.permit_repo.get_filtered(
+            filters, skip, limit, decode_cursor(cursor), self.permit_repo.columns_of(PermitResponse)
+        )
+    
+    async def get_permit_version(self, permit_id: int) -> Row:
+        """Get a permit's version without loading it."""
+        version = await self.permit_repo.get_version(permit_id, Permit.approval_status)
+        if not version:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Permit not found"
+            )
+        return version
@@ -0,0 +1,41 @@
+from typing import List, Optional
+from sqlalchemy.orm import Session
+
+from app.repositories.search_repository import SearchRepository
+from app.schemas.search import (
+    LocationMatch,
+    LocationSearchResponse,
+    SearchResponse,
+    SearchResult,
+    SearchType
+)
+
+
+class SearchService:
+    """Service for cross-entity search."""
+    
+    def __init__(self, db: Session):
+        self.db = db
+        self.search_repo = SearchRepository(db)
+    
+    def search(
+        self,
+        query: str,
+        types: Optional[List[SearchType]] = None,
+        limit: int = 20
+    ) -> SearchResponse:
+        """Search incidents, inspections and permits, best match first."""
+        kinds = [search_type.value for search_type in (types or list(SearchType))]
+        rows = self.search_repo.search(query, kinds, limit)
+        return SearchResponse(
+            query=query,
+            items=[SearchResult.model_validate(row, from_attributes=True) for row in rows]
+        )
+    
+    def search_locations(self, query: str, limit: int = 20) -> LocationSearchResponse:
+        """Find known locations similar to query, closest first."""
+        rows = self.search_repo.search_locations(query, limit)
+        return LocationSearchResponse(
+            query=query,
+            items=[LocationMatch.model_validate(row, from_attributes=True) for row in rows]
+        )
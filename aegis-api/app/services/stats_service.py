@@ -0,0 +1,87 @@
+from datetime import datetime
+from typing import Dict, Optional
+from fastapi import HTTPException, status
+from sqlalchemy.orm import Session
+
+from app.core.cache import stats_cache
+from app.models.incident import Incident
+from app.models.inspection import Inspection
+from app.models.permit import Permit
+from app.repositories.stats_repository import StatsRepository
+from app.schemas.stats import (
+    IncidentStats,
+    InspectionStats,
+    MonthCount,
+    PermitStats,
+    StatsResponse
+)
+
+
+def _months(counts: Dict[str, int]) -> list:
+    return [MonthCount(month=month, count=count) for month, count in sorted(counts.items())]
+
+
+class StatsService:
+    """Service for dashboard statistics."""
+    
+    def __init__(self, db: Session):
+        self.db = db
+        self.stats_repo = StatsRepository(db)
+    
+    def get_stats(
+        self,
+        date_from: Optional[datetime] = None,
+        date_to: Optional[datetime] = None
+    ) -> StatsResponse:
+        """Get counts per status, category and month, cached for a short while."""
+        if date_from and date_to and date_from > date_to:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="date_from must not be after date_to"
+            )
+        key = (date_from, date_to)
+        stats = stats_cache.get(key)
+        if stats is None:
+            stats = self._compute(date_from, date_to)
+            stats_cache.set(key, stats)
+        return stats
+    
+    def _compute(self, date_from: Optional[datetime], date_to: Optional[datetime]) -> StatsResponse:
+        """Run one aggregate query per entity."""
+        inspections = self.stats_repo.grouped_counts(
+            Inspection, {"status": "status", "category": "category"}, date_from, date_to
+        )
+        incidents = self.stats_repo.grouped_counts(
+            Incident,
+            {"category": "category", "investigation_status": "investigation_status"},
+            date_from,
+            date_to
+        )
+        permits = self.stats_repo.grouped_counts(
+            Permit,
+            {"permit_type": "permit_type", "approval_status": "approval_status"},
+            date_from,
+            date_to
+        )
+        return StatsResponse(
+            date_from=date_from,
+            date_to=date_to,
+            inspections=InspectionStats(
+                total=sum(inspections["status"].values()),
+                by_status=inspections["status"],
+                by_category=inspections["category"],
+                by_month=_months(inspections["month"])
+            ),
+            incidents=IncidentStats(
+                total=sum(incidents["category"].values()),
+                by_category=incidents["category"],
+                by_investigation_status=incidents["investigation_status"],
+                by_month=_months(incidents["month"])
+            ),
+            permits=PermitStats(
+                total=sum(permits["permit_type"].values()),
+                by_permit_type=permits["permit_type"],
+                by_approval_status=permits["approval_status"],
+                by_month=_months(permits["month"])
+            )
+        )
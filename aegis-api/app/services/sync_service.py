@@ -0,0 +1,46 @@
+from typing import Optional
+from sqlalchemy.orm import Session
+
+from app.core.pagination import decode_watermark, encode_watermark
+from app.repositories.sync_repository import ChangeStamp, SyncRepository
+from app.schemas.sync import SyncDeletion, SyncResponse
+
+# Sorts before every stamped change, so a first sync returns everything
+START: ChangeStamp = (-1, -1)
+
+
+class SyncService:
+    """Service for the offline delta-sync feed."""
+    
+    def __init__(self, db: Session):
+        self.db = db
+        self.sync_repo = SyncRepository(db)
+    
+    def get_changes(self, user_id: int, since: Optional[str] = None, limit: int = 500) -> SyncResponse:
+        """Get up to limit of a user's creates, updates and deletes after the since watermark, oldest first."""
+        after = decode_watermark(since) if since else START
+        changes = self.sync_repo.changes_after(user_id, after, self.sync_repo.horizon(), limit + 1)
+        has_more = len(changes) > limit
+        changes = changes[:limit]
+        
+        changed_ids = {}
+        deleted = []
+        for change in changes:
+            if change.deleted:
+                deleted.append(SyncDeletion(entity=change.entity, id=change.id))
+            else:
+                changed_ids.setdefault(change.entity, []).append(change.id)
+        # A record deleted since it was listed is skipped; its tombstone follows
+        records = {
+            table: self.sync_repo.get_many(table, ids) for table, ids in changed_ids.items()
+        }
+        
+        last = (changes[-1].change_xid, changes[-1].change_seq) if changes else after
+        return SyncResponse(
+            inspections=records.get("inspections", []),
+            incidents=records.get("incidents", []),
+            permits=records.get("permits", []),
+            deleted=deleted,
+            watermark=encode_watermark(last),
+            has_more=has_more
+        )
@@ -1,11 +1,16 @@
 from typing import List, Optional
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from fastapi import HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 
 from app.models.user import User
-from app.repositories.user_repository import UserRepository
+from app.repositories.user_repository import AsyncUserRepository, UserRepository
 from app.schemas.user import UserCreate, UserUpdate
-from app.core.security import get_password_hash
+from app.core.pagination import decode_cursor
+from app.core.cache import invalidate_principal, token_versions
+from app.core.security import get_password_hash_async
+from app.core.unit_of_work import on_commit
 
 
 class UserService:
@@ -15,24 +20,24 @@ class UserService:
         self.db = db
         self.user_repo = UserRepository(db)
     
-    def create_user(self, user_data: UserCreate) -> User:
+    async def create_user(self, user_data: UserCreate) -> User:
         """Create a new user (admin only)."""
         # Check if email already exists
-        if self.user_repo.get_by_email(user_data.email):
+        if await run_in_threadpool(self.user_repo.get_by_email, user_data.email):
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Email already registered"
             )
         
         # Check if username already exists
-        if self.user_repo.get_by_username(user_data.username):
+        if await run_in_threadpool(self.user_repo.get_by_username, user_data.username):
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Username already taken"
             )
         
         # Hash password
-        hashed_password = get_password_hash(user_data.password)
+        hashed_password = await get_password_hash_async(user_data.password)
         
         # Create new user
         user_dict = {
@@ -46,7 +51,7 @@ class UserService:
             "is_active": True
         }
         
-        return self.user_repo.create(user_dict)
+        return await run_in_threadpool(self.user_repo.create, user_dict)
     
     def get_user(self, user_id: int) -> User:
         """Get user by ID."""
@@ -58,9 +63,9 @@ class UserService:
             )
         return user
     
-    def get_all_users(self, skip: int = 0, limit: int = 100) -> List[User]:
+    def get_all_users(self, skip: int = 0, limit: int = 100, cursor: Optional[str] = None) -> List[User]:
         """Get all users (admin only)."""
-        return self.user_repo.get_all(skip, limit)
+        return self.user_repo.get_all_sorted(skip, limit, decode_cursor(cursor))
     
     def get_users_count(self) -> int:
         """Get total users count."""
@@ -111,7 +116,15 @@ class UserService:
         if "role" in update_dict and update_dict["role"]:
             update_dict["role"] = update_dict["role"].value
         
-        return self.user_repo.update(user, update_dict)
+        # Role change or deactivation revokes previously issued tokens
+        role_changed = update_dict.get("role") not in (None, user.role)
+        deactivated = update_dict.get("is_active") is False and user.is_active
+        if role_changed or deactivated:
+            update_dict["token_version"] = User.token_version + 1
+        
+        user = self.user_repo.update(user, update_dict)
+        self._invalidate_auth(user)
+        return user
     
     def delete_user(self, user_id: int) -> bool:
         """Delete user (admin only)."""
@@ -121,7 +134,15 @@ class UserService:
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="User not found"
             )
-        return self.user_repo.delete(user_id)
+        deleted = self.user_repo.delete(user_id)
+        invalidate_principal(user_id)
+        
+        def forget() -> None:
+            invalidate_principal(user_id)
+            token_versions.discard(user_id)
+        
+        on_commit(self.db, forget)
+        return deleted
     
     def deactivate_user(self, user_id: int) -> User:
         """Deactivate user (admin only)."""
@@ -131,6 +152,7 @@ class UserService:
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="User not found"
             )
+        self._invalidate_auth(user)
         return user
     
     def activate_user(self, user_id: int) -> User:
@@ -141,16 +163,42 @@ class UserService:
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="User not found"
             )
+        self._invalidate_auth(user)
         return user
     
+    def _invalidate_auth(self, user: User) -> None:
+        """Propagate a user change to the in-process auth caches."""
+        user_id, version, is_active = user.id, user.token_version, user.is_active
+        invalidate_principal(user_id)
+        
+        def apply() -> None:
+            # Evict again in case a concurrent request re-cached the old row
+            invalidate_principal(user_id)
+            token_versions.set(user_id, version, is_active)
+        
+        # A rolled back change must not revoke or restore anything
+        on_commit(self.db, apply)
+    
     def get_profile(self, current_user: User) -> User:
         """Get current user profile."""
-        return current_user
+        return self.get_user(current_user.id)
     
-    def search_users(self, query: str, skip: int = 0, limit: int = 100) -> List[User]:
+    def search_users(self, query: str, skip: int = 0, limit: int = 100, fuzzy: bool = False) -> List[User]:
         """Search users (admin only)."""
-        return self.user_repo.search_users(query, skip, limit)
+        return self.user_repo.search_users(query, skip, limit, fuzzy)
     
     def get_users_by_role(self, role: str, skip: int = 0, limit: int = 100) -> List[User]:
         """Get users by role (admin only)."""
         return self.user_repo.get_users_by_role(role, skip, limit)
+
+
+class AsyncUserService:
+    """Async service for User read operations."""
+    
+    def __init__(self, db: AsyncSession):
+        self.db = db
+        self.user_repo = AsyncUserRepository(db)
+    
+    async def get_all_users(self, skip: int = 0, limit: int = 100, cursor: Optional[str] = None) -> List[User]:
+        """Get all users (admin only)."""
+        return await self.user_repo.get_all_sorted(skip, limit, decode_cursor(cursor))
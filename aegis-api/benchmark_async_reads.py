@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""Compare the sync and async list routes under concurrent load"""
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+# Pass a migrated database URL to measure it; by default a throwaway SQLite file is used
+temp_dir = None
+if len(sys.argv) > 1:
+    os.environ["DATABASE_URL"] = sys.argv[1]
+else:
+    temp_dir = tempfile.TemporaryDirectory()
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(temp_dir.name, 'benchmark.db')}"
+# Build the async engine next to the sync one
+os.environ["DATABASE_ASYNC"] = "true"
+
+import anyio.to_thread  # noqa: E402
+import httpx  # noqa: E402
+from fastapi import FastAPI  # noqa: E402
+from sqlalchemy import delete  # noqa: E402
+
+from app.core.database import Base, SessionLocal, async_engine, engine  # noqa: E402
+from app.core.security import create_access_token, get_password_hash  # noqa: E402
+from app.models import Inspection, User  # noqa: E402
+from app.routers import inspection_router  # noqa: E402
+
+CLIENTS = 64
+REQUESTS_PER_CLIENT = 20
+INSPECTIONS = 200
+PATH = "/api/v1/inspections?limit=50"
+
+print("=" * 60)
+print(f"{CLIENTS} clients, {REQUESTS_PER_CLIENT} x GET {PATH} each")
+print("=" * 60)
+
+if temp_dir is not None:
+    Base.metadata.create_all(bind=engine)
+
+with SessionLocal() as db:
+    user = User(
+        email="async-benchmark@aegis.local",
+        username="async-benchmark",
+        hashed_password=get_password_hash("benchmark"),
+        full_name="Async Benchmark",
+        role="user"
+    )
+    db.add(user)
+    db.commit()
+    user_id = user.id
+    db.add_all(
+        Inspection(location=f"Bay {n}", category="Housekeeping", user_id=user_id)
+        for n in range(INSPECTIONS)
+    )
+    db.commit()
+
+token = create_access_token(data={"sub": str(user_id), "role": "user", "ver": 0})
+headers = {"Authorization": f"Bearer {token}"}
+
+# The same routes, registered once per stack
+sync_app = FastAPI()
+sync_app.include_router(inspection_router.router, prefix="/api/v1")
+async_app = FastAPI()
+async_app.include_router(inspection_router.async_router, prefix="/api/v1")
+
+
+async def run(app: FastAPI):
+    """Returns (seconds, per-request latencies)."""
+    latencies = []
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://benchmark") as client:
+        async def one_client():
+            for _ in range(REQUESTS_PER_CLIENT):
+                start = time.perf_counter()
+                response = await client.get(PATH, headers=headers)
+                latencies.append(time.perf_counter() - start)
+                assert response.status_code == 200, response.text
+
+        # Warm up connections and caches
+        await asyncio.gather(*(client.get(PATH, headers=headers) for _ in range(CLIENTS)))
+        start = time.perf_counter()
+        await asyncio.gather(*(one_client() for _ in range(CLIENTS)))
+        return time.perf_counter() - start, latencies
+
+
+def report(elapsed: float, latencies: list) -> None:
+    latencies.sort()
+    p95 = latencies[int(len(latencies) * 0.95)]
+    print(f"   {elapsed * 1000:.1f} ms ({len(latencies) / elapsed:.0f} req/s)")
+    print(f"   p50 {statistics.median(latencies) * 1000:.1f} ms, p95 {p95 * 1000:.1f} ms")
+
+
+async def main() -> None:
+    threads = anyio.to_thread.current_default_thread_limiter().total_tokens
+
+    # 1. Session calls run in the threadpool
+    print(f"\n1. Sync stack (Session, threadpool of {threads})...")
+    sync_time, latencies = await run(sync_app)
+    report(sync_time, latencies)
+
+    # 2. AsyncSession on the event loop
+    print("\n2. Async stack (AsyncSession)...")
+    async_time, latencies = await run(async_app)
+    report(async_time, latencies)
+    print(f"   speedup: {sync_time / async_time:.1f}x")
+    await async_engine.dispose()
+
+
+try:
+    asyncio.run(main())
+finally:
+    with SessionLocal() as db:
+        db.execute(delete(Inspection).where(Inspection.user_id == user_id))
+        db.execute(delete(User).where(User.id == user_id))
+        db.commit()
+    engine.dispose()
+    if temp_dir is not None:
+        temp_dir.cleanup()
+
+print("\n" + "=" * 60)
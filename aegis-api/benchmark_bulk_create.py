@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""Compare creating inspections one request at a time with one bulk create"""
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+from sqlalchemy import create_engine, delete
+from sqlalchemy.orm import sessionmaker
+
+from app.core.database import Base
+from app.core.security import get_password_hash
+from app.models import Inspection, User
+from app.schemas.inspection import InspectionCreate
+from app.services.inspection_service import InspectionService
+
+ITEMS = 500
+
+# Pass a migrated database URL to measure it; by default a throwaway SQLite file is used
+if len(sys.argv) > 1:
+    database_url = sys.argv[1]
+    temp_dir = None
+else:
+    temp_dir = tempfile.TemporaryDirectory()
+    database_url = f"sqlite:///{os.path.join(temp_dir.name, 'benchmark.db')}"
+
+print("=" * 60)
+print(f"Creating {ITEMS} inspections")
+print("=" * 60)
+
+engine = create_engine(database_url)
+if temp_dir is not None:
+    Base.metadata.create_all(bind=engine)
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine, expire_on_commit=False)
+
+items = [
+    {
+        "location": f"Warehouse {i % 12}, bay {i}",
+        "category": "Housekeeping" if i % 2 else "Fire Safety",
+        "description": None if i % 5 == 0 else f"Routine check #{i}",
+        "status": "safe" if i % 3 else "unsafe",
+    }
+    for i in range(ITEMS)
+]
+
+with SessionLocal() as db:
+    user = User(
+        email="bulk-benchmark@aegis.local",
+        username="bulk-benchmark",
+        hashed_password=get_password_hash("benchmark"),
+        full_name="Bulk Benchmark",
+        role="user"
+    )
+    db.add(user)
+    db.commit()
+    user_id = user.id
+
+try:
+    # 1. One create_inspection (one INSERT and one commit) per item
+    print("\n1. One create per item...")
+    async def create_each(service: InspectionService) -> None:
+        for item in items:
+            await service.create_inspection(InspectionCreate.model_validate(item), user_id)
+
+    with SessionLocal() as db:
+        service = InspectionService(db)
+        start = time.perf_counter()
+        asyncio.run(create_each(service))
+        single_time = time.perf_counter() - start
+    print(f"   {single_time * 1000:.1f} ms ({single_time / ITEMS * 1000:.3f} ms per item)")
+
+    # 2. One create_inspections (one multi-row INSERT and one commit)
+    print("\n2. One bulk create...")
+    with SessionLocal() as db:
+        service = InspectionService(db)
+        start = time.perf_counter()
+        result = service.create_inspections(items, user_id)
+        bulk_time = time.perf_counter() - start
+    if len(result.created) != ITEMS or result.errors:
+        print(f"   ❌ Created {len(result.created)} of {ITEMS}, errors: {result.errors[:3]}")
+        raise SystemExit(1)
+    print(f"   {bulk_time * 1000:.1f} ms ({bulk_time / ITEMS * 1000:.3f} ms per item)")
+    print(f"   speedup: {single_time / bulk_time:.1f}x")
+finally:
+    with SessionLocal() as db:
+        db.execute(delete(Inspection).where(Inspection.user_id == user_id))
+        db.execute(delete(User).where(User.id == user_id))
+        db.commit()
+    engine.dispose()
+    if temp_dir is not None:
+        temp_dir.cleanup()
+
+print("\n" + "=" * 60)
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""Compare concurrent POST /inspections over HTTP with and without INSPECTION_GROUP_COMMIT"""
+import asyncio
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+
+# Pass a migrated database URL to measure it; by default a throwaway SQLite file is used
+temp_dir = None
+if len(sys.argv) > 1:
+    os.environ["DATABASE_URL"] = sys.argv[1]
+else:
+    temp_dir = tempfile.TemporaryDirectory()
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(temp_dir.name, 'benchmark.db')}"
+
+from sqlalchemy import delete  # noqa: E402
+
+from app.core.config import settings  # noqa: E402
+from app.core.database import Base, SessionLocal, engine  # noqa: E402
+from app.core.security import create_access_token, get_password_hash  # noqa: E402
+from app.models import Inspection, User  # noqa: E402
+
+# More concurrent requests than the threadpool has threads (40), so a handler
+# that blocked a thread while waiting for its batch would cap the batch size
+CLIENTS = 200
+CREATES_PER_CLIENT = 10
+
+print("=" * 60)
+print(f"{CLIENTS} HTTP clients creating {CREATES_PER_CLIENT} inspections each")
+print("=" * 60)
+
+if temp_dir is not None:
+    Base.metadata.create_all(bind=engine)
+
+with SessionLocal() as db:
+    user = User(
+        email="group-commit-benchmark@aegis.local",
+        username="group-commit-benchmark",
+        hashed_password=get_password_hash("benchmark"),
+        full_name="Group Commit Benchmark",
+        role="user"
+    )
+    db.add(user)
+    db.commit()
+    user_id = user.id
+    token = create_access_token(data={"sub": str(user.id), "role": user.role, "ver": user.token_version})
+
+with socket.socket() as sock:
+    sock.bind(("127.0.0.1", 0))
+    port = sock.getsockname()[1]
+
+
+def start_server(group_commit: bool) -> subprocess.Popen:
+    """Run the app under uvicorn in its own process, as deployed."""
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"],
+        env={**os.environ, "INSPECTION_GROUP_COMMIT": str(group_commit)}
+    )
+    for _ in range(100):
+        try:
+            health()
+            return server
+        except OSError:
+            time.sleep(0.1)
+    server.terminate()
+    raise SystemExit("the server did not start")
+
+
+def health() -> dict:
+    with urllib.request.urlopen(f"http://127.0.0.1:{port}/health") as response:
+        return json.load(response)
+
+
+async def client(n: int) -> None:
+    """One device on one keep-alive connection, one create at a time."""
+    # A bare HTTP/1.1 client; a full client library would use more CPU than the server
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    try:
+        for i in range(CREATES_PER_CLIENT):
+            body = json.dumps({"location": f"Client {n}, bay {i}", "category": "Housekeeping"}).encode()
+            writer.write(
+                f"POST /api/v1/inspections HTTP/1.1\r\nHost: 127.0.0.1\r\n"
+                f"Authorization: Bearer {token}\r\nContent-Type: application/json\r\n"
+                f"Content-Length: {len(body)}\r\n\r\n".encode() + body
+            )
+            head = (await reader.readuntil(b"\r\n\r\n")).decode().lower()
+            length = int(head.split("content-length:")[1].split("\r\n")[0])
+            await reader.readexactly(length)
+            if not head.startswith("http/1.1 201"):
+                raise SystemExit(f"unexpected response: {head.splitlines()[0]}")
+    finally:
+        writer.close()
+
+
+async def clients() -> float:
+    await client(-1)
+    start = time.perf_counter()
+    await asyncio.gather(*(client(n) for n in range(CLIENTS)))
+    return time.perf_counter() - start
+
+
+def run(group_commit: bool) -> tuple:
+    """Returns the elapsed time and the writer's stats."""
+    server = start_server(group_commit)
+    try:
+        elapsed = asyncio.run(clients())
+        return elapsed, health()["group_commit"]
+    finally:
+        server.terminate()
+        server.wait()
+
+
+total = CLIENTS * CREATES_PER_CLIENT
+try:
+    # 1. Every create commits on its own
+    print("\n1. One commit per create...")
+    sync_time, _ = run(group_commit=False)
+    print(f"   {sync_time * 1000:.1f} ms ({total / sync_time:.0f} creates/s)")
+
+    # 2. Creates are queued and committed in batches
+    print("\n2. Group commit...")
+    group_time, stats = run(group_commit=True)
+    print(f"   {group_time * 1000:.1f} ms ({total / group_time:.0f} creates/s)")
+    print(
+        f"   {stats['rows']} rows in {stats['batches']} batches "
+        f"({stats['rows'] / max(stats['batches'], 1):.1f} per batch, at most {settings.GROUP_COMMIT_MAX_ROWS}), "
+        f"{stats['fallbacks']} fallbacks"
+    )
+    print(f"   speedup: {sync_time / group_time:.1f}x")
+finally:
+    with SessionLocal() as db:
+        db.execute(delete(Inspection).where(Inspection.user_id == user_id))
+        db.execute(delete(User).where(User.id == user_id))
+        db.commit()
+    engine.dispose()
+    if temp_dir is not None:
+        temp_dir.cleanup()
+
+print("\n" + "=" * 60)
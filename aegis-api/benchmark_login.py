@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""Measure concurrent password verification in the threadpool and the password pool"""
+import asyncio
+import time
+
+from fastapi import HTTPException
+
+from app.core import security
+from app.core.config import settings
+from app.core.security import get_password_hash, shutdown_password_pool, verify_password
+
+LOGINS = 32
+PASSWORD = "benchmark-password"
+
+
+async def ticker(stop: asyncio.Event) -> float:
+    """Worst event loop delay seen while the logins run."""
+    worst = 0.0
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(0.005)
+        worst = max(worst, time.perf_counter() - start - 0.005)
+    return worst
+
+
+async def burst(logins: int, hashed: str):
+    """Run logins at once; returns (seconds, worst loop lag, successes, 503s, Retry-After values)."""
+    stop = asyncio.Event()
+    lag = asyncio.create_task(ticker(stop))
+    start = time.perf_counter()
+    results = await asyncio.gather(
+        *(security._run_password_job(verify_password, PASSWORD, hashed) for _ in range(logins)),
+        return_exceptions=True
+    )
+    elapsed = time.perf_counter() - start
+    stop.set()
+    worst_lag = await lag
+
+    ok = sum(1 for result in results if result is True)
+    rejected = [result for result in results if isinstance(result, HTTPException) and result.status_code == 503]
+    errors = [result for result in results if isinstance(result, BaseException) and result not in rejected]
+    if errors:
+        raise errors[0]
+    retry_after = {result.headers.get("Retry-After") for result in rejected}
+    return elapsed, worst_lag, ok, len(rejected), retry_after
+
+
+def report(elapsed: float, worst_lag: float, ok: int, rejected: int) -> None:
+    print(f"   {elapsed * 1000:.1f} ms ({ok / elapsed:.0f} logins/s), worst loop lag {worst_lag * 1000:.1f} ms")
+    print(f"   {ok} verified, {rejected} rejected with 503")
+
+
+async def main() -> None:
+    hashed = get_password_hash(PASSWORD)
+    settings.PASSWORD_HASH_MAX_PENDING = LOGINS
+
+    # 1. bcrypt in the request threadpool
+    print("\n1. Threadpool (PASSWORD_HASH_WORKERS=0)...")
+    settings.PASSWORD_HASH_WORKERS = 0
+    elapsed, worst_lag, ok, rejected, _ = await burst(LOGINS, hashed)
+    report(elapsed, worst_lag, ok, rejected)
+    thread_time = elapsed
+
+    # 2. bcrypt in the dedicated process pool (warm the workers up first)
+    workers = 2
+    print(f"\n2. Password pool (PASSWORD_HASH_WORKERS={workers})...")
+    settings.PASSWORD_HASH_WORKERS = workers
+    await burst(workers, hashed)
+    elapsed, worst_lag, ok, rejected, _ = await burst(LOGINS, hashed)
+    report(elapsed, worst_lag, ok, rejected)
+    print(f"   vs threadpool: {thread_time / elapsed:.1f}x")
+
+    # 3. More logins than PASSWORD_HASH_MAX_PENDING fail fast instead of queueing
+    limit = 8
+    print(f"\n3. Overload ({LOGINS} logins, PASSWORD_HASH_MAX_PENDING={limit})...")
+    settings.PASSWORD_HASH_MAX_PENDING = limit
+    elapsed, worst_lag, ok, rejected, retry_after = await burst(LOGINS, hashed)
+    report(elapsed, worst_lag, ok, rejected)
+    print(f"   Retry-After: {', '.join(sorted(filter(None, retry_after))) or 'missing'}")
+    assert ok == limit and rejected == LOGINS - limit, "pending limit was not enforced"
+    assert retry_after == {"1"}, "503 responses must carry Retry-After"
+    assert security._password_jobs_pending == 0, "pending counter leaked"
+
+
+# The password pool spawns workers that re-import this module
+if __name__ == "__main__":
+    print("=" * 60)
+    print(f"{LOGINS} concurrent logins, bcrypt verify each")
+    print("=" * 60)
+    try:
+        asyncio.run(main())
+    finally:
+        shutdown_password_pool()
+    print("\n" + "=" * 60)
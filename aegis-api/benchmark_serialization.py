@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""Compare the default and FAST_LIST_RESPONSES serialization of a list page"""
+import timeit
+from collections import namedtuple
+from datetime import datetime, timedelta, timezone
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from app.core.pagination import Page, page_fields
+from app.core.responses import fast_list_response
+from app.models.inspection import Inspection
+from app.schemas.inspection import InspectionListResponse, InspectionResponse
+
+PAGE_SIZE = 100
+ROUNDS = 200
+
+print("=" * 60)
+print(f"Serializing a {PAGE_SIZE}-item inspection page")
+print("=" * 60)
+
+# Build a page as the repositories return it: entities, and rows of the response columns
+names = tuple(InspectionResponse.model_fields)
+start = datetime(2024, 1, 1, 8, 30, tzinfo=timezone.utc)
+entities = [
+    Inspection(
+        id=PAGE_SIZE - i,
+        user_id=i % 7 + 1,
+        location=f"Warehouse {i % 12}, bay {i}",
+        category="Housekeeping" if i % 2 else "Fire Safety",
+        description=None if i % 5 == 0 else f"Routine check #{i} – \"aisle\" clear",
+        photo=None,
+        status="safe" if i % 3 else "unsafe",
+        created_at=start + timedelta(minutes=i, microseconds=i * 137),
+        updated_at=None if i % 4 else start + timedelta(hours=i),
+    )
+    for i in range(PAGE_SIZE)
+]
+# Stand-in for SQLAlchemy rows, which are tuples with named attributes
+InspectionRow = namedtuple("InspectionRow", names)
+rows = [InspectionRow(*(getattr(entity, name) for name in names)) for entity in entities]
+entity_page = Page(entities, 1234)
+row_page = Page(rows, 1234)
+
+
+def default_body() -> bytes:
+    """What FastAPI sends today: validate through the response model, encode with json."""
+    model = InspectionListResponse(**page_fields(entity_page, PAGE_SIZE))
+    return JSONResponse(jsonable_encoder(model)).body
+
+
+def fast_body() -> bytes:
+    """The opt-in path: plain dicts from rows, encoded with orjson."""
+    return fast_list_response(row_page, PAGE_SIZE, InspectionResponse).body
+
+
+# Identical output is checked by tests/test_serialization.py
+assert default_body() == fast_body()
+
+print(f"\nTiming {ROUNDS} rounds...")
+default_time = min(timeit.repeat(default_body, number=ROUNDS, repeat=3))
+fast_time = min(timeit.repeat(fast_body, number=ROUNDS, repeat=3))
+print(f"   default: {default_time / ROUNDS * 1000:.3f} ms per page")
+print(f"   fast:    {fast_time / ROUNDS * 1000:.3f} ms per page")
+print(f"   speedup: {default_time / fast_time:.1f}x")
+print("\n" + "=" * 60)
@@ -0,0 +1,83 @@
+import os
+import tempfile
+
+# Settings are read at import time, so point them at a throwaway database first
+_temp_dir = tempfile.TemporaryDirectory()
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_temp_dir.name, 'test.db')}"
+os.environ.pop("READ_DATABASE_URL", None)
+
+import pytest  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+from sqlalchemy import create_engine, text  # noqa: E402
+
+import app.models  # noqa: E402,F401
+from app.core.cache import principal_cache, token_cache  # noqa: E402
+from app.core.database import Base, SessionLocal, engine  # noqa: E402
+from app.core.security import create_access_token, get_password_hash  # noqa: E402
+from app.main import app  # noqa: E402
+from app.models.user import User  # noqa: E402
+
+PASSWORD_HASH = get_password_hash("password")
+
+# A scratch PostgreSQL database for the PostgreSQL-only tests
+POSTGRES_URL = os.environ.get("TEST_POSTGRES_URL")
+
+
+@pytest.fixture(autouse=True)
+def database():
+    """Fresh tables and empty auth caches for every test."""
+    Base.metadata.create_all(bind=engine)
+    yield
+    principal_cache.clear()
+    token_cache.clear()
+    Base.metadata.drop_all(bind=engine)
+    # The FTS5 search index is created by DDL events, outside the metadata
+    with engine.begin() as connection:
+        connection.execute(text("DROP TABLE IF EXISTS search_index"))
+
+
+@pytest.fixture
+def db():
+    with SessionLocal() as session:
+        yield session
+
+
+@pytest.fixture
+def postgres():
+    """A PostgreSQL connection whose schema is created in a transaction that is rolled back."""
+    if not POSTGRES_URL:
+        pytest.skip("TEST_POSTGRES_URL is not set")
+    postgres_engine = create_engine(POSTGRES_URL)
+    with postgres_engine.connect() as connection:
+        transaction = connection.begin()
+        Base.metadata.create_all(bind=connection)
+        yield connection
+        transaction.rollback()
+    postgres_engine.dispose()
+
+
+@pytest.fixture
+def client():
+    # Not entered as a context manager: shutdown would stop the app-wide workers
+    return TestClient(app)
+
+
+@pytest.fixture
+def make_user(db):
+    """Create a user and return it with bearer headers for its token."""
+    def factory(role: str = "user", **fields):
+        count = db.query(User).count()
+        user = User(
+            email=fields.pop("email", f"user{count}@example.com"),
+            username=fields.pop("username", f"user{count}"),
+            hashed_password=PASSWORD_HASH,
+            role=role,
+            **fields
+        )
+        db.add(user)
+        db.commit()
+        token = create_access_token(
+            data={"sub": str(user.id), "role": user.role, "ver": user.token_version}
+        )
+        return user, {"Authorization": f"Bearer {token}"}
+    return factory
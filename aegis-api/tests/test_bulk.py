@@ -0,0 +1,90 @@
+from app.models.inspection import Inspection
+from app.models.permit import Permit
+
+
+def _permit(day: int, **fields) -> dict:
+    return {
+        "permit_type": "hot_work",
+        "start_date": f"2025-03-{day:02d}T08:00:00Z",
+        "end_date": f"2025-03-{day:02d}T17:00:00Z",
+        **fields
+    }
+
+
+def test_bulk_create_reports_each_item_at_its_request_index(client, make_user, db):
+    _, headers = make_user()
+    items = [
+        {"location": "Bay 0", "category": "Housekeeping"},
+        {"category": "Housekeeping"},
+        {"location": "Bay 2", "category": "Electrical", "status": "unsafe"},
+        {"location": "Bay 3", "category": "Housekeeping", "status": "unknown"},
+        {"location": "Bay 4", "category": "Housekeeping"},
+    ]
+
+    response = client.post("/api/v1/inspections/bulk", json=items, headers=headers)
+
+    assert response.status_code == 207
+    created = response.json()["created"]
+    assert [item["index"] for item in created] == [0, 2, 4]
+    assert [item["item"]["location"] for item in created] == ["Bay 0", "Bay 2", "Bay 4"]
+    assert created[1]["item"]["status"] == "unsafe"
+    errors = response.json()["errors"]
+    assert [error["index"] for error in errors] == [1, 3]
+    assert errors[0]["detail"][0]["loc"] == ["location"]
+    assert errors[1]["detail"][0]["loc"] == ["status"]
+    stored = db.query(Inspection.id, Inspection.location).order_by(Inspection.id).all()
+    assert [(item["item"]["id"], item["item"]["location"]) for item in created] == [tuple(row) for row in stored]
+
+
+def test_bulk_create_keeps_service_rejections_in_place(client, make_user, db):
+    _, headers = make_user()
+    items = [
+        _permit(1, end_date="2025-02-28T08:00:00Z"),
+        _permit(2, location="North yard"),
+        _permit(3, permit_type="diving"),
+        _permit(4, location="South yard"),
+    ]
+
+    response = client.post("/api/v1/permits/bulk", json=items, headers=headers)
+
+    assert response.status_code == 207
+    assert [
+        (item["index"], item["item"]["location"]) for item in response.json()["created"]
+    ] == [(1, "North yard"), (3, "South yard")]
+    errors = response.json()["errors"]
+    assert [error["index"] for error in errors] == [0, 2]
+    assert errors[0]["detail"] == "Start date must be before end date"
+    assert errors[1]["detail"][0]["loc"] == ["permit_type"]
+    assert db.query(Permit).count() == 2
+
+
+def test_bulk_create_of_only_valid_items_is_created(client, make_user):
+    _, headers = make_user()
+    items = [{"location": f"Bay {n}", "category": "Housekeeping"} for n in range(3)]
+
+    response = client.post("/api/v1/inspections/bulk", json=items, headers=headers)
+
+    assert response.status_code == 201
+    assert [item["index"] for item in response.json()["created"]] == [0, 1, 2]
+    assert response.json()["errors"] == []
+
+
+def test_bulk_create_of_only_invalid_items_creates_nothing(client, make_user, db):
+    _, headers = make_user()
+
+    response = client.post("/api/v1/inspections/bulk", json=[{}, {"location": "Bay 1"}], headers=headers)
+
+    assert response.status_code == 207
+    assert response.json()["created"] == []
+    assert [error["index"] for error in response.json()["errors"]] == [0, 1]
+    assert db.query(Inspection).count() == 0
+
+
+def test_empty_bulk_create_is_rejected(client, make_user, db):
+    _, headers = make_user()
+
+    for path in ("/api/v1/inspections/bulk", "/api/v1/incidents/bulk", "/api/v1/permits/bulk"):
+        response = client.post(path, json=[], headers=headers)
+
+        assert response.status_code == 422
+    assert db.query(Inspection).count() == 0
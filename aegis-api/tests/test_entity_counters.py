@@ -0,0 +1,57 @@
+from sqlalchemy import func, select, text
+from sqlalchemy.orm import Session
+
+from app.models.entity_counter import COUNTER_SLOTS, EntityCounter
+from app.models.inspection import Inspection
+from app.models.user import User
+from app.repositories.counter_repository import CounterRepository
+
+
+def _seed(postgres, count: int) -> Session:
+    db = Session(bind=postgres)
+    user = User(email="counter@example.com", username="counter", hashed_password="x")
+    db.add(user)
+    db.flush()
+    db.add_all(
+        Inspection(location=f"Bay {n}", category="Fire", status="unsafe" if n % 4 == 0 else "safe", user_id=user.id)
+        for n in range(count)
+    )
+    db.flush()
+    return db
+
+
+def test_counts_are_spread_over_slots_and_summed(postgres):
+    db = _seed(postgres, 40)
+    counters = CounterRepository(db)
+
+    slots = db.scalar(select(func.count()).select_from(EntityCounter).where(
+        EntityCounter.entity == "inspections", EntityCounter.dimension == "total"
+    ))
+    assert slots == COUNTER_SLOTS
+    assert counters.get("inspections", "total", "") == 40
+    assert counters.get("inspections", "status", "unsafe") == 10
+
+
+def test_deletes_and_updates_move_counts(postgres):
+    db = _seed(postgres, 40)
+    counters = CounterRepository(db)
+
+    db.execute(text("DELETE FROM inspections WHERE id IN (SELECT id FROM inspections ORDER BY id LIMIT 5)"))
+    db.execute(text("UPDATE inspections SET status = 'unsafe' WHERE status = 'safe'"))
+
+    assert counters.get("inspections", "total", "") == 35
+    assert counters.get("inspections", "status", "unsafe") == 35
+    assert counters.get("inspections", "status", "safe") == 0
+    assert counters.reconcile("inspections") == 0
+
+
+def test_reconcile_recounts_drifted_slots(postgres):
+    db = _seed(postgres, 40)
+    counters = CounterRepository(db)
+    db.execute(text(
+        "UPDATE entity_counters SET count = count + 5 "
+        "WHERE entity = 'inspections' AND dimension = 'total' AND slot = 3"
+    ))
+
+    assert counters.reconcile("inspections") == 1
+    assert counters.get("inspections", "total", "") == 40
@@ -0,0 +1,82 @@
+import json
+from datetime import datetime
+
+import pyarrow.parquet as pq
+from sqlalchemy import text
+
+from app.jobs.export_parquet import export_parquet
+from app.models.inspection import Inspection
+from app.repositories.export_repository import ExportRepository
+from app.schemas.export import ExportTable
+from app.services.export_service import ExportService
+
+
+def _seed(db, user_id: int, count: int) -> list:
+    inspections = [Inspection(location=f"Bay {n}", category="Fire", user_id=user_id) for n in range(count)]
+    db.add_all(inspections)
+    db.commit()
+    return [inspection.id for inspection in inspections]
+
+
+def _export(db, tmp_path, since=None):
+    path = str(tmp_path / f"export-{since}.parquet")
+    result = ExportService(db).export_table(ExportTable.inspections, path, since)
+    return result, pq.read_table(path).column("id").to_pylist()
+
+
+def test_incremental_export_includes_rows_with_old_timestamps(make_user, db, tmp_path):
+    user, _ = make_user()
+    first, second = _seed(db, user.id, 2)
+    result, ids = _export(db, tmp_path)
+    assert sorted(ids) == [first, second]
+
+    # A transaction that started before the export commits an old updated_at afterwards
+    db.execute(text(
+        "UPDATE inspections SET status = 'unsafe', updated_at = '2000-01-01 00:00:00' WHERE id = :id"
+    ), {"id": first})
+    db.commit()
+    later, ids = _export(db, tmp_path, result.watermark)
+
+    assert ids == [first]
+    assert _export(db, tmp_path, later.watermark)[0].rows == 0
+
+
+def test_writes_at_or_above_the_horizon_wait_for_the_next_export(make_user, db, tmp_path, monkeypatch):
+    user, _ = make_user()
+    committed, running, late = _seed(db, user.id, 3)
+    # Stamps as on PostgreSQL: xid 5 has committed, xid 6 is still running, xid 7 committed after it began
+    for id, xid, seq in ((committed, 5, 10), (late, 7, 12), (running, 6, 11)):
+        db.execute(text("UPDATE inspections SET change_xid = :xid, change_seq = :seq WHERE id = :id"),
+                   {"id": id, "xid": xid, "seq": seq})
+    db.commit()
+
+    monkeypatch.setattr(ExportRepository, "horizon", lambda self: 6)
+    result, ids = _export(db, tmp_path)
+    assert ids == [committed]
+
+    # Once xid 6 finishes, both its write and the one stamped after it are exported
+    monkeypatch.setattr(ExportRepository, "horizon", lambda self: 8)
+    _, ids = _export(db, tmp_path, result.watermark)
+    assert sorted(ids) == [running, late]
+
+
+def test_job_ignores_timestamp_watermarks(make_user, db, tmp_path):
+    user, _ = make_user()
+    _seed(db, user.id, 3)
+    (tmp_path / "watermarks.json").write_text(json.dumps({"inspections": datetime(2030, 1, 1).isoformat()}))
+
+    result, = export_parquet(str(tmp_path), [ExportTable.inspections])
+
+    assert result.rows == 3
+    assert json.loads((tmp_path / "watermarks.json").read_text()) == {"inspections": result.watermark}
+
+
+def test_export_rows_follow_change_stamps(make_user, db, tmp_path):
+    user, _ = make_user()
+    first, second, third = _seed(db, user.id, 3)
+    db.execute(text("UPDATE inspections SET status = 'unsafe' WHERE id = :id"), {"id": first})
+    db.commit()
+
+    _, ids = _export(db, tmp_path)
+
+    assert ids == [second, third, first]
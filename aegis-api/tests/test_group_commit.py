@@ -0,0 +1,117 @@
+import asyncio
+import threading
+
+import pytest
+from fastapi import HTTPException
+
+from app.core.config import settings
+from app.core.group_commit import GroupCommitWriter
+from app.models.inspection import Inspection
+from app.services import inspection_service
+
+
+def _writer(write_batch, **options) -> GroupCommitWriter:
+    return GroupCommitWriter(
+        write_batch,
+        max_rows=options.get("max_rows", 100),
+        max_delay_ms=options.get("max_delay_ms", 1000),
+        max_pending=options.get("max_pending", 1000)
+    )
+
+
+def test_waiting_callers_fill_a_batch_past_the_threadpool_size():
+    batches = []
+
+    def write_batch(rows):
+        batches.append(len(rows))
+        return [row["n"] for row in rows]
+
+    writer = _writer(write_batch)
+
+    async def create_all():
+        return await asyncio.gather(*(writer.write({"n": n}) for n in range(250)))
+
+    try:
+        results = asyncio.run(create_all())
+    finally:
+        writer.stop()
+
+    assert results == list(range(250))
+    assert batches == [100, 100, 50]
+
+
+def test_failed_batch_hands_rows_back_to_their_callers():
+    def write_batch(rows):
+        raise RuntimeError("database went away")
+
+    writer = _writer(write_batch, max_rows=3)
+
+    async def create_all():
+        return await asyncio.gather(*(writer.write({"n": n}) for n in range(3)))
+
+    try:
+        results = asyncio.run(create_all())
+    finally:
+        writer.stop()
+
+    assert results == [None, None, None]
+    assert writer.stats()["fallbacks"] == 3
+
+
+def test_full_queue_is_refused_with_503():
+    release = threading.Event()
+
+    def write_batch(rows):
+        release.wait(5)
+        return rows
+
+    writer = _writer(write_batch, max_rows=1, max_pending=1)
+
+    async def overflow():
+        # The first row is being written, the second fills the queue
+        first = asyncio.ensure_future(writer.write({"n": 0}))
+        await asyncio.sleep(0.1)
+        second = asyncio.ensure_future(writer.write({"n": 1}))
+        await asyncio.sleep(0)
+        try:
+            with pytest.raises(HTTPException) as error:
+                await writer.write({"n": 2})
+        finally:
+            release.set()
+        assert await first == {"n": 0}
+        assert await second == {"n": 1}
+        return error.value
+
+    try:
+        error = asyncio.run(overflow())
+    finally:
+        release.set()
+        writer.stop()
+
+    assert error.status_code == 503
+
+
+def test_stopped_writer_leaves_rows_to_their_callers():
+    writer = _writer(lambda rows: rows)
+    writer.stop()
+
+    assert asyncio.run(writer.write({"n": 0})) is None
+
+
+def test_create_route_writes_through_the_writer(client, make_user, monkeypatch, db):
+    _, headers = make_user()
+    writer = _writer(inspection_service._insert_inspections, max_delay_ms=5)
+    monkeypatch.setattr(inspection_service, "inspection_writer", writer)
+    monkeypatch.setattr(settings, "INSPECTION_GROUP_COMMIT", True)
+
+    try:
+        response = client.post(
+            "/api/v1/inspections", json={"location": "Bay 1", "category": "Housekeeping"}, headers=headers
+        )
+    finally:
+        writer.stop()
+
+    assert response.status_code == 201
+    assert response.json()["location"] == "Bay 1"
+    assert writer.stats()["rows"] == 1
+    assert db.query(Inspection).count() == 1
@@ -0,0 +1,123 @@
+import time
+
+import pytest
+
+import app.core.idempotency as idempotency
+from app.core.config import settings
+from app.models.permit import Permit
+from app.services.permit_service import PermitService
+
+PERMIT = {
+    "permit_type": "hot_work",
+    "start_date": "2025-03-01T08:00:00Z",
+    "end_date": "2025-03-01T17:00:00Z",
+}
+
+
+@pytest.fixture(autouse=True, params=["memory", "database"])
+def store(request, monkeypatch):
+    """Run every test against both stores, starting empty."""
+    if request.param == "database":
+        fresh = idempotency.DatabaseIdempotencyStore(ttl=settings.IDEMPOTENCY_TTL_SECONDS)
+    else:
+        fresh = idempotency.MemoryIdempotencyStore(maxsize=100, ttl=settings.IDEMPOTENCY_TTL_SECONDS)
+    monkeypatch.setattr(idempotency, "idempotency_store", fresh)
+    return fresh
+
+
+def _post(client, headers, body, key="key-1"):
+    return client.post("/api/v1/permits", json=body, headers={**headers, "Idempotency-Key": key})
+
+
+def _repeat_while_running(monkeypatch, client, headers, delay: float = 0) -> list:
+    """Make the create handler send the same request again before it returns."""
+    create_permit = PermitService.create_permit
+    repeats = []
+
+    def create_and_repeat(self, permit_data, user_id):
+        if not repeats:
+            repeats.append(None)
+            time.sleep(delay)
+            repeats[0] = _post(client, headers, PERMIT)
+        return create_permit(self, permit_data, user_id)
+
+    monkeypatch.setattr(PermitService, "create_permit", create_and_repeat)
+    return repeats
+
+
+def test_repeat_replays_the_stored_response(client, make_user, db):
+    _, headers = make_user()
+
+    first = _post(client, headers, PERMIT)
+    repeat = _post(client, headers, PERMIT)
+
+    assert first.status_code == 201
+    assert idempotency.REPLAYED_HEADER not in first.headers
+    assert repeat.status_code == 201
+    assert repeat.headers[idempotency.REPLAYED_HEADER] == "true"
+    assert repeat.json() == first.json()
+    assert db.query(Permit).count() == 1
+
+
+def test_keys_are_scoped_to_the_caller(client, make_user, db):
+    _, headers = make_user()
+    _, other_headers = make_user()
+
+    _post(client, headers, PERMIT)
+    other = _post(client, other_headers, PERMIT)
+
+    assert other.status_code == 201
+    assert idempotency.REPLAYED_HEADER not in other.headers
+    assert db.query(Permit).count() == 2
+
+
+def test_reused_key_with_a_different_body_is_rejected(client, make_user, db):
+    _, headers = make_user()
+
+    _post(client, headers, PERMIT)
+    response = _post(client, headers, {**PERMIT, "location": "North yard"})
+
+    assert response.status_code == 422
+    assert response.json()["detail"] == "Idempotency-Key was already used with a different request"
+    assert db.query(Permit).count() == 1
+
+
+def test_repeat_while_the_first_is_running_conflicts(client, make_user, monkeypatch, db):
+    _, headers = make_user()
+    repeats = _repeat_while_running(monkeypatch, client, headers)
+
+    first = _post(client, headers, PERMIT)
+
+    assert first.status_code == 201
+    assert repeats[0].status_code == 409
+    assert repeats[0].headers["Retry-After"] == "1"
+    assert db.query(Permit).count() == 1
+
+
+def test_claim_is_refreshed_while_the_request_runs(client, make_user, monkeypatch, db):
+    _, headers = make_user()
+    monkeypatch.setattr(idempotency, "CLAIM_TTL_SECONDS", 0.3)
+    monkeypatch.setattr(idempotency, "CLAIM_REFRESH_SECONDS", 0.05)
+    repeats = _repeat_while_running(monkeypatch, client, headers, delay=0.6)
+
+    first = _post(client, headers, PERMIT)
+
+    assert first.status_code == 201
+    assert repeats[0].status_code == 409
+    assert db.query(Permit).count() == 1
+
+
+def test_failed_request_releases_its_key(client, make_user, db):
+    _, headers = make_user()
+    invalid = {**PERMIT, "end_date": "2025-02-28T08:00:00Z"}
+
+    failed = _post(client, headers, invalid)
+    retried = _post(client, headers, invalid)
+    corrected = _post(client, headers, PERMIT)
+
+    assert failed.status_code == 400
+    assert retried.status_code == 400
+    assert idempotency.REPLAYED_HEADER not in retried.headers
+    assert corrected.status_code == 201
+    assert idempotency.REPLAYED_HEADER not in corrected.headers
+    assert db.query(Permit).count() == 1
@@ -0,0 +1,63 @@
+from datetime import datetime, timezone
+
+from app.models.incident import Incident
+
+
+def _closed_incident(db, user_id: int) -> Incident:
+    incident = Incident(
+        title="Forklift collision",
+        location="Warehouse B",
+        incident_datetime=datetime(2025, 1, 1, 10, tzinfo=timezone.utc),
+        investigation_status="closed",
+        user_id=user_id
+    )
+    db.add(incident)
+    db.commit()
+    return incident
+
+
+def test_closed_incident_can_be_edited_and_reopened(client, make_user, db):
+    _, headers = make_user(role="safety_officer")
+    incident = _closed_incident(db, make_user()[0].id)
+
+    edited = client.put(f"/api/v1/incidents/{incident.id}", json={"title": "Crane"}, headers=headers)
+    reopened = client.patch(
+        f"/api/v1/incidents/{incident.id}/investigation",
+        json={"investigation_status": "in_progress"},
+        headers=headers
+    )
+
+    assert edited.status_code == 200
+    assert edited.json()["title"] == "Crane"
+    assert reopened.status_code == 200
+    assert reopened.json()["investigation_status"] == "in_progress"
+
+
+def test_bulk_investigation_updates_closed_incidents(client, make_user, db):
+    _, headers = make_user(role="safety_officer")
+    incident = _closed_incident(db, make_user()[0].id)
+
+    response = client.patch(
+        "/api/v1/incidents/bulk/investigation",
+        json={"ids": [incident.id, 999], "investigation_status": "pending"},
+        headers=headers
+    )
+
+    assert response.status_code == 207
+    assert [item["investigation_status"] for item in response.json()["updated"]] == ["pending"]
+    assert response.json()["errors"] == [{"id": 999, "status_code": 404, "detail": "Incident not found"}]
+
+
+def test_closed_incident_is_cached_briefly_and_revalidated(client, make_user, db):
+    user, headers = make_user()
+    incident = _closed_incident(db, user.id)
+
+    response = client.get(f"/api/v1/incidents/{incident.id}", headers=headers)
+    revalidated = client.get(
+        f"/api/v1/incidents/{incident.id}",
+        headers={**headers, "If-None-Match": response.headers["etag"]}
+    )
+
+    assert response.headers["cache-control"] == "private, max-age=60, must-revalidate"
+    assert revalidated.status_code == 304
+    assert revalidated.headers["cache-control"] == "private, max-age=60, must-revalidate"
@@ -0,0 +1,63 @@
+from sqlalchemy import text
+
+from app.models.inspection import Inspection
+
+
+def _seed(db, user_id: int, count: int) -> list:
+    db.add_all(
+        Inspection(location=f"Bay {n}", category="Housekeeping", user_id=user_id)
+        for n in range(count)
+    )
+    db.commit()
+    # Three rows per second, so pages end both inside and between timestamps
+    db.execute(text(
+        "UPDATE inspections SET created_at = datetime('2024-01-01 08:00:00', '+' || (id / 3) || ' seconds')"
+    ))
+    db.commit()
+    return [
+        row.id for row in db.query(Inspection.id).order_by(Inspection.created_at.desc(), Inspection.id.desc())
+    ]
+
+
+def test_next_cursor_walks_every_page_to_the_end(client, make_user, db):
+    user, headers = make_user()
+    expected = _seed(db, user.id, 23)
+
+    seen, cursor, pages = [], None, 0
+    while True:
+        params = {"limit": 5, **({"cursor": cursor} if cursor else {})}
+        body = client.get("/api/v1/inspections", params=params, headers=headers).json()
+        seen += [item["id"] for item in body["items"]]
+        cursor = body["next_cursor"]
+        pages += 1
+        assert pages <= 5, "pagination did not end"
+        if cursor is None:
+            break
+
+    assert seen == expected
+
+
+def test_user_cursor_header_walks_every_page(client, make_user, db):
+    _, headers = make_user(role="admin")
+    for _ in range(6):
+        make_user()
+
+    seen, cursor = [], None
+    for _ in range(4):
+        params = {"limit": 3, **({"cursor": cursor} if cursor else {})}
+        response = client.get("/api/v1/users", params=params, headers=headers)
+        seen += [user["id"] for user in response.json()]
+        cursor = response.headers.get("X-Next-Cursor")
+        if cursor is None:
+            break
+
+    assert sorted(seen) == list(range(1, 8))
+    assert len(seen) == 7
+
+
+def test_invalid_cursor_is_rejected(client, make_user):
+    _, headers = make_user()
+
+    response = client.get("/api/v1/inspections", params={"cursor": "not-a-cursor"}, headers=headers)
+
+    assert response.status_code == 400
@@ -0,0 +1,110 @@
+import json
+import re
+from datetime import datetime, timezone
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.dialects import sqlite
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.pagination import explain_statement, page_statement
+from app.models import Incident, Inspection, Permit
+from app.repositories.incident_repository import incident_criteria
+from app.repositories.inspection_repository import InspectionRepository, inspection_criteria
+from app.repositories.permit_repository import permit_criteria
+from app.schemas.incident import IncidentFilter
+from app.schemas.inspection import InspectionFilter
+from app.schemas.permit import PermitFilter
+
+SINCE = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+# (model, criteria builder, filters); location filters need the trigram indexes
+LIST_QUERIES = [
+    (Inspection, inspection_criteria, InspectionFilter(status="safe")),
+    (Inspection, inspection_criteria, InspectionFilter(category="Fire")),
+    (Inspection, inspection_criteria, InspectionFilter(user_id=1)),
+    (Inspection, inspection_criteria, InspectionFilter(created_from=SINCE)),
+    (Inspection, inspection_criteria, InspectionFilter(q="fire hose")),
+    (Inspection, inspection_criteria, InspectionFilter(location="Bay")),
+    (Inspection, inspection_criteria, InspectionFilter(location="Bay", location_fuzzy=True)),
+    (Incident, incident_criteria, IncidentFilter(category="major")),
+    (Incident, incident_criteria, IncidentFilter(investigation_status="pending")),
+    (Incident, incident_criteria, IncidentFilter(user_id=1)),
+    (Incident, incident_criteria, IncidentFilter(occurred_from=SINCE)),
+    (Incident, incident_criteria, IncidentFilter(created_from=SINCE)),
+    (Incident, incident_criteria, IncidentFilter(q="fire hose")),
+    (Incident, incident_criteria, IncidentFilter(location="Bay")),
+    (Permit, permit_criteria, PermitFilter(permit_type="hot_work")),
+    (Permit, permit_criteria, PermitFilter(approval_status="pending")),
+    (Permit, permit_criteria, PermitFilter(user_id=1)),
+    (Permit, permit_criteria, PermitFilter(start_from=SINCE)),
+    (Permit, permit_criteria, PermitFilter(created_from=SINCE)),
+    (Permit, permit_criteria, PermitFilter(q="fire hose")),
+    (Permit, permit_criteria, PermitFilter(location="Bay")),
+]
+
+
+def _query_id(query) -> str:
+    model, _, filters = query
+    return f"{model.__tablename__}-{'-'.join(filters.model_dump(exclude_defaults=True))}"
+
+
+def _seq_scans(plan) -> list:
+    """Relations read by Seq Scan nodes anywhere in an EXPLAIN (FORMAT JSON) plan."""
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    nodes, scans = [plan[0]["Plan"]], []
+    while nodes:
+        node = nodes.pop()
+        if node["Node Type"] == "Seq Scan":
+            scans.append(node["Relation Name"])
+        nodes += node.get("Plans", [])
+    return scans
+
+
+@pytest.fixture
+def planner(postgres):
+    # Empty tables are cheapest to scan; make any usable index win instead
+    postgres.execute(text("SET LOCAL enable_seqscan = off"))
+    return postgres
+
+
+@pytest.mark.parametrize("query", LIST_QUERIES, ids=_query_id)
+def test_filtered_list_uses_an_index_on_sqlite(query, db):
+    model, criteria, filters = query
+    if filters.location:
+        pytest.skip("substring matches need the PostgreSQL trigram indexes")
+    statement = page_statement(model, criteria(filters, "sqlite"), limit=20)
+    sql = statement.compile(dialect=sqlite.dialect(), compile_kwargs={"literal_binds": True})
+
+    plan = [row.detail for row in db.execute(text(f"EXPLAIN QUERY PLAN {sql}".replace(":", r"\:")))]
+
+    table = model.__tablename__
+    scans = [
+        detail for detail in plan
+        if re.match(rf"SCAN {table}\b", detail) and not re.search(r"USING (COVERING )?INDEX", detail)
+    ]
+    assert scans == [], plan
+
+
+@pytest.mark.parametrize("query", LIST_QUERIES, ids=_query_id)
+def test_filtered_list_uses_an_index_on_postgres(query, planner):
+    model, criteria, filters = query
+
+    sql, params = explain_statement(model, criteria(filters, "postgresql"), planner.dialect)
+    plan = planner.exec_driver_sql(sql, params).scalar()
+
+    assert _seq_scans(plan) == [], plan
+
+
+def test_estimated_total_of_a_fuzzy_location_list_on_postgres(postgres, monkeypatch):
+    monkeypatch.setattr(settings, "LIST_TOTAL_MODE", "estimated")
+    monkeypatch.setattr(settings, "ESTIMATED_TOTAL_MIN_ROWS", 0)
+    # The pg_trgm % operator and the ILIKE pattern must reach the server unescaped
+    filters = InspectionFilter(location="Bay", location_fuzzy=True)
+
+    page = InspectionRepository(Session(bind=postgres)).get_filtered(filters, limit=20)
+
+    assert page.items == []
+    assert page.estimated
@@ -0,0 +1,77 @@
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+from fastapi.security import HTTPAuthorizationCredentials
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from app.core import security
+from app.core.cache import TokenVersionTable
+from app.core.database import _create_async_engine, get_async_database_url
+from app.core.security import UserPrincipal, get_current_user_async
+from app.models.inspection import Inspection
+
+
+def _credentials(headers: dict) -> HTTPAuthorizationCredentials:
+    return HTTPAuthorizationCredentials(scheme="Bearer", credentials=headers["Authorization"].split()[1])
+
+
+def _authenticate_async(headers: dict):
+    async def run():
+        engine = _create_async_engine(get_async_database_url())
+        try:
+            async with async_sessionmaker(engine)() as db:
+                return await get_current_user_async(_credentials(headers), db)
+        finally:
+            await engine.dispose()
+    return asyncio.run(run())
+
+
+def test_inspections_by_user_are_filtered_by_the_path(client, make_user, db):
+    _, supervisor_headers = make_user(role="supervisor")
+    reporter, _ = make_user()
+    other, _ = make_user()
+    db.add_all([
+        Inspection(location="Bay 1", category="Fire", user_id=reporter.id),
+        Inspection(location="Bay 2", category="Fire", user_id=other.id),
+    ])
+    db.commit()
+
+    response = client.get(f"/api/v1/inspections/user/{reporter.id}", headers=supervisor_headers)
+
+    assert response.status_code == 200
+    assert [item["user_id"] for item in response.json()["items"]] == [reporter.id]
+
+
+def test_async_auth_returns_a_principal(make_user):
+    user, headers = make_user(role="supervisor")
+
+    principal = _authenticate_async(headers)
+
+    assert principal == UserPrincipal(id=user.id, role="supervisor", is_active=True, token_version=0)
+
+
+def test_async_auth_rejects_a_revoked_token(make_user, db):
+    user, headers = make_user()
+    user.token_version += 1
+    db.commit()
+
+    with pytest.raises(HTTPException) as error:
+        _authenticate_async(headers)
+    assert error.value.status_code == 401
+
+
+def test_async_principal_skips_the_threadpool_when_versions_are_loaded(make_user, monkeypatch):
+    monkeypatch.setattr(security.settings, "STATELESS_AUTH", True)
+    user, headers = make_user()
+    token_versions = TokenVersionTable(refresh_seconds=60)
+    token_versions.load([(user.id, 0, True)])
+    monkeypatch.setattr(security, "token_versions", token_versions)
+
+    async def no_threadpool(*args):
+        raise AssertionError("the token version was already loaded")
+
+    monkeypatch.setattr(security, "run_in_threadpool", no_threadpool)
+    principal = asyncio.run(security.get_current_principal_async(_credentials(headers), db=None))
+
+    assert principal.id == user.id
@@ -0,0 +1,140 @@
+from collections import namedtuple
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from app.core.config import settings
+from app.core.pagination import Page, page_fields
+from app.core.responses import FastJSONResponse, fast_list_response
+from app.models.incident import Incident, IncidentCategory
+from app.models.inspection import Inspection
+from app.models.permit import Permit
+from app.models.user import User, UserRole
+from app.schemas.incident import IncidentListResponse, IncidentResponse
+from app.schemas.inspection import InspectionListResponse, InspectionResponse
+from app.schemas.permit import PermitListResponse, PermitResponse, PermitType
+from app.schemas.user import UserResponse
+
+UTC_START = datetime(2024, 1, 1, 8, 30, tzinfo=timezone.utc)
+# Every timestamp shape a row can hold: UTC ("Z"), another offset, naive, with and without microseconds
+TIMESTAMPS = [
+    UTC_START,
+    UTC_START + timedelta(microseconds=137),
+    UTC_START.astimezone(timezone(timedelta(hours=2))),
+    datetime(2024, 1, 1, 8, 30, 0, 250000),
+    None,
+]
+TEXT = 'Bay 3 – "aisle" clear\\n ünïcode  '
+
+
+def _inspection(n: int) -> Inspection:
+    return Inspection(
+        id=n, user_id=1, location=f"Warehouse {n}", category="Housekeeping", description=TEXT if n % 2 else None,
+        photo=None, status="unsafe", created_at=TIMESTAMPS[n % 4], updated_at=TIMESTAMPS[(n + 1) % 5]
+    )
+
+
+def _incident(n: int) -> Incident:
+    return Incident(
+        id=n, user_id=1, title=TEXT, description=None, location="Warehouse B",
+        incident_datetime=TIMESTAMPS[(n + 2) % 4],
+        # Enum members as well as stored strings
+        category=IncidentCategory.major if n % 2 else "near_miss", investigation_status="closed",
+        investigation_notes=None, photo=None, created_at=TIMESTAMPS[n % 4], updated_at=TIMESTAMPS[n % 5]
+    )
+
+
+def _permit(n: int) -> Permit:
+    return Permit(
+        id=n, user_id=1, permit_type=PermitType.confined_space if n % 2 else "hot_work", description=TEXT,
+        location=None, start_date=TIMESTAMPS[n % 4], end_date=TIMESTAMPS[(n + 1) % 4], approval_status="approved",
+        approved_by=2, approval_notes=None, created_at=TIMESTAMPS[n % 4], updated_at=None
+    )
+
+
+def _user(n: int) -> User:
+    return User(
+        id=n, email=f"user{n}@example.com", username=f"user{n}", full_name=TEXT, phone=None, department="Ops",
+        role=UserRole.safety_officer if n % 2 else "user", is_active=bool(n % 3), created_at=TIMESTAMPS[n % 4],
+        updated_at=TIMESTAMPS[n % 5]
+    )
+
+
+RECORDS = [
+    (_inspection, InspectionResponse),
+    (_incident, IncidentResponse),
+    (_permit, PermitResponse),
+    (_user, UserResponse),
+]
+LISTS = [
+    (_inspection, InspectionResponse, InspectionListResponse),
+    (_incident, IncidentResponse, IncidentListResponse),
+    (_permit, PermitResponse, PermitListResponse),
+]
+
+
+def _default_body(content) -> bytes:
+    """What FastAPI sends for a response model: jsonable_encoder, then json."""
+    return JSONResponse(jsonable_encoder(content)).body
+
+
+def _row(entity, schema, *extra):
+    """A stand-in for a SQLAlchemy row of the schema's columns."""
+    names = tuple(schema.model_fields)
+    Row = namedtuple("Row", names + tuple(f"extra_{i}" for i in range(len(extra))))
+    return Row(*(getattr(entity, name) for name in names), *extra)
+
+
+@pytest.mark.parametrize("build, schema", RECORDS, ids=lambda value: getattr(value, "__name__", ""))
+def test_record_bytes_match_the_default_encoder(build, schema):
+    for n in range(1, 11):
+        entity = build(n)
+        fast = FastJSONResponse(dict(zip(schema.model_fields, _row(entity, schema)))).body
+
+        assert fast == _default_body(schema.model_validate(entity))
+
+
+@pytest.mark.parametrize("build, schema, list_schema", LISTS, ids=lambda value: getattr(value, "__name__", ""))
+def test_list_bytes_match_the_default_encoder(build, schema, list_schema):
+    entities = [build(n) for n in range(20, 0, -1)]
+    # Rows carry the inlined total as a trailing column
+    rows = [_row(entity, schema, 1234) for entity in entities]
+
+    for limit in (20, 50):
+        fast = fast_list_response(Page(rows, 1234, estimated=True), limit, schema).body
+
+        assert fast == _default_body(list_schema(**page_fields(Page(entities, 1234, estimated=True), limit)))
+
+
+def test_user_list_bytes_match_the_default_encoder():
+    users = [_user(n) for n in range(1, 11)]
+
+    fast = FastJSONResponse([dict(zip(UserResponse.model_fields, _row(user, UserResponse))) for user in users]).body
+
+    assert fast == _default_body([UserResponse.model_validate(user) for user in users])
+
+
+@pytest.mark.parametrize("path", ["/api/v1/inspections", "/api/v1/incidents", "/api/v1/permits"])
+def test_fast_list_endpoints_send_the_same_bytes(path, client, make_user, db, monkeypatch):
+    user, headers = make_user(role="admin")
+    for n in range(1, 8):
+        db.add_all([
+            Inspection(location=TEXT, category="Fire", user_id=user.id),
+            Incident(title=TEXT, location="Bay", incident_datetime=TIMESTAMPS[n % 4], user_id=user.id),
+            Permit(
+                permit_type="hot_work", location=TEXT, start_date=TIMESTAMPS[n % 4],
+                end_date=TIMESTAMPS[(n + 1) % 4], user_id=user.id
+            ),
+        ])
+    db.commit()
+
+    monkeypatch.setattr(settings, "FAST_LIST_RESPONSES", False)
+    default = client.get(path, params={"limit": 5}, headers=headers)
+    monkeypatch.setattr(settings, "FAST_LIST_RESPONSES", True)
+    fast = client.get(path, params={"limit": 5}, headers=headers)
+
+    assert default.status_code == fast.status_code == 200
+    assert fast.content == default.content
+    assert fast.headers["etag"] == default.headers["etag"]
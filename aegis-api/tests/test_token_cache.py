@@ -0,0 +1,46 @@
+import hashlib
+import time
+from datetime import timedelta
+
+from app.core.cache import token_cache
+from app.core.security import create_access_token, decode_token
+
+
+def test_verified_payload_is_reused():
+    token = create_access_token(data={"sub": "1"})
+
+    first = decode_token(token)
+    hits = token_cache.hits
+    second = decode_token(token)
+
+    assert second == first
+    assert token_cache.hits == hits + 1
+
+
+def test_cached_payload_is_a_copy():
+    token = create_access_token(data={"sub": "1"})
+
+    decode_token(token)["sub"] = "2"
+
+    assert decode_token(token)["sub"] == "1"
+
+
+def test_expired_token_is_not_served_from_cache():
+    token = create_access_token(data={"sub": "1"}, expires_delta=timedelta(seconds=1))
+    payload = decode_token(token)
+    assert payload is not None
+    key = hashlib.sha256(token.encode()).digest()
+
+    # The cached payload is dropped at exp
+    time.sleep(max(payload["exp"] - time.time(), 0) + 0.1)
+    assert token_cache.get(key) is None
+
+    # jose compares whole seconds, so it rejects the token one second later
+    time.sleep(1)
+    assert decode_token(token) is None
+    assert token_cache.get(key) is None
+
+
+def test_invalid_token_is_not_cached():
+    assert decode_token("not-a-token") is None
+    assert len(token_cache) == 0
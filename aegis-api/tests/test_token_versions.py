@@ -0,0 +1,118 @@
+import threading
+import time
+
+import pytest
+from fastapi.security import HTTPAuthorizationCredentials
+
+from app.core import security
+from app.core.cache import TokenVersionTable
+from app.core.config import settings
+from app.schemas.user import UserRole, UserUpdate
+from app.services.user_service import UserService
+
+
+@pytest.fixture
+def token_versions(monkeypatch):
+    table = TokenVersionTable(refresh_seconds=60)
+    monkeypatch.setattr(security, "token_versions", table)
+    monkeypatch.setattr("app.services.user_service.token_versions", table)
+    return table
+
+
+def _reload_concurrently(table: TokenVersionTable, threads: int = 8) -> int:
+    calls = []
+    barrier = threading.Barrier(threads)
+
+    def fetch():
+        calls.append(1)
+        time.sleep(0.05)
+        return [(1, 3, True)]
+
+    def worker():
+        barrier.wait()
+        table.refresh(fetch)
+        assert table.get(1) is not None
+
+    workers = [threading.Thread(target=worker) for _ in range(threads)]
+    for worker_thread in workers:
+        worker_thread.start()
+    for worker_thread in workers:
+        worker_thread.join()
+    return len(calls)
+
+
+def test_first_load_runs_once_and_everyone_waits_for_it():
+    table = TokenVersionTable(refresh_seconds=60)
+
+    assert _reload_concurrently(table) == 1
+    assert table.get(1).version == 3
+
+
+def test_stale_reload_runs_once_while_others_use_the_old_copy():
+    table = TokenVersionTable(refresh_seconds=0.2)
+    table.load([(1, 2, True)])
+    time.sleep(0.25)
+
+    assert _reload_concurrently(table) == 1
+    assert table.get(1).version == 3
+
+
+def test_stateless_auth_never_reads_the_request_session(token_versions, make_user, monkeypatch):
+    monkeypatch.setattr(settings, "STATELESS_AUTH", True)
+    user, headers = make_user()
+
+    class ReplicaSession:
+        """Stands in for a lagging replica session handed to the dependency."""
+        def __getattr__(self, name):
+            raise AssertionError("token versions must be read from the primary")
+
+    credentials = HTTPAuthorizationCredentials(
+        scheme="Bearer", credentials=headers["Authorization"].split()[1]
+    )
+    principal = security.get_current_principal(credentials, ReplicaSession())
+
+    assert principal.id == user.id
+    assert token_versions.get(user.id).version == user.token_version
+
+
+def test_missing_users_are_cached_until_the_next_reload(token_versions, make_user, monkeypatch):
+    make_user()
+    lookups = []
+    session_factory = security.SessionLocal
+
+    def counting_session():
+        lookups.append(1)
+        return session_factory()
+
+    monkeypatch.setattr(security, "SessionLocal", counting_session)
+
+    assert security._get_token_version(999) is None
+    assert security._get_token_version(999) is None
+    # One bulk reload plus one single-user lookup
+    assert len(lookups) == 2
+
+
+def test_role_change_is_applied_after_commit(token_versions, make_user, db, monkeypatch):
+    monkeypatch.setattr(settings, "UNIT_OF_WORK", True)
+    admin, _ = make_user(role="admin")
+    user, _ = make_user()
+    token_versions.load([(user.id, user.token_version, True)])
+
+    UserService(db).update_user(user.id, UserUpdate(role=UserRole.supervisor), admin)
+    assert token_versions.get(user.id).version == 0
+
+    db.commit()
+    assert token_versions.get(user.id).version == 1
+
+
+def test_rolled_back_change_leaves_the_table_alone(token_versions, make_user, db, monkeypatch):
+    monkeypatch.setattr(settings, "UNIT_OF_WORK", True)
+    admin, _ = make_user(role="admin")
+    user, _ = make_user()
+    token_versions.load([(user.id, user.token_version, True)])
+
+    UserService(db).update_user(user.id, UserUpdate(is_active=False), admin)
+    db.rollback()
+    db.commit()
+
+    assert token_versions.get(user.id) == (0, True)